@@ -0,0 +1,358 @@
+"""Benchmark capturing, formatting, and dumping interpreter stacks.
+
+Every benchmark repeats an operation for at least '--min-time' seconds, reporting its
+throughput and latency percentiles, then repeats it a few times with `tracemalloc`
+to report its peak memory. Results are compared against a baseline, e.g.
+
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+    python benchmarks/run.py --save benchmarks/baseline.json
+
+Baselines are specific to the machine and Python version they were recorded with.
+"""
+
+import argparse
+import collections
+import dataclasses
+import fnmatch
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any, NamedTuple
+
+import yogger
+from yogger import base
+from yogger.compat import HAS_REQUESTS_PACKAGE
+
+if HAS_REQUESTS_PACKAGE:
+    import requests
+
+Operation = Callable[[], object]
+
+# Dumps only include the frames of this script
+PACKAGE_NAME = __name__
+
+
+class Benchmark(NamedTuple):
+    """Benchmark of an Operation"""
+
+    #: Name of the benchmark
+    name: str
+    #: Function creating the operation to measure, and a function to clean up after it
+    setup: Callable[[], tuple[Operation, Callable[[], None] | None]]
+    #: Depth of the stack the operation is measured at
+    depth: int = 0
+
+
+class Result(NamedTuple):
+    """Result of a Benchmark"""
+
+    #: Number of operations per second
+    ops_per_sec: float
+    #: Median latency in microseconds
+    p50_us: float
+    #: 90th percentile latency in microseconds
+    p90_us: float
+    #: 99th percentile latency in microseconds
+    p99_us: float
+    #: Peak memory allocated by an operation in KiB
+    peak_kib: float
+    #: Number of operations measured
+    num_ops: int
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    name: str
+    tags: list[str]
+    score: float
+    parent: "Record | None" = None
+
+
+def _wide_dict() -> dict[str, Any]:
+    return {f"key_{i}": (i, f"value_{i}", i / 3)[i % 3] for i in range(2000)}
+
+
+def _deep_nesting(depth: int = 50) -> Any:
+    value: Any = {"leaf": [1, 2.5, "three"]}
+    for i in range(depth):
+        value = {"level": i, "child": [value, (i, None)]}
+    return value
+
+
+def _records() -> list[Record]:
+    parent = Record(0, "root", [], 0.0)
+    return [Record(i, f"record_{i}", ["a", "b"], i / 7, parent) for i in range(200)]
+
+
+def _fake_response() -> Any:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "https://example.com/api/items"
+    response.request = requests.Request(
+        "GET",
+        response.url,
+        headers={"Accept": "application/json", "Authorization": "Bearer abc"},
+        params={"page": 1},
+    )
+    response.headers = requests.structures.CaseInsensitiveDict(
+        {"Content-Type": "application/json", "Content-Length": "1048576"}
+    )
+    response._content = json.dumps([{"id": i} for i in range(60000)]).encode()
+    return response
+
+
+def _pformat(value: Any) -> tuple[Operation, None]:
+    return (lambda: yogger.pformat("value", value)), None
+
+
+def _at_depth(depth: int, func: Callable[[], object]) -> object:
+    """Call a Function at a Given Depth of the Stack, with Locals in Every Frame"""
+    my_int = depth
+    my_str = f"frame {depth}"
+    my_list = [depth, my_str, {"depth": depth}]
+    if depth <= 0:
+        return func()
+    return _at_depth(depth - 1, func)
+
+
+def _dumps() -> tuple[Operation, None]:
+    return (lambda: yogger.dumps(yogger.capture_stack())), None
+
+
+def _warning(
+    dump_locals: bool,
+    dump_stats: bool = False,
+) -> tuple[Operation, Callable[[], None]]:
+    tmpdir = tempfile.mkdtemp(prefix="yogger_bench_")
+    yogger.configure(
+        PACKAGE_NAME,
+        dump_locals=dump_locals,
+        dump_path=os.path.join(tmpdir, "dump.log"),
+        dump_stats=dump_stats,
+    )
+    logger = base.Yogger(PACKAGE_NAME)
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    my_dict = _wide_dict()
+    my_records = _records()[:20]
+
+    def cleanup() -> None:
+        # Not reset by 'configure'
+        base._global_dump_path = None
+        shutil.rmtree(tmpdir)
+
+    def warning() -> None:
+        logger.warning("Dumping %d items and %d records", len(my_dict), len(my_records))
+
+    return warning, cleanup
+
+
+def _dump_files() -> tuple[Operation, Callable[[], None]]:
+    yogger.configure(PACKAGE_NAME)
+    stack = _at_depth(10, yogger.capture_stack)
+    paths: list[str] = []
+
+    def dump() -> None:
+        location = base._dump(stack=stack, err=None, dump_path=None)
+        if location is not None:
+            paths.append(location.path)
+
+    def cleanup() -> None:
+        for path in paths:
+            os.remove(path)
+
+    return dump, cleanup
+
+
+BENCHMARKS = [
+    Benchmark("pformat_wide_dict", lambda: _pformat(_wide_dict())),
+    Benchmark("pformat_deep_nesting", lambda: _pformat(_deep_nesting())),
+    Benchmark("pformat_big_int_list", lambda: _pformat(list(range(100_000)))),
+    Benchmark(
+        "pformat_big_float_list",
+        lambda: _pformat([i / 3 for i in range(100_000)]),
+    ),
+    Benchmark(
+        "pformat_big_mixed_deque",
+        lambda: _pformat(collections.deque([i, {"i": i}][i % 2] for i in range(2000))),
+    ),
+    Benchmark("pformat_dataclasses", lambda: _pformat(_records())),
+    *(
+        [Benchmark("pformat_requests_response", lambda: _pformat(_fake_response()))]
+        if HAS_REQUESTS_PACKAGE
+        else []
+    ),
+    *(Benchmark(f"dumps_depth_{depth}", _dumps, depth) for depth in (10, 100, 500)),
+    Benchmark("warning_dump_locals_off", lambda: _warning(False)),
+    Benchmark("warning_dump_locals_on", lambda: _warning(True)),
+    Benchmark("warning_dump_stats_on", lambda: _warning(True, dump_stats=True)),
+    Benchmark("dump_to_temp_files", _dump_files),
+]
+
+
+def _percentile(sorted_values: list[int], fraction: float) -> float:
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index] / 1e3
+
+
+def _measure(op: Operation, min_time: float, memory_ops: int) -> Result:
+    """Measure the Throughput, Latencies, and Peak Memory of an Operation"""
+    # Warm up caches, e.g. of the formatters
+    op()
+
+    latencies: list[int] = []
+    deadline = time.perf_counter_ns() + int(min_time * 1e9)
+    clock = time.perf_counter_ns
+    while True:
+        start = clock()
+        op()
+        end = clock()
+        latencies.append(end - start)
+        if end >= deadline:
+            break
+
+    # Measured separately, as tracing slows down every allocation
+    tracemalloc.start()
+    peak = 0
+    for _ in range(memory_ops):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        op()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return Result(
+        ops_per_sec=len(latencies) / (sum(latencies) / 1e9),
+        p50_us=_percentile(latencies, 0.5),
+        p90_us=_percentile(latencies, 0.9),
+        p99_us=_percentile(latencies, 0.99),
+        peak_kib=peak / 1024,
+        num_ops=len(latencies),
+    )
+
+
+def run(
+    benchmarks: list[Benchmark],
+    min_time: float,
+    memory_ops: int,
+) -> Iterator[tuple[str, Result]]:
+    """Run Benchmarks
+
+    Args:
+        benchmarks (list[Benchmark]): Benchmarks to run.
+        min_time (float): Minimum number of seconds to measure each benchmark for.
+        memory_ops (int): Number of operations to measure the peak memory of.
+
+    Yields:
+        tuple[str, Result]: Names and results of the benchmarks, in order.
+    """
+    for benchmark in benchmarks:
+        op, cleanup = benchmark.setup()
+        try:
+            result = _at_depth(
+                benchmark.depth, lambda: _measure(op, min_time, memory_ops)
+            )
+        finally:
+            if cleanup is not None:
+                cleanup()
+        assert isinstance(result, Result)
+        yield benchmark.name, result
+
+
+def _change(current: float, previous: float | None) -> str:
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous:+.0%}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="*", help="Pattern of benchmarks to run")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="Minimum number of seconds to measure each benchmark for",
+    )
+    parser.add_argument(
+        "--memory-ops",
+        type=int,
+        default=3,
+        help="Number of operations to measure the peak memory of",
+    )
+    parser.add_argument("--baseline", help="Path of a baseline to compare with")
+    parser.add_argument("--save", help="Path to save the results to as a baseline")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="Fail if the throughput of a benchmark dropped by more than this fraction",
+    )
+    args = parser.parse_args()
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.baseline is not None and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as rf:
+            baseline = json.load(rf)["results"]
+
+    benchmarks = [b for b in BENCHMARKS if fnmatch.fnmatch(b.name, args.filter)]
+    print(
+        f"{'benchmark':<28}{'ops/sec':>12}{'change':>8}{'p50 us':>11}{'p90 us':>11}"
+        f"{'p99 us':>11}{'peak KiB':>11}{'change':>8}"
+    )
+    results: dict[str, Result] = {}
+    regressions = []
+    for name, result in run(benchmarks, args.min_time, args.memory_ops):
+        results[name] = result
+        previous = baseline.get(name, {})
+        print(
+            f"{name:<28}{result.ops_per_sec:>12,.1f}"
+            f"{_change(result.ops_per_sec, previous.get('ops_per_sec')):>8}"
+            f"{result.p50_us:>11,.1f}{result.p90_us:>11,.1f}{result.p99_us:>11,.1f}"
+            f"{result.peak_kib:>11,.1f}"
+            f"{_change(result.peak_kib, previous.get('peak_kib')):>8}"
+        )
+        if (
+            args.max_regression is not None
+            and previous.get("ops_per_sec")
+            and result.ops_per_sec
+            < previous["ops_per_sec"] * (1 - args.max_regression)
+        ):
+            regressions.append(name)
+
+    if args.save is not None:
+        with open(args.save, "w", encoding="utf-8") as wf:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": {
+                        name: {
+                            key: round(value, 3)
+                            for key, value in result._asdict().items()
+                        }
+                        for name, result in results.items()
+                    },
+                },
+                wf,
+                indent=2,
+            )
+            wf.write("\n")
+
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
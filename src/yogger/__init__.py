@@ -1,21 +1,49 @@
 from .base import (
     Yogger,
+    async_dump_on_exception,
     configure,
     dump,
     dump_on_exception,
+    dump_threads,
     dumps,
+    flush_dumps,
     install,
 )
-from .pformat import pformat
+from .capture import (
+    FrameRecord,
+    capture_stack,
+    capture_threads,
+    capture_trace,
+)
+from .filters import VariableFilter
+from .metrics import stats
+from .pformat import (
+    Writer,
+    pformat,
+    register_formatter,
+)
+from .policy import DumpPolicy
 
 __version__ = "0.0.7"
 
 __all__ = [
+    "async_dump_on_exception",
+    "capture_stack",
+    "capture_threads",
+    "capture_trace",
     "configure",
     "dump",
     "dump_on_exception",
+    "dump_threads",
+    "DumpPolicy",
     "dumps",
+    "flush_dumps",
+    "FrameRecord",
     "install",
     "pformat",
+    "register_formatter",
+    "stats",
+    "VariableFilter",
+    "Writer",
     "Yogger",
 ]
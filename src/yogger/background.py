@@ -0,0 +1,143 @@
+"""Write dumps in the background.
+
+This module contains a worker thread that formats and writes dumps so the logging
+thread only has to take a snapshot of the stack.
+"""
+
+import atexit
+import collections
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from typing import Final
+
+OVERFLOW_POLICIES: Final[tuple[str, ...]] = ("drop", "block", "sample")
+
+
+class DumpWorker:
+    """Background Thread to Run Dump Jobs
+
+    Jobs are queued in a bounded queue. When the queue is full, the overflow policy
+    decides what happens to a new job:
+
+    - "drop": Drop the new job.
+    - "block": Block the caller until there is room for the new job.
+    - "sample": Block the caller for one out of every 'sample_every' overflowing jobs, and drop the others.
+
+    Pending jobs are flushed at exit.
+
+    Args:
+        maxsize (int, optional): Maximum number of queued jobs. Defaults to 64.
+        overflow (str, optional): Overflow policy ("drop", "block", or "sample"). Defaults to "drop".
+        sample_every (int, optional): Keep one out of every N overflowing jobs when using the "sample" policy. Defaults to 10.
+
+    Raises:
+        ValueError: If the overflow policy is not supported.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 64,
+        overflow: str = "drop",
+        sample_every: int = 10,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow!r}")
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.sample_every = sample_every
+        #: Number of jobs that were dropped
+        self.dropped = 0
+        self._overflowed = 0
+        self._jobs: collections.deque[Callable[[], object]] = collections.deque()
+        # Number of jobs that are queued or running
+        self._pending = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="yogger-dump-worker",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, job: Callable[[], object]) -> bool:
+        """Queue a Job to Run in the Background
+
+        Args:
+            job (Callable[[], object]): Job to run.
+
+        Returns:
+            bool: True if the job was queued, otherwise False if it was dropped.
+        """
+        with self._cond:
+            if len(self._jobs) >= self.maxsize:
+                self._overflowed += 1
+                if self.overflow == "drop" or (
+                    self.overflow == "sample" and self._overflowed % self.sample_every
+                ):
+                    self.dropped += 1
+                    return False
+
+                while len(self._jobs) >= self.maxsize and not self._closed:
+                    self._cond.wait()
+
+            if self._closed:
+                self.dropped += 1
+                return False
+
+            self._jobs.append(job)
+            self._pending += 1
+            self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for the Queued Jobs to Finish
+
+        Args:
+            timeout (float | None, optional): Maximum number of seconds to wait, otherwise wait indefinitely if set to None. Defaults to None.
+
+        Returns:
+            bool: True if all jobs finished, otherwise False if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finish the Queued Jobs and Stop the Thread
+
+        Args:
+            timeout (float | None, optional): Maximum number of seconds to wait, otherwise wait indefinitely if set to None. Defaults to None.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        """Run Jobs until Closed"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs or self._closed)
+                if not self._jobs:
+                    # Closed and drained
+                    return
+                job = self._jobs.popleft()
+                self._cond.notify_all()
+
+            try:
+                job()
+            except Exception:
+                # Logging here could queue yet another dump
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify_all()
@@ -2,27 +2,113 @@
 
 This module contains the base classes and functions for Yogger.
 """
+import asyncio
+import atexit
 import contextlib
+import functools
 import inspect
 import io
 import logging
 import os
+import signal
 import tempfile
-from collections.abc import Generator
+import threading
+import time
+import weakref
+from collections.abc import AsyncGenerator, Callable, Generator, Hashable
+from collections.abc import Iterable, Mapping, Sequence
+from types import FrameType
 from types import ModuleType as Module
-
+from typing import Any
+
+from .background import DumpWorker
+from .capture import (
+    FrameRecord,
+    capture_stack,
+    capture_threads,
+    capture_trace,
+    fingerprint_stack,
+    fingerprint_trace,
+    select_frames,
+    snapshot_stack,
+)
+from .collector import DumpCollector
+from .compress import EXTENSIONS, check_codec, compressor
 from .constants import (
     DATE_FMT,
     DUMP_MSG,
+    DUMP_VIEW_MSG,
+    LAZY_DUMP_MSG,
     LOG_FMT,
 )
-from .pformat import pformat
+from .filters import VariableFilter, _set_filter, filter_variables
+from .handlers import BatchQueueListener, DroppingQueueHandler
+from .lazy import SnapshotBuffer
+from .metrics import (
+    CAPTURE,
+    RESOLVE,
+    DumpStats,
+    DumpTimer,
+    TimedFile,
+    _set_stats,
+    current_stats,
+)
+from .pformat import (
+    DEFAULT,
+    LimitArg,
+    Limits,
+    Writer,
+    _OutputLimitReached,
+    _set_default_limits,
+)
+from .ratelimit import DumpLimiter
+from .recorder import FlightRecorder, write_records
+from .policy import DumpPolicy, resolve_policy
+from .sampling import DumpSampler
+from .sink import (
+    MULTIPROCESS_MODES,
+    DumpLocation,
+    DumpSink,
+    append_atomic,
+    shard_path,
+)
+from .structured import (
+    FORMAT_EXTENSIONS,
+    check_format,
+    encode_record,
+    failure_marker,
+    iter_records,
+)
+from .tasks import with_tasks
 
 _logger: Module | logging.Logger = logging
 
 _global_package_name: str | None = None
 _global_dump_path: str | None = None
 _global_dump_locals: bool = False
+_global_dump_worker: DumpWorker | None = None
+_global_dump_limiter: DumpLimiter | None = None
+_global_dump_sampler: DumpSampler | None = None
+_global_dump_sink: DumpSink | None = None
+_global_dump_compression: str | None = None
+_global_dump_format: str = "text"
+_global_dump_buffer: SnapshotBuffer | None = None
+_global_flight_recorder: FlightRecorder | None = None
+_global_root_level: int | None = None
+_global_log_listener: BatchQueueListener | None = None
+_global_dump_multiprocess: str | None = None
+_global_dump_collector: DumpCollector | None = None
+_global_dump_asyncio: bool = False
+_global_dump_all_tasks: bool = False
+_global_previous_signal_handler: tuple[int, Any] | None = None
+_global_dump_policies: dict[str, DumpPolicy] = {}
+
+# Instantiated loggers, to clear the dump policies cached on them
+_loggers: "weakref.WeakSet[Yogger]" = weakref.WeakSet()
+# Placeholder for a dump policy that was not resolved yet
+_UNRESOLVED = DumpPolicy(level=None)
+
+StackLike = Sequence[inspect.FrameInfo | FrameRecord]
 
 
 class Yogger(logging.Logger):
@@ -31,15 +117,92 @@ class Yogger(logging.Logger):
     This class is used to override the default `logging.Logger` class.
     """
 
+    #: Dump policy of the logger, resolved when first logging with a level of warning or higher
+    _dump_policy: DumpPolicy = _UNRESOLVED
+
+    def __init__(self, name: str, level: int | str = logging.NOTSET) -> None:
+        super().__init__(name, level)
+        _loggers.add(self)
+
     def _log_with_stack(self, level: int, msg: object, *args, **kwargs) -> None:
         super().log(level, msg, *args, **kwargs)
 
-        # Dump current stack if 'dump_locals' was set to True
-        if _global_dump_locals:
-            stack = inspect.stack()
-            if len(stack) > 2:
-                path = _dump(stack=stack[2:][::-1], err=None, dump_path=None)
-                super().log(level, DUMP_MSG.format(path=path))
+        policy = self._dump_policy
+        if policy is _UNRESOLVED:
+            policy = self._resolve_dump_policy()
+
+        # Dump current stack if the policy of the logger dumps at this level
+        if policy.level is not None and level >= policy.level:
+            # Sample before inspecting the frames, so skipped dumps are cheap
+            sampler = _global_dump_sampler
+            if sampler is None:
+                self._dump_stack(level, policy)
+            elif sampler.sample(self.name, level):
+                start = time.perf_counter()
+                try:
+                    self._dump_stack(level, policy)
+                finally:
+                    sampler.record(time.perf_counter() - start)
+
+    def _resolve_dump_policy(self) -> DumpPolicy:
+        """Resolve the Dump Policy of the Logger and Cache it
+
+        Returns:
+            DumpPolicy: Policy of the most specific logger configured with 'dump_policies', otherwise following 'dump_locals', with the configured package filled in.
+        """
+        policy = resolve_policy(_global_dump_policies, self.name)
+        if policy is None:
+            policy = DumpPolicy(level=logging.WARNING if _global_dump_locals else None)
+        if policy.package_name is None:
+            policy = policy._replace(package_name=_global_package_name)
+        self._dump_policy = policy
+        return policy
+
+    def _dump_stack(self, level: int, policy: DumpPolicy) -> None:
+        """Dump the Stack of the Caller of the Logging Method
+
+        Args:
+            level (int): Level to log the location of the dump with.
+            policy (DumpPolicy): Resolved policy of the logger.
+        """
+        # Decide before inspecting the frames, so suppressed dumps are cheap
+        limiter = _global_dump_limiter
+        if limiter is not None and not _allow_dump(
+            limiter,
+            (None, fingerprint_stack(3)),
+            functools.partial(super().log, level),
+        ):
+            return
+
+        stats = current_stats()
+        start = 0 if stats is None else time.perf_counter_ns()
+        # Skip this method, the method that called it, and the logging method
+        stack = capture_stack(3, package_name=policy.package_name)
+        if stack:
+            if _global_dump_asyncio:
+                stack = with_tasks(stack, all_tasks=_global_dump_all_tasks)
+            if stats is not None:
+                stats.add(CAPTURE, time.perf_counter_ns() - start)
+
+            buffer = _global_dump_buffer
+            if buffer is not None:
+                # Format later
+                dump_id = buffer.add(
+                    stack,
+                    package_name=policy.package_name,
+                    dump_path=policy.dump_path,
+                )
+                super().log(level, LAZY_DUMP_MSG.format(dump_id=dump_id))
+                return
+
+            location = _dump(
+                stack=stack,
+                err=None,
+                dump_path=policy.dump_path,
+                package_name=policy.package_name,
+            )
+            if location is not None:
+                super().log(level, _dump_msg(location))
 
     def warning(self, *args, **kwargs) -> None:
         self._log_with_stack(logging.WARNING, *args, **kwargs)
@@ -72,6 +235,39 @@ def configure(
     dump_locals: bool = False,
     dump_path: str | bytes | os.PathLike | None = None,
     remove_handlers: bool = True,
+    max_depth: int | None = None,
+    max_items: int | None = None,
+    max_length: int | None = None,
+    max_bytes: int | None = None,
+    dump_async: bool = False,
+    dump_queue_size: int = 64,
+    dump_overflow: str = "drop",
+    dump_first_n: int | None = None,
+    dump_rate: int | None = None,
+    dump_rate_per: float = 60.0,
+    dump_summary_interval: float = 60.0,
+    dump_max_file_bytes: int | None = None,
+    dump_backup_count: int = 5,
+    dump_max_total_bytes: int | None = None,
+    dump_compression: str | None = None,
+    dump_format: str = "text",
+    dump_lazy: bool = False,
+    dump_buffer_size: int = 64,
+    dump_log_records: int | None = None,
+    async_handlers: bool = False,
+    async_queue_size: int = 10000,
+    async_batch_size: int = 256,
+    dump_multiprocess: str | None = None,
+    dump_asyncio: bool = False,
+    dump_all_tasks: bool = False,
+    dump_threads_signal: int | None = None,
+    dump_sample_rate: float = 1.0,
+    dump_sample_rates: Mapping[str | tuple[str, int], float] | None = None,
+    dump_cpu_fraction: float | None = None,
+    dump_policies: Mapping[str, DumpPolicy] | None = None,
+    dump_filter: VariableFilter | None = None,
+    dump_stats: bool = False,
+    dump_stats_interval: float | None = None,
 ) -> None:
     """Prepare for Logging
 
@@ -81,20 +277,214 @@ def configure(
         dump_locals (bool, optional): Dump the caller's stack when logging with a level of warning or higher. Defaults to False.
         dump_path (str | bytes | os.PathLike, optional): Custom path to use when dumping with 'dump_on_exception' or when 'dump_locals=True', otherwise use a temporary path if None. Defaults to None.
         remove_handlers (bool, optional): Remove existing logging handlers before adding the new stream handler. Defaults to True.
+        max_depth (int | None, optional): Default maximum depth of nested containers to expand when formatting, otherwise unlimited if None. Defaults to None.
+        max_items (int | None, optional): Default maximum number of items to represent per container, otherwise unlimited if None. Defaults to None.
+        max_length (int | None, optional): Default maximum number of characters per scalar representation, otherwise unlimited if None. Defaults to None.
+        max_bytes (int | None, optional): Default maximum number of bytes (UTF-8) to write per dump, otherwise unlimited if None. Defaults to None.
+        dump_async (bool, optional): Format and write dumps on a background thread, only taking a shallow snapshot of the stack on the logging thread. Defaults to False.
+        dump_queue_size (int, optional): Maximum number of dumps waiting to be written when 'dump_async=True'. Defaults to 64.
+        dump_overflow (str, optional): What to do with new dumps when the queue is full ("drop", "block", or "sample"). Defaults to "drop".
+        dump_first_n (int | None, optional): Maximum number of dumps per call site and exception type, otherwise unlimited if None. Defaults to None.
+        dump_rate (int | None, optional): Maximum number of dumps per 'dump_rate_per' seconds, otherwise unlimited if None. Defaults to None.
+        dump_rate_per (float, optional): Window of 'dump_rate' in seconds. Defaults to 60.0.
+        dump_summary_interval (float, optional): Minimum number of seconds between logging summaries of suppressed dumps. Defaults to 60.0.
+        dump_max_file_bytes (int | None, optional): Append dumps to a single file (the dump path, otherwise "<package_name>_stack_and_locals.log" in the temporary directory) that is rotated at this size, otherwise write each dump to a file of its own if None. Defaults to None.
+        dump_backup_count (int, optional): Maximum number of rotated dump files to keep when 'dump_max_file_bytes' is set. Defaults to 5.
+        dump_max_total_bytes (int | None, optional): Maximum size of the dump file and its rotated files together when 'dump_max_file_bytes' is set, otherwise only limited by 'dump_backup_count' if None. Defaults to None.
+        dump_compression (str | None, optional): Codec to compress dumps with while they are written ("gzip", "lzma", or "zstd" if the "zstandard" package is installed), otherwise not compressed if None. Defaults to None.
+        dump_format (str, optional): Format of the dumps ("text", or "jsonl" or "binary" for one structured record per frame). Defaults to "text".
+        dump_lazy (bool, optional): Only take a shallow snapshot of the stack when logging, and format the dumps when flushed with 'flush_dumps', on exception, or at exit. Defaults to False.
+        dump_buffer_size (int, optional): Maximum number of snapshots to keep when 'dump_lazy=True', evicting the oldest. Defaults to 64.
+        dump_log_records (int | None, optional): Keep this many of the most recent log records of all levels in memory and append them to dumps, otherwise disabled if None. The root logger is set to the debug level, and the handlers without a level to its previous level. Defaults to None.
+        async_handlers (bool, optional): Only queue log records on the logging thread, and format and write them with the stream handler on a listener thread. Defaults to False.
+        async_queue_size (int, optional): Maximum number of queued log records when 'async_handlers=True', dropping (and counting) new records when full. Defaults to 10000.
+        async_batch_size (int, optional): Maximum number of log records the listener writes at a time when 'async_handlers=True'. Defaults to 256.
+        dump_multiprocess (str | None, optional): How processes forked after configuring share dump files ("shard" for a file per process, "append" for a single write per dump, or "collect" to send dumps to a collector process, which requires 'dump_max_file_bytes'), otherwise not shared if None. Defaults to None.
+        dump_asyncio (bool, optional): Within an asyncio task, prepend the await chains of the tasks awaiting it to dumps. Defaults to False.
+        dump_all_tasks (bool, optional): Also append the await chains of all other pending tasks to dumps when 'dump_asyncio=True'. Defaults to False.
+        dump_threads_signal (int | None, optional): Signal to dump the stacks of all threads on with 'dump_threads' (e.g. `signal.SIGUSR1`), which must be set from the main thread, otherwise no signal handler if None. Defaults to None.
+        dump_sample_rate (float, optional): Probability of dumping the stack when logging with 'dump_locals=True', decided before any frames are inspected. Defaults to 1.0.
+        dump_sample_rates (Mapping[str | tuple[str, int], float] | None, optional): Probabilities of dumping the stack by logger name (applying to its children, or "" to all loggers), or by pairs of a logger name and a level (applying to the levels above it), overriding 'dump_sample_rate'. Defaults to None.
+        dump_cpu_fraction (float | None, optional): Adaptively skip dumping the stack when logging to spend at most this fraction of the time dumping, otherwise unlimited if None. Defaults to None.
+        dump_policies (Mapping[str, DumpPolicy] | None, optional): Policies for dumping the stack when logging by logger name, applying to its children (or "" to all loggers), overriding 'dump_locals' (e.g. `{"my_package.db": DumpPolicy(logging.ERROR), "my_package.http": DumpPolicy(None)}`). Defaults to None.
+        dump_filter (VariableFilter | None, optional): Filter deciding which variables are dumped and which values and headers are redacted, before they are formatted, otherwise dump all variables if None. Defaults to None.
+        dump_stats (bool, optional): Measure the time spent in each phase of a dump and what was written, read with `yogger.stats`. Defaults to False.
+        dump_stats_interval (float | None, optional): Minimum number of seconds between logging summaries of the statistics with 'dump_stats=True', otherwise never log them if None. Defaults to None.
+
+    Raises:
+        ValueError: If the compression codec, dump format, or multiprocess mode is not supported, a sampling probability or the CPU fraction is out of range, or the statistics interval is not greater than 0.
+        ModuleNotFoundError: If the compression codec is "zstd" and the "zstandard" package is not installed.
     """
+    check_codec(dump_compression)
+    check_format(dump_format)
+    if dump_multiprocess is not None and dump_multiprocess not in MULTIPROCESS_MODES:
+        raise ValueError(f"Unsupported multiprocess mode: {dump_multiprocess!r}")
+    if dump_multiprocess == "collect" and dump_max_file_bytes is None:
+        raise ValueError("Collecting dumps requires 'dump_max_file_bytes'")
+    # Validates the probabilities and CPU fraction
+    sampler = (
+        DumpSampler(
+            rate=dump_sample_rate,
+            rates=dump_sample_rates,
+            cpu_fraction=dump_cpu_fraction,
+        )
+        if dump_sample_rate < 1.0 or dump_sample_rates or dump_cpu_fraction is not None
+        else None
+    )
+    # Validates the interval
+    stats = DumpStats(log_interval=dump_stats_interval) if dump_stats else None
+
+    # Write pending dumps with the previous configuration
+    global _global_dump_buffer
+    if _global_dump_buffer is not None:
+        flush_dumps()
+        atexit.unregister(flush_dumps)
+    _global_dump_buffer = None
+
     global _global_package_name
     _global_package_name = package_name
 
+    global _global_dump_compression
+    _global_dump_compression = dump_compression
+
+    global _global_dump_format
+    _global_dump_format = dump_format
+
     global _global_dump_locals
     _global_dump_locals = dump_locals
 
+    global _global_dump_multiprocess
+    _global_dump_multiprocess = dump_multiprocess
+
+    global _global_dump_asyncio, _global_dump_all_tasks
+    _global_dump_asyncio = dump_asyncio
+    _global_dump_all_tasks = dump_all_tasks
+
+    # Restore the signal handler that was replaced
+    global _global_previous_signal_handler
+    if _global_previous_signal_handler is not None:
+        signal.signal(*_global_previous_signal_handler)
+        _global_previous_signal_handler = None
+    if dump_threads_signal is not None:
+        _global_previous_signal_handler = (
+            dump_threads_signal,
+            signal.signal(dump_threads_signal, _dump_threads_on_signal),
+        )
+
     if dump_path is not None:
         global _global_dump_path
         _global_dump_path = _resolve_path(dump_path)
 
+    sink_path = _global_dump_path or os.path.join(
+        tempfile.gettempdir(),
+        f"{package_name}_stack_and_locals.log"
+        + FORMAT_EXTENSIONS[dump_format]
+        + EXTENSIONS.get(dump_compression, ""),
+    )
+
+    # Forked before any threads are started
+    global _global_dump_collector
+    if _global_dump_collector is not None:
+        _global_dump_collector.stop()
+    _global_dump_collector = None
+    if dump_multiprocess == "collect":
+        _global_dump_collector = DumpCollector(
+            sink_path,
+            max_bytes=dump_max_file_bytes,
+            backup_count=dump_backup_count,
+            max_total_bytes=dump_max_total_bytes,
+        )
+        _global_dump_collector.start()
+
+    global _global_dump_worker
+    if _global_dump_worker is not None:
+        _global_dump_worker.close()
+    _global_dump_worker = (
+        DumpWorker(maxsize=dump_queue_size, overflow=dump_overflow)
+        if dump_async
+        else None
+    )
+
+    global _global_dump_sink
+    if _global_dump_sink is not None:
+        _global_dump_sink.close()
+    _global_dump_sink = (
+        DumpSink(
+            sink_path,
+            max_bytes=dump_max_file_bytes,
+            backup_count=dump_backup_count,
+            max_total_bytes=dump_max_total_bytes,
+            compression=dump_compression,
+            format=dump_format,
+            per_process=dump_multiprocess == "shard",
+            atomic=dump_multiprocess == "append",
+            collector=None
+            if _global_dump_collector is None
+            else _global_dump_collector.address,
+        )
+        if dump_max_file_bytes is not None
+        else None
+    )
+
+    if dump_lazy:
+        _global_dump_buffer = SnapshotBuffer(maxsize=dump_buffer_size)
+        atexit.register(flush_dumps)
+
+    global _global_dump_limiter
+    _global_dump_limiter = (
+        DumpLimiter(
+            first_n=dump_first_n,
+            rate=dump_rate,
+            per=dump_rate_per,
+            summary_interval=dump_summary_interval,
+        )
+        if dump_first_n is not None or dump_rate is not None
+        else None
+    )
+
+    global _global_dump_sampler
+    _global_dump_sampler = sampler
+
+    global _global_dump_policies
+    _global_dump_policies = {
+        name: policy
+        if policy.dump_path is None
+        else policy._replace(dump_path=_resolve_path(policy.dump_path))
+        for name, policy in (dump_policies or {}).items()
+    }
+    _clear_dump_policies()
+
+    _set_filter(dump_filter)
+    _set_stats(stats)
+
+    _set_default_limits(
+        Limits(
+            max_depth=max_depth,
+            max_items=max_items,
+            max_length=max_length,
+            max_bytes=max_bytes,
+        )
+    )
+
     # Get the root logger
     root_logger = logging.getLogger()
 
+    # Flush and remove the previous listener
+    global _global_log_listener
+    if _global_log_listener is not None:
+        root_logger.removeHandler(_global_log_listener.queue_handler)
+        _global_log_listener.stop()
+        _global_log_listener = None
+
+    # Remove the previous flight recorder and restore the level it replaced
+    global _global_flight_recorder, _global_root_level
+    if _global_flight_recorder is not None:
+        root_logger.removeHandler(_global_flight_recorder)
+        _global_flight_recorder = None
+    if _global_root_level is not None:
+        root_logger.setLevel(_global_root_level)
+        _global_root_level = None
+
     # Set logging levels using verbosity
     if verbosity > 0:
         level = logging.INFO if verbosity == 1 else logging.DEBUG
@@ -107,7 +497,27 @@ def configure(
     # Add a new stream handler
     handler = logging.StreamHandler()
     handler.setFormatter(logging.Formatter(fmt=LOG_FMT, datefmt=DATE_FMT, style="{"))
-    root_logger.addHandler(handler)
+    if async_handlers:
+        # Format and write on the listener thread
+        queue_handler = DroppingQueueHandler(maxsize=async_queue_size)
+        _global_log_listener = BatchQueueListener(
+            queue_handler, handler, batch_size=async_batch_size
+        )
+        _global_log_listener.start()
+        root_logger.addHandler(queue_handler)
+    else:
+        root_logger.addHandler(handler)
+
+    # Keep records below the level of the root logger in memory only
+    if dump_log_records is not None:
+        _global_root_level = root_logger.level
+        level = root_logger.getEffectiveLevel()
+        for existing_handler in root_logger.handlers:
+            if existing_handler.level == logging.NOTSET:
+                existing_handler.setLevel(level)
+        _global_flight_recorder = FlightRecorder(capacity=dump_log_records)
+        root_logger.addHandler(_global_flight_recorder)
+        root_logger.setLevel(logging.DEBUG)
 
     # Set logging level for third-party libraries
     level = logging.INFO if verbosity <= 1 else logging.DEBUG
@@ -115,159 +525,748 @@ def configure(
     logging.getLogger("urllib3").setLevel(level)
 
 
-def _exception_dumps(*, err: Exception) -> str:
-    """Create a String Representation of an Exception
+def _exception_repr(err: Exception) -> str:
+    """Create the Representation of an Exception
 
     Args:
         err (Exception): Exception that was raised.
 
     Returns:
-        str: Representation of the stack.
+        str: Representation of the exception.
     """
-    msg = ""
-    msg += "Exception:\n"
-    msg += f"  {type(err).__module__}.{type(err).__name__}: {err!s}\n"
-    msg += f"  args: {err.args!r}"
-    return msg
+    return (
+        "Exception:\n"
+        f"  {type(err).__module__}.{type(err).__name__}: {err!s}\n"
+        f"  args: {err.args!r}"
+    )
 
 
-def _stack_dumps(
-    stack: list[inspect.FrameInfo],
+def _write_stack(
+    w: Writer,
+    stack: StackLike,
     package_name: str | None = None,
-) -> str:
-    """Create a String Representation of Frames in a Stack
+) -> None:
+    """Write the Representation of Frames in a Stack
 
     Args:
-        stack (list[inspect.FrameInfo]): Stack to represent.
+        w (Writer): Writer to use.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack to represent.
         package_name (str | None, optional): Name of the package to dump from the stack, otherwise non-exclusive if set to None. Defaults to None.
+    """
+    stats = current_stats()
+    # Only frames relating to the user's package if package_name is provided
+    if stats is None:
+        frame_records: Iterable = select_frames(stack, package_name)
+    else:
+        start = time.perf_counter_ns()
+        frame_records = list(select_frames(stack, package_name))
+        stats.add(RESOLVE, time.perf_counter_ns() - start)
+
+    first = True
+    num_frames = num_variables = 0
+    try:
+        for frame_record in frame_records:
+            frame = frame_record[0]
+            if not first:
+                w.write("\n\n")
+            first = False
+            num_frames += 1
+
+            locals_ = frame.f_locals
+            w.scope = f"line {frame_record.lineno}, in {frame_record.function}"
+            w.write(
+                f'Locals from file "{frame_record.filename}", line {frame_record.lineno}, in {frame_record.function}{_frame_label(frame_record)}:'
+            )
+            w.indent()
+            # Excluded before they are formatted
+            variables = filter_variables(locals_)
+            num_variables += len(variables)
+            for var_name, var_value in variables.items():
+                w.newline()
+                w.write(f"{var_name} {type(var_value)} = ")
+                _write_variable(w, var_name, var_value)
+            w.dedent()
+
+            if ("self" in locals_) and hasattr(locals_["self"], "__dict__"):
+                attributes = filter_variables(locals_["self"].__dict__)
+                num_variables += len(attributes)
+                w.write("\n\nObject dict:\n")
+                _write_variable(w, "self.__dict__", attributes)
+    finally:
+        if stats is not None:
+            stats.add_frames(num_frames, num_variables)
+
+
+def _frame_label(frame_record: inspect.FrameInfo | FrameRecord) -> str:
+    """Create the Label of the Thread and Task of a Frame
+
+    Args:
+        frame_record (inspect.FrameInfo | FrameRecord): Frame record to label.
 
     Returns:
-        str: Representation of the stack.
+        str: Label of the thread and task of the frame, otherwise an empty string if neither is known.
     """
-    msg = ""
-    modules = [inspect.getmodule(frame_record[0]) for frame_record in stack]
-    for i, (module, frame_record) in enumerate(zip(modules, stack)):
-        if module is None:
-            # Moduleless frame, e.g. dataclass.__init__
-            for j in reversed(range(i)):
-                if modules[j] is not None:
-                    break
-            else:
-                # No previous module scope
-                continue
+    labels = [
+        f"{kind} {name!r}"
+        for kind, name in (
+            ("thread", getattr(frame_record, "thread", None)),
+            ("task", getattr(frame_record, "task", None)),
+        )
+        if name is not None
+    ]
+    return f" ({', '.join(labels)})" if labels else ""
 
-            module = modules[j]
 
-        # Only frames relating to the user's package if package_name is provided
-        if (
-            (package_name is None)
-            or module.__name__.startswith(f"{package_name}.")
-            or (module.__name__ == package_name)
-        ):
-            locals_ = frame_record[0].f_locals
-            msg += f'Locals from file "{frame_record.filename}", line {frame_record.lineno}, in {frame_record.function}:\n'
-            for var_name in locals_:
-                var_value = locals_[var_name]
-                msg += f"  {var_name} {type(var_value)} = "
-                msg += pformat(var_name, var_value).replace("\n", "\n  ")
-                msg += "\n"
-
-            msg += "\n"
-            if ("self" in locals_) and hasattr(locals_["self"], "__dict__"):
-                msg += "Object dict:\n"
-                msg += repr(locals_["self"].__dict__)
+def _write_variable(w: Writer, name: str, value: object) -> None:
+    """Write the Representation of a Variable, Marking it if Formatting Fails
 
-    return msg.rstrip("\n")
+    Formatting can fail when a dump is written in the background while the
+    application mutates the value, e.g. "dictionary changed size during iteration".
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the variable.
+        value (object): Value of the variable.
+    """
+    state = w.checkpoint()
+    try:
+        w.format(name, value)
+    except _OutputLimitReached:
+        raise
+    except Exception as err:
+        w.restore(state)
+        w.write(f" <changed during dump: {type(err).__name__}: {err}>")
+
+
+def _write_dump(
+    w: Writer,
+    stack: StackLike,
+    *,
+    err: Exception | None = None,
+    package_name: str | None = None,
+) -> None:
+    """Write the Representation of an Interpreter Stack
+
+    Room for the exception is reserved from 'max_bytes' while writing the stack, so
+    the exception is always written, even if the stack is truncated.
+
+    Args:
+        w (Writer): Writer to use.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to represent.
+        err (Exception | None, optional): Exception that was raised. Defaults to None.
+        package_name (str | None, optional): Name of the package to dump from the stack, otherwise non-exclusive if set to None. Defaults to None.
+    """
+    exc_repr = None if err is None else "\n\n" + _exception_repr(err)
+    max_bytes = w.max_bytes
+    if exc_repr is not None and max_bytes is not None:
+        w.max_bytes = max(max_bytes - len(exc_repr.encode("utf-8")), 0)
+
+    try:
+        _write_stack(w, stack, package_name)
+    except _OutputLimitReached:
+        pass
+
+    if exc_repr is not None:
+        # Already accounted for
+        w.max_bytes = None
+        w.restore(("", 0))
+        w.write(exc_repr)
+        w.max_bytes = max_bytes
 
 
 def dumps(
-    stack: list[inspect.FrameInfo],
+    stack: StackLike,
     *,
     err: Exception | None = None,
     package_name: str | None = None,
+    max_depth: LimitArg = DEFAULT,
+    max_items: LimitArg = DEFAULT,
+    max_length: LimitArg = DEFAULT,
+    max_bytes: LimitArg = DEFAULT,
+    format: str = "text",
 ) -> str:
     """Create a String Representation of an Interpreter Stack
 
-    Externalizes '_stack_dumps' to be accessed by the user.
+    Limits that are not provided fall back to those set with `yogger.configure`, and
+    are disabled if set to None. The "jsonl" format only applies 'max_length'.
 
     Args:
-        stack (list[inspect.FrameInfo]): Stack of frames to represent.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to represent.
         err (Exception | None, optional): Exception that was raised. Defaults to None.
         package_name (str | None, optional): Name of the package to dump from the stack, otherwise non-exclusive if set to None. Defaults to None.
+        max_depth (int | None, optional): Maximum depth of nested containers to expand. Defaults to DEFAULT.
+        max_items (int | None, optional): Maximum number of items to represent per container. Defaults to DEFAULT.
+        max_length (int | None, optional): Maximum number of characters per scalar representation. Defaults to DEFAULT.
+        max_bytes (int | None, optional): Maximum number of bytes (UTF-8) to write in total. Defaults to DEFAULT.
+        format (str, optional): Format of the representation ("text" or "jsonl"). Defaults to "text".
 
     Returns:
         str: Representation of the stack.
+
+    Raises:
+        ValueError: If the format is not supported, or is "binary".
     """
-    msg = ""
-    msg += _stack_dumps(stack=stack, package_name=package_name)
-    if err is not None:
-        msg += "\n\n"
-        msg += _exception_dumps(err=err)
-    return msg
+    check_format(format)
+    if format != "text":
+        if format == "binary":
+            raise ValueError("The binary format can only be written with 'dump'")
+        return "".join(
+            encode_record(record, format)
+            for record in iter_records(
+                stack, err=err, package_name=package_name, max_length=max_length
+            )
+        )
+
+    w = Writer(
+        max_depth=max_depth,
+        max_items=max_items,
+        max_length=max_length,
+        max_bytes=max_bytes,
+    )
+    _write_dump(w, stack, err=err, package_name=package_name)
+    return w.getvalue()
 
 
 def dump(
     fp: io.TextIOBase | io.BytesIO,  # wvutils.dtypes.FileObject
-    stack: list[inspect.FrameInfo],
+    stack: StackLike,
     *,
     err: Exception | None = None,
     package_name: str | None = None,
+    max_depth: LimitArg = DEFAULT,
+    max_items: LimitArg = DEFAULT,
+    max_length: LimitArg = DEFAULT,
+    max_bytes: LimitArg = DEFAULT,
+    format: str = "text",
 ) -> None:
     """Write the Representation of an Interpreter Stack using a File Object
 
+    The representation is streamed to the file object as it is formatted, a record at
+    a time for the structured formats. Limits that are not provided fall back to those
+    set with `yogger.configure`, and are disabled if set to None. The structured
+    formats only apply 'max_length'.
+
     Args:
-        fp (io.TextIOBase | io.BytesIO): File object to use for writing.
-        stack (list[inspect.FrameInfo]): Stack of frames to dump.
+        fp (io.TextIOBase | io.BytesIO): File object to use for writing, which must be binary for the "binary" format.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
         err (Exception | None, optional): Exception that was raised. Defaults to None.
         package_name (str | None, optional): Name of the package to dump from the stack, otherwise non-exclusive if set to None. Defaults to None.
+        max_depth (int | None, optional): Maximum depth of nested containers to expand. Defaults to DEFAULT.
+        max_items (int | None, optional): Maximum number of items to represent per container. Defaults to DEFAULT.
+        max_length (int | None, optional): Maximum number of characters per scalar representation. Defaults to DEFAULT.
+        max_bytes (int | None, optional): Maximum number of bytes (UTF-8) to write in total. Defaults to DEFAULT.
+        format (str, optional): Format of the representation ("text", "jsonl", or "binary"). Defaults to "text".
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    check_format(format)
+    write: Callable[[str], object]
+    if isinstance(fp, io.BytesIO) or format == "binary":
+        write = lambda text: fp.write(text.encode("utf-8"))
+    else:
+        write = fp.write
+
+    if format != "text":
+        for record in iter_records(
+            stack, err=err, package_name=package_name, max_length=max_length
+        ):
+            data = encode_record(record, format)
+            if isinstance(data, bytes):
+                fp.write(data)
+            else:
+                write(data)
+        return
+
+    w = Writer(
+        write,
+        max_depth=max_depth,
+        max_items=max_items,
+        max_length=max_length,
+        max_bytes=max_bytes,
+    )
+    _write_dump(w, stack, err=err, package_name=package_name)
+    w.flush()
+    write("\n")
+
+
+def flush_dumps() -> list[DumpLocation]:
+    """Format and Write the Dumps Captured with 'dump_locals=True' and 'dump_lazy=True'
+
+    Values are represented in the state they are in now, not when they were captured.
+    Called on exception within 'dump_on_exception', and at exit.
+
+    Returns:
+        list[DumpLocation]: Locations of the dumps that were written.
+    """
+    buffer = _global_dump_buffer
+    if buffer is None:
+        return []
+
+    pending, evicted = buffer.drain()
+    if evicted:
+        _log_without_stack(
+            logging.WARNING,
+            f"Evicted {evicted:,} lazily captured dumps before they were flushed",
+        )
+
+    locations = []
+    for pending_dump in pending:
+        location = _dump(
+            stack=pending_dump.stack,
+            err=pending_dump.err,
+            dump_path=pending_dump.dump_path,
+            package_name=pending_dump.package_name,
+        )
+        if location is not None:
+            _log_without_stack(
+                logging.WARNING,
+                f"Lazy dump {pending_dump.dump_id}: {_dump_msg(location)}",
+            )
+            locations.append(location)
+    return locations
+
+
+def dump_threads(
+    dump_path: str | bytes | os.PathLike | None = None,
+    compression: str | None = None,
+) -> DumpLocation | None:
+    """Dump the Stacks of All Threads
+
+    Takes a shallow snapshot of the stacks of all threads (only frames relating to
+    the package set with `yogger.configure`), and writes them as one dump with every
+    frame labeled with its thread. The location of the dump and the time taken to
+    capture each thread are logged.
+
+    Args:
+        dump_path (str | bytes | os.PathLike | None, optional): Override the file path to use for the dump. Defaults to None.
+        compression (str | None, optional): Override the codec to compress the dump with ("gzip", "lzma", or "zstd"), unless appended to the rotating dump file. Defaults to None.
+
+    Returns:
+        DumpLocation | None: Location of the dump, otherwise None if no frames were captured or it was dropped.
+
+    Raises:
+        ValueError: If the compression codec is not supported.
+    """
+    check_codec(compression)
+    stack, timings = capture_threads(package_name=_global_package_name)
+    total_ns = sum(timing.elapsed_ns for timing in timings)
+    stats = current_stats()
+    if stats is not None:
+        stats.add(CAPTURE, total_ns)
+    lines = [
+        f"Captured the stacks of {len(timings):,} threads in {total_ns / 1e6:,.3f} ms"
+    ]
+    lines.extend(
+        f"  {timing.thread}: {timing.num_frames:,} frames"
+        f" in {timing.elapsed_ns / 1e6:,.3f} ms"
+        for timing in timings
+    )
+
+    location = None
+    if stack:
+        location = _dump(
+            stack=stack, err=None, dump_path=dump_path, compression=compression
+        )
+        if location is not None:
+            lines.append(_dump_msg(location))
+    _log_without_stack(logging.WARNING, "\n".join(lines))
+    return location
+
+
+def _dump_threads_on_signal(signum: int, frame: FrameType | None) -> None:
+    """Signal Handler to Dump the Stacks of All Threads
+
+    The dump is written by a thread of its own, as the interrupted main thread may
+    hold a lock that writing the dump needs.
+
+    Args:
+        signum (int): Number of the signal.
+        frame (FrameType | None): Frame that was interrupted.
+    """
+    threading.Thread(
+        target=dump_threads, name="yogger-thread-dump", daemon=True
+    ).start()
+
+
+def _log_without_stack(level: int, msg: str) -> None:
+    """Log with the Global Logger without Dumping the Stack
+
+    Args:
+        level (int): Log level to use.
+        msg (str): Message to log.
     """
-    result = dumps(stack, err=err, package_name=package_name)
-    if isinstance(fp, io.BytesIO):
-        fp.write((result + "\n").encode("utf-8"))
+    if isinstance(_logger, Yogger):
+        logging.Logger.log(_logger, level, msg)
     else:
-        fp.write(result + "\n")
+        _logger.log(level, msg)
+
+
+def _allow_dump(
+    limiter: DumpLimiter,
+    fingerprint: Hashable,
+    log: Callable[[str], object],
+) -> bool:
+    """Decide if a Dump should be Written, Logging a Summary of Suppressed Dumps if Due
+
+    Args:
+        limiter (DumpLimiter): Limiter to decide with.
+        fingerprint (Hashable): Fingerprint of the dump, its exception type and call site.
+        log (Callable[[str], object]): Function to log the summary with.
+
+    Returns:
+        bool: True if the dump should be written.
+    """
+    allowed = limiter.allow(fingerprint)
+    summary = limiter.summary()
+    if summary is not None:
+        log(summary)
+    return allowed
 
 
 def _dump(
     *,
-    stack: list[inspect.FrameInfo],
+    stack: StackLike,
     err: Exception | None,
     dump_path: str | bytes | os.PathLike | None,
-) -> str:
+    compression: str | None = None,
+    package_name: str | None = None,
+) -> DumpLocation | None:
     """Internal Function to Dump the Representation of the Exception and Interpreter Stack to File
 
+    Dumps are appended to the dump sink if one was configured and the path is not
+    overridden, otherwise each dump is written to a file of its own.
+
+    When dumping in the background, only a snapshot of the stack is taken before the
+    dump is queued. Temporary files are still created on the calling thread, so the
+    logged path is reserved atomically before the dump is queued, and removed again
+    if the dump is dropped.
+
     Args:
-        stack (list[inspect.FrameInfo]): Stack of frames to dump.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
         err (Exception | None): Exception that was raised.
         dump_path (str | bytes | os.PathLike | None): Overridden file path to use for the dump.
+        compression (str | None, optional): Overridden codec to compress a dump to a file of its own with. Defaults to None.
+        package_name (str | None, optional): Overridden name of the package to dump from the stack. Defaults to None.
 
     Returns:
-        str: Path of the resulting dump.
+        DumpLocation | None: Location of the resulting dump, otherwise None if it was dropped.
     """
-    msg = dumps(stack, package_name=_global_package_name, err=err) + "\n"
+    stats = current_stats()
+    if stats is not None:
+        summary = stats.summary()
+        if summary is not None:
+            _log_without_stack(logging.INFO, summary)
+
+    # Taken now, so records logged after the dump are not part of it
+    recorder = _global_flight_recorder
+    records = None if recorder is None else recorder.records()
+
+    package_name = package_name or _global_package_name
+    if _global_dump_sink is not None and dump_path is None:
+        return _dump_record(
+            _global_dump_sink,
+            stack=stack,
+            err=err,
+            records=records,
+            package_name=package_name,
+        )
+
+    compression = compression or _global_dump_compression
+
     user_dump_path = dump_path or _global_dump_path
     if user_dump_path is not None:
         # User-provided path (assigned when user ran configure, or overridden in this method)
-        with open(_resolve_path(user_dump_path), mode="a", encoding="utf-8") as wf:
-            wf.write(msg)
-            return wf.name
+        path = _resolve_path(user_dump_path)
+        if _global_dump_multiprocess == "shard":
+            path = shard_path(path)
     else:
         # Temporary file
-        with tempfile.NamedTemporaryFile(
-            "w",
+        fd, path = tempfile.mkstemp(
             # Fix the prefix if the user did not run 'configure'
             prefix=f"{_global_package_name}_stack_and_locals"
             if _global_package_name is not None
             else "stack_and_locals",
-            delete=False,
-        ) as wf:
-            wf.write(msg)
-            return wf.name
+            suffix=FORMAT_EXTENSIONS[_global_dump_format]
+            + EXTENSIONS.get(compression, ""),
+        )
+        os.close(fd)
+
+    if _global_dump_worker is not None:
+        job = functools.partial(
+            _write_dump_file,
+            path,
+            snapshot_stack(stack),
+            err,
+            package_name,
+            compression,
+            _global_dump_format,
+            records,
+            _global_dump_multiprocess == "append",
+        )
+        if not _global_dump_worker.submit(job):
+            if user_dump_path is None:
+                os.remove(path)
+            return None
+    else:
+        _write_dump_file(
+            path,
+            stack,
+            err,
+            package_name,
+            compression,
+            _global_dump_format,
+            records,
+            _global_dump_multiprocess == "append",
+        )
+    return DumpLocation(path, compression=compression, format=_global_dump_format)
+
+
+def _dump_record(
+    sink: DumpSink,
+    *,
+    stack: StackLike,
+    err: Exception | None,
+    records: list[logging.LogRecord] | None = None,
+    package_name: str | None = None,
+) -> DumpLocation | None:
+    """Internal Function to Dump the Representation of the Exception and Interpreter Stack to a Sink
+
+    Args:
+        sink (DumpSink): Sink to append the dump to.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
+        err (Exception | None): Exception that was raised.
+        records (list[logging.LogRecord] | None, optional): Recent log records to append to the dump. Defaults to None.
+        package_name (str | None, optional): Overridden name of the package to dump from the stack. Defaults to None.
+
+    Returns:
+        DumpLocation | None: Location of the resulting record (without an offset if written in the background), otherwise None if it was dropped.
+    """
+    record_id = sink.reserve_id()
+    package_name = package_name or _global_package_name
+    if _global_dump_worker is None:
+        return sink.write(
+            functools.partial(
+                _write_record,
+                stack,
+                err,
+                package_name,
+                sink.format,
+                record_id,
+                records=records,
+            ),
+            record_id,
+        )
+
+    write_dump = functools.partial(
+        _write_record,
+        snapshot_stack(stack),
+        err,
+        package_name,
+        sink.format,
+        record_id,
+        records=records,
+    )
+    if not _global_dump_worker.submit(
+        functools.partial(sink.write, write_dump, record_id)
+    ):
+        return None
+    return DumpLocation(sink.path, None, record_id, sink.compression, sink.format)
+
+
+def _write_record(
+    stack: StackLike,
+    err: Exception | None,
+    package_name: str | None,
+    format: str,
+    record_id: str,
+    write: Callable[[str | bytes], object],
+    *,
+    records: list[logging.LogRecord] | None = None,
+) -> None:
+    """Write the Representation of the Exception and Interpreter Stack as a Record of a Sink
+
+    Args:
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
+        err (Exception | None): Exception that was raised.
+        package_name (str | None): Name of the package to dump from the stack.
+        format (str): Format of the record.
+        record_id (str): Identifier of the record, added to every structured record.
+        write (Callable[[str | bytes], object]): Function to write the record with.
+        records (list[logging.LogRecord] | None, optional): Recent log records to append to the dump. Defaults to None.
+    """
+    stats = current_stats()
+    timer = None if stats is None else DumpTimer(stats)
+    if timer is not None:
+        write = timer.wrap(write)
+
+    if format != "text":
+        for record in iter_records(
+            stack, err=err, package_name=package_name, dump_id=record_id
+        ):
+            write(encode_record(record, format))
+    else:
+        w = Writer(write)
+        _write_dump(w, stack, err=err, package_name=package_name)
+        w.flush()
+        if records:
+            write("\n")
+
+    if records:
+        write_records(write, records, format, record_id)
+    if timer is not None:
+        timer.finish()
+
+
+def _dump_msg(location: DumpLocation) -> str:
+    """Create the Message to Log for a Dump
+
+    Args:
+        location (DumpLocation): Location of the dump.
+
+    Returns:
+        str: Message pointing to the dump, with a command to view it.
+    """
+    text = location.format == "text"
+    if location.record_id is None:
+        if location.compression is None and location.format != "binary":
+            return DUMP_MSG.format(path=location.path)
+        reader = "yogger.compress" if text else "yogger.structured"
+        return DUMP_VIEW_MSG.format(
+            location=f'"{location.path}"',
+            command=f"python -m {reader} '{location.path}'",
+        )
+
+    if location.offset is None:
+        where = f'"{location.path}" (dump {location.record_id})'
+    else:
+        where = f'"{location.path}:{location.offset}" (dump {location.record_id})'
+
+    if not text:
+        select = f"grep '\"dump\":\"{location.record_id}\"'"
+        if location.compression is None and location.format == "jsonl":
+            command = f"{select} '{location.path}'"
+        else:
+            command = f"python -m yogger.structured '{location.path}' | {select}"
+    elif location.compression is not None and location.offset is not None:
+        command = (
+            f"python -m yogger.compress --offset {location.offset} '{location.path}'"
+        )
+    else:
+        select = f"awk '/^--- dump /{{p=$3==\"{location.record_id}\"}} p'"
+        if location.compression is None:
+            command = f"{select} '{location.path}'"
+        else:
+            command = f"python -m yogger.compress '{location.path}' | {select}"
+    return DUMP_VIEW_MSG.format(location=where, command=command)
+
+
+def _write_dump_file(
+    path: str,
+    stack: StackLike,
+    err: Exception | None,
+    package_name: str | None,
+    compression: str | None = None,
+    format: str = "text",
+    records: list[logging.LogRecord] | None = None,
+    atomic: bool = False,
+) -> None:
+    """Append the Representation of the Exception and Interpreter Stack to a File
+
+    If compressed, the representation is streamed through the compressor as it is
+    formatted, and appended as a compressed stream of its own. If atomic, it is
+    formatted in memory instead, and appended with a single write.
+
+    Args:
+        path (str): Path of the file.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
+        err (Exception | None): Exception that was raised.
+        package_name (str | None): Name of the package to dump from the stack.
+        compression (str | None, optional): Codec to compress with, otherwise not compressed if None. Defaults to None.
+        format (str, optional): Format of the representation. Defaults to "text".
+        records (list[logging.LogRecord] | None, optional): Recent log records to append to the dump. Defaults to None.
+        atomic (bool, optional): Append with a single write, so processes appending to the same file do not interleave. Defaults to False.
+    """
+    stats = current_stats()
+    timer = None if stats is None else DumpTimer(stats)
+    write_dump = functools.partial(
+        _write_dump_stream,
+        stack=stack,
+        err=err,
+        package_name=package_name,
+        compression=compression,
+        format=format,
+        records=records,
+        timer=timer,
+    )
+    with open(path, mode="ab", buffering=0 if atomic else -1) as raw:
+        if not atomic:
+            write_dump(raw)
+            if timer is not None:
+                timer.call(raw.flush)
+        else:
+            buffer = io.BytesIO()
+            try:
+                write_dump(buffer)
+            finally:
+                # Even if the dump failed, as the failure is marked in it
+                if timer is None:
+                    append_atomic(raw, buffer.getvalue())
+                else:
+                    timer.call(append_atomic, raw, buffer.getvalue())
+    if timer is not None:
+        timer.finish()
+
+
+def _write_dump_stream(
+    fp: io.RawIOBase | io.BufferedIOBase,
+    *,
+    stack: StackLike,
+    err: Exception | None,
+    package_name: str | None,
+    compression: str | None,
+    format: str,
+    records: list[logging.LogRecord] | None,
+    timer: DumpTimer | None = None,
+) -> None:
+    """Write the Representation of the Exception and Interpreter Stack to a Binary File Object
+
+    The file object is left open.
+
+    Args:
+        fp (io.RawIOBase | io.BufferedIOBase): File object to write to.
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to dump.
+        err (Exception | None): Exception that was raised.
+        package_name (str | None): Name of the package to dump from the stack.
+        compression (str | None): Codec to compress with, otherwise not compressed if None.
+        format (str): Format of the representation.
+        records (list[logging.LogRecord] | None): Recent log records to append to the dump.
+        timer (DumpTimer | None, optional): Timer to charge the time spent writing to, otherwise not timed if None. Defaults to None.
+    """
+    out = fp if compression is None else compressor(fp, compression)
+    # Written through, so the time spent compressing and writing is charged to it
+    timed = out if timer is None else TimedFile(out, timer)
+    wf = timed if format == "binary" else io.TextIOWrapper(timed, encoding="utf-8")
+    try:
+        dump(wf, stack, err=err, package_name=package_name, format=format)
+        if records:
+            write_records(wf.write, records, format)
+    except Exception as exc:
+        # The path was already logged, so leave a trace of the failure there
+        wf.write(failure_marker(exc, format))
+        raise
+    finally:
+        if wf is not timed:
+            # Flush without closing
+            wf.detach()
+        if out is not fp:
+            timed.close()
 
 
 @contextlib.contextmanager
 def dump_on_exception(
     dump_path: str | bytes | os.PathLike | None = None,
+    compression: str | None = None,
 ) -> Generator[None, None, None]:
     """Content Manager to Dump if an Exception is Raised
 
@@ -275,24 +1274,159 @@ def dump_on_exception(
 
     Args:
         dump_path (str | bytes | os.PathLike | None, optional): Override the file path to use for the dump. Defaults to None.
+        compression (str | None, optional): Override the codec to compress the dump with ("gzip", "lzma", or "zstd"), unless appended to the rotating dump file. Defaults to None.
 
     Yields:
         Generator[None, None, None]: Context manager.
 
     Raises:
+        ValueError: If the compression codec is not supported.
         Exception: Exception that was raised.
     """
+    check_codec(compression)
     try:
         yield
     except Exception as err:
-        trace = inspect.trace()
-        if len(trace) > 1:
-            path = _dump(stack=trace[1:], err=err, dump_path=dump_path)
-            _logger.fatal(DUMP_MSG.format(path=path))
+        trace = _exception_trace(err)
+        if trace is None:
+            raise
+
+        # Dumps captured before the exception are part of the report
+        flush_dumps()
+
+        if trace:
+            location = _dump(
+                stack=trace,
+                err=err,
+                dump_path=dump_path,
+                compression=compression,
+            )
+            if location is not None:
+                _logger.fatal(_dump_msg(location))
 
         raise
 
 
+@contextlib.asynccontextmanager
+async def async_dump_on_exception(
+    dump_path: str | bytes | os.PathLike | None = None,
+    compression: str | None = None,
+) -> AsyncGenerator[None, None]:
+    """Asynchronous Context Manager to Dump if an Exception is Raised
+
+    Like `dump_on_exception`, but the dump is written on a thread, so the event loop
+    keeps running other tasks meanwhile. A shallow snapshot of the stack is taken
+    first, as those tasks may move on.
+
+    Args:
+        dump_path (str | bytes | os.PathLike | None, optional): Override the file path to use for the dump. Defaults to None.
+        compression (str | None, optional): Override the codec to compress the dump with ("gzip", "lzma", or "zstd"), unless appended to the rotating dump file. Defaults to None.
+
+    Yields:
+        AsyncGenerator[None, None]: Asynchronous context manager.
+
+    Raises:
+        ValueError: If the compression codec is not supported.
+        Exception: Exception that was raised.
+    """
+    check_codec(compression)
+    try:
+        yield
+    except Exception as err:
+        trace = _exception_trace(err)
+        if trace is None:
+            raise
+
+        # Dumps captured before the exception are part of the report
+        await asyncio.to_thread(flush_dumps)
+
+        if trace:
+            location = await asyncio.to_thread(
+                _dump,
+                stack=snapshot_stack(trace),
+                err=err,
+                dump_path=dump_path,
+                compression=compression,
+            )
+            if location is not None:
+                _logger.fatal(_dump_msg(location))
+
+        raise
+
+
+def _exception_trace(err: Exception) -> list | None:
+    """Capture the Trace of an Exception Raised within a Context Manager to Dump
+
+    Args:
+        err (Exception): Exception that was raised.
+
+    Returns:
+        list[FrameRecord] | None: Frame records of the trace, otherwise None if the dump was suppressed.
+    """
+    # Skip the frame of the context manager
+    tb = err.__traceback__.tb_next if err.__traceback__ is not None else None
+    limiter = _global_dump_limiter
+    if limiter is not None and not _allow_dump(
+        limiter,
+        (type(err), fingerprint_trace(tb)),
+        functools.partial(_log_without_stack, logging.WARNING),
+    ):
+        return None
+
+    stats = current_stats()
+    start = 0 if stats is None else time.perf_counter_ns()
+    trace = capture_trace(tb, package_name=_global_package_name)
+    if trace and _global_dump_asyncio:
+        trace = with_tasks(trace, all_tasks=_global_dump_all_tasks)
+    if trace and stats is not None:
+        stats.add(CAPTURE, time.perf_counter_ns() - start)
+    return trace
+
+
+def _clear_dump_policies() -> None:
+    """Clear the Dump Policies Cached on the Loggers, to Resolve them Again"""
+    for logger in list(_loggers):
+        logger.__dict__.pop("_dump_policy", None)
+
+
+def _reinit_after_fork() -> None:
+    """Re-Initialize the Global State in a Forked Child
+
+    Only the forking thread survives a fork, so the threads of the dump worker and log
+    listener are restarted, and locks that other threads may have held are replaced.
+    Dumps and log records that were queued or captured by the parent are discarded,
+    as the parent still writes them.
+    """
+    global _global_dump_worker
+    worker = _global_dump_worker
+    if worker is not None:
+        atexit.unregister(worker.close)
+        _global_dump_worker = DumpWorker(
+            maxsize=worker.maxsize,
+            overflow=worker.overflow,
+            sample_every=worker.sample_every,
+        )
+
+    if _global_log_listener is not None:
+        _global_log_listener.after_fork()
+    if _global_dump_sink is not None:
+        _global_dump_sink.after_fork()
+    if _global_dump_limiter is not None:
+        _global_dump_limiter.after_fork()
+    if _global_dump_sampler is not None:
+        _global_dump_sampler.after_fork()
+    if _global_dump_buffer is not None:
+        _global_dump_buffer.after_fork()
+    stats = current_stats()
+    if stats is not None:
+        stats.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    # Not available on Windows
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
 def _set_levels(logger: logging.Logger, level: int) -> None:
     """Set the Log Level for a Logger and its Handlers
 
@@ -0,0 +1,435 @@
+"""Capture frames from the interpreter stack.
+
+This module contains lightweight alternatives to `inspect.stack` and `inspect.trace`
+that walk the frames directly without loading any source context.
+"""
+
+import inspect
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from types import CodeType, FrameType, ModuleType, TracebackType
+from typing import NamedTuple
+
+#: Call site of a dump, the identity of the code object and the line number of every
+#: frame, innermost first (code objects are slow to hash)
+Fingerprint = tuple[tuple[int, int], ...]
+
+
+class FrameSnapshot:
+    """Shallow Snapshot of a Frame
+
+    Stands in for a frame once it may have moved on. The locals are a shallow copy,
+    so values that are mutated after the snapshot was taken are represented in
+    their mutated state.
+
+    Args:
+        frame (FrameType | FrameSnapshot): Frame to take a snapshot of.
+    """
+
+    __slots__ = ("f_locals", "f_globals", "f_code", "f_lineno")
+
+    def __init__(self, frame: "FrameType | FrameSnapshot") -> None:
+        self.f_locals = dict(frame.f_locals)
+        self.f_globals = frame.f_globals
+        self.f_code = frame.f_code
+        self.f_lineno = frame.f_lineno
+
+
+class FrameRecord(NamedTuple):
+    """Lightweight Record of a Frame in a Stack
+
+    Mirrors the leading fields of `inspect.FrameInfo` so either can be dumped.
+    """
+
+    frame: FrameType | FrameSnapshot
+    filename: str
+    lineno: int
+    function: str
+    #: Name of the asyncio task of the frame, if known
+    task: str | None = None
+    #: Name of the thread of the frame, if captured from all threads
+    thread: str | None = None
+
+
+class ThreadTiming(NamedTuple):
+    """Time Taken to Capture the Stack of a Thread"""
+
+    #: Name of the thread
+    thread: str
+    #: Number of frames captured
+    num_frames: int
+    #: Time taken in nanoseconds
+    elapsed_ns: int
+
+
+def _in_package(module_name: str | None, package_name: str) -> bool:
+    """Check if a Module Name Belongs to a Package
+
+    Args:
+        module_name (str | None): Name of the module to check.
+        package_name (str): Name of the package.
+
+    Returns:
+        bool: True if the module is the package or one of its submodules.
+    """
+    return module_name is not None and (
+        module_name == package_name or module_name.startswith(f"{package_name}.")
+    )
+
+
+def _is_current(module: ModuleType | None) -> bool:
+    """Check if a Module is Still the One Registered under its Name
+
+    Args:
+        module (ModuleType | None): Module to check, or None for a moduleless frame.
+
+    Returns:
+        bool: True if the module was not removed or replaced in `sys.modules`.
+    """
+    return module is None or sys.modules.get(module.__name__) is module
+
+
+class ModuleResolver:
+    """Frame to Module Resolver
+
+    Resolves modules through `frame.f_globals["__name__"]` in constant time, only
+    falling back to `inspect.getmodule` (which scans `sys.modules`) when that fails.
+    Results of the fallback and package checks are cached per file name and code
+    object. The caches are cleared when the size of `sys.modules` changes, and a
+    cached module is only used while it is still the module registered under its
+    name, so modules that were replaced or reloaded are resolved again.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries in each cache. Defaults to 4096.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._num_modules = len(sys.modules)
+        self._modules_by_filename: dict[str, ModuleType | None] = {}
+        self._packages_by_code: dict[
+            tuple[CodeType, str], tuple[bool | None, ModuleType | None]
+        ] = {}
+
+    def clear(self) -> None:
+        """Clear the Caches"""
+        self._num_modules = len(sys.modules)
+        self._modules_by_filename.clear()
+        self._packages_by_code.clear()
+
+    def _validate(self) -> None:
+        """Clear the Caches if Modules were Imported or Removed"""
+        if len(sys.modules) != self._num_modules:
+            self.clear()
+
+    def _store(self, cache: dict, key: object, value: object) -> None:
+        """Store a Value in a Cache, Evicting the Oldest Entry if Full
+
+        Args:
+            cache (dict): Cache to store the value in.
+            key (object): Key of the value.
+            value (object): Value to store.
+        """
+        if len(cache) >= self.maxsize:
+            cache.pop(next(iter(cache), None), None)
+        cache[key] = value
+
+    def module(self, frame: FrameType | FrameSnapshot) -> ModuleType | None:
+        """Resolve the Module of a Frame
+
+        Args:
+            frame (FrameType | FrameSnapshot): Frame to resolve.
+
+        Returns:
+            ModuleType | None: Module of the frame, otherwise None if it could not be resolved.
+        """
+        module = sys.modules.get(frame.f_globals.get("__name__"))
+        if module is not None and getattr(module, "__dict__", None) is frame.f_globals:
+            return module
+
+        # E.g. code executed with a copied namespace
+        self._validate()
+        filename = frame.f_code.co_filename
+        try:
+            module = self._modules_by_filename[filename]
+        except KeyError:
+            pass
+        else:
+            if _is_current(module):
+                return module
+
+        module = inspect.getmodule(frame.f_code)
+        self._store(self._modules_by_filename, filename, module)
+        return module
+
+    def in_package(
+        self,
+        frame: FrameType | FrameSnapshot,
+        package_name: str,
+    ) -> bool | None:
+        """Check if the Module of a Frame Belongs to a Package
+
+        Args:
+            frame (FrameType | FrameSnapshot): Frame to check.
+            package_name (str): Name of the package.
+
+        Returns:
+            bool | None: True if the module is the package or one of its submodules, otherwise None if the module could not be resolved.
+        """
+        self._validate()
+        key = (frame.f_code, package_name)
+        try:
+            result, module = self._packages_by_code[key]
+        except KeyError:
+            pass
+        else:
+            if _is_current(module):
+                return result
+
+        module = self.module(frame)
+        result = None if module is None else _in_package(module.__name__, package_name)
+        self._store(self._packages_by_code, key, (result, module))
+        return result
+
+
+_resolver = ModuleResolver()
+
+
+def _selected(frame: FrameType, package_name: str, inside: bool) -> bool:
+    """Check if a Frame should be Captured while Walking the Stack
+
+    Args:
+        frame (FrameType): Frame to check.
+        package_name (str): Name of the package.
+        inside (bool): Whether the previous frame was inside the package.
+
+    Returns:
+        bool: True if the frame belongs to the package, or is moduleless (e.g. dataclass.__init__) and the walk is inside the package.
+    """
+    result = _resolver.in_package(frame, package_name)
+    return inside if result is None else result
+
+
+def capture_stack(
+    depth: int = 0,
+    *,
+    package_name: str | None = None,
+) -> list[FrameRecord]:
+    """Capture the Caller's Stack without Loading Source Context
+
+    A faster replacement for `inspect.stack()[depth:][::-1]` made by the caller.
+
+    Args:
+        depth (int, optional): Number of frames to skip, starting with the caller. Defaults to 0.
+        package_name (str | None, optional): Name of the package to capture from the stack, otherwise non-exclusive if set to None. Defaults to None.
+
+    Returns:
+        list[FrameRecord]: Frame records, outermost first.
+    """
+    try:
+        frame: FrameType | None = sys._getframe(depth + 1)
+    except ValueError:
+        # Not enough frames on the stack
+        return []
+    return _walk(frame, package_name)
+
+
+def _walk(frame: FrameType | None, package_name: str | None) -> list[FrameRecord]:
+    """Walk the Stack from a Frame
+
+    Args:
+        frame (FrameType | None): Innermost frame to walk from.
+        package_name (str | None): Name of the package to capture from the stack, otherwise non-exclusive if set to None.
+
+    Returns:
+        list[FrameRecord]: Frame records, outermost first.
+    """
+    frames = []
+    while frame is not None:
+        if package_name is None or _selected(frame, package_name, bool(frames)):
+            frames.append(frame)
+        elif frames:
+            # Left the package
+            break
+        frame = frame.f_back
+
+    return [
+        FrameRecord(frame, frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+        for frame in reversed(frames)
+    ]
+
+
+def capture_threads(
+    *,
+    package_name: str | None = None,
+) -> tuple[list[FrameRecord], list[ThreadTiming]]:
+    """Capture a Shallow Snapshot of the Stacks of All Threads
+
+    The frames of all threads are taken at once with `sys._current_frames`. Each stack
+    is then walked and only its locals are copied, as close as possible to when the
+    frames were taken, leaving the formatting to the caller. Other threads are held up
+    by the interpreter lock for no longer than the copying takes.
+
+    Args:
+        package_name (str | None, optional): Name of the package to capture from the stacks, otherwise non-exclusive if set to None. Defaults to None.
+
+    Returns:
+        tuple[list[FrameRecord], list[ThreadTiming]]: Frame records labeled with their thread (each thread outermost first, by thread name), and the time taken per thread.
+    """
+    current_frames = sys._current_frames()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    threads = sorted(
+        (
+            (names.get(ident, f"Thread-{ident}"), frame)
+            for ident, frame in current_frames.items()
+        ),
+        key=lambda thread: thread[0],
+    )
+    del current_frames
+
+    stack = []
+    timings = []
+    for name, frame in threads:
+        start = time.perf_counter_ns()
+        records = [
+            frame_record._replace(frame=FrameSnapshot(frame_record.frame), thread=name)
+            for frame_record in _walk(frame, package_name)
+        ]
+        timings.append(ThreadTiming(name, len(records), time.perf_counter_ns() - start))
+        stack.extend(records)
+    return stack, timings
+
+
+def capture_trace(
+    tb: TracebackType | None,
+    *,
+    package_name: str | None = None,
+) -> list[FrameRecord]:
+    """Capture the Frames of a Traceback without Loading Source Context
+
+    A faster replacement for `inspect.trace()` when given `sys.exc_info()[2]`.
+
+    Args:
+        tb (TracebackType | None): Traceback to capture.
+        package_name (str | None, optional): Name of the package to capture from the traceback, otherwise non-exclusive if set to None. Defaults to None.
+
+    Returns:
+        list[FrameRecord]: Frame records, outermost first.
+    """
+    entries = []
+    while tb is not None:
+        entries.append((tb.tb_frame, tb.tb_lineno))
+        tb = tb.tb_next
+
+    records = []
+    # Walk innermost first so the package is "left" on the way out of the call
+    for frame, lineno in reversed(entries):
+        if package_name is None or _selected(frame, package_name, bool(records)):
+            records.append(
+                FrameRecord(frame, frame.f_code.co_filename, lineno, frame.f_code.co_name)
+            )
+        elif records:
+            # Left the package
+            break
+
+    records.reverse()
+    return records
+
+
+def snapshot_stack(stack: Sequence) -> list[FrameRecord]:
+    """Take a Shallow Snapshot of the Frames in a Stack
+
+    Args:
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to take a snapshot of.
+
+    Returns:
+        list[FrameRecord]: Frame records referencing frame snapshots, in the same order.
+    """
+    return [
+        FrameRecord(
+            FrameSnapshot(frame_record[0]),
+            frame_record.filename,
+            frame_record.lineno,
+            frame_record.function,
+            getattr(frame_record, "task", None),
+            getattr(frame_record, "thread", None),
+        )
+        for frame_record in stack
+    ]
+
+
+def select_frames(
+    stack: Sequence,
+    package_name: str | None = None,
+) -> Iterator:
+    """Select the Frames of a Stack to Dump
+
+    Frames are selected if they belong to the package, otherwise if their module can
+    be resolved when 'package_name' is None. Moduleless frames (e.g.
+    dataclass.__init__) follow the nearest frame before them with a resolved module.
+
+    Args:
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to select from.
+        package_name (str | None, optional): Name of the package to select frames from, otherwise non-exclusive if set to None. Defaults to None.
+
+    Yields:
+        inspect.FrameInfo | FrameRecord: Selected frame records, in the same order.
+    """
+    # Whether the nearest frame with a resolved module was selected
+    inside: bool | None = None
+    for frame_record in stack:
+        frame = frame_record[0]
+        if package_name is None:
+            selected = True if _resolver.module(frame) is not None else None
+        else:
+            selected = _resolver.in_package(frame, package_name)
+
+        if selected is None:
+            # Moduleless frame, e.g. dataclass.__init__
+            selected = inside
+        else:
+            inside = selected
+
+        if selected:
+            yield frame_record
+
+
+def fingerprint_stack(depth: int = 0) -> Fingerprint:
+    """Fingerprint the Caller's Call Site without Resolving any Modules
+
+    Args:
+        depth (int, optional): Number of frames to skip, starting with the caller. Defaults to 0.
+
+    Returns:
+        Fingerprint: Identity of the code object and line number of every frame, innermost first.
+    """
+    try:
+        frame: FrameType | None = sys._getframe(depth + 1)
+    except ValueError:
+        # Not enough frames on the stack
+        return ()
+
+    sites = []
+    while frame is not None:
+        sites.append((id(frame.f_code), frame.f_lineno))
+        frame = frame.f_back
+    return tuple(sites)
+
+
+def fingerprint_trace(tb: TracebackType | None) -> Fingerprint:
+    """Fingerprint the Call Site of a Traceback without Resolving any Modules
+
+    Args:
+        tb (TracebackType | None): Traceback to fingerprint.
+
+    Returns:
+        Fingerprint: Identity of the code object and line number of every frame, innermost first.
+    """
+    sites = []
+    while tb is not None:
+        sites.append((id(tb.tb_frame.f_code), tb.tb_lineno))
+        tb = tb.tb_next
+    sites.reverse()
+    return tuple(sites)
@@ -0,0 +1,165 @@
+"""Collect dumps from several processes.
+
+This module contains a collector process that receives formatted records from the
+processes of a pre-fork server over a Unix socket, and appends them to a single
+rotating dump file, so only one process ever writes to it.
+"""
+
+import atexit
+import multiprocessing
+import os
+import selectors
+import socket
+import tempfile
+
+from .sink import FRAME, DumpSink
+
+
+class DumpCollector:
+    """Process Appending the Records Sent by Other Processes to a Dump Sink
+
+    Records are sent by sinks created with the collector's address (see
+    `yogger.sink.DumpSink`), each as its length (4 bytes, big-endian) followed by the
+    formatted record. The collector is forked when started, so it should be started
+    before the workers are, and is stopped at exit by the process that started it.
+
+    Args:
+        path (str): Path of the dump file.
+        max_bytes (int, optional): Size in bytes at which the file is rotated. Defaults to 10 MiB.
+        backup_count (int, optional): Maximum number of rotated files to keep. Defaults to 5.
+        max_total_bytes (int | None, optional): Maximum size in bytes of all files together, otherwise only limited by the count if None. Defaults to None.
+        address (str | None, optional): Path of the Unix socket to listen on, otherwise one in the temporary directory if None. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        max_total_bytes: int | None = None,
+        address: str | None = None,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_total_bytes = max_total_bytes
+        self.address = address or os.path.join(
+            tempfile.gettempdir(), f"yogger-collector-{os.getpid()}-{id(self):x}.sock"
+        )
+        self._process: multiprocessing.process.BaseProcess | None = None
+        # Process that started the collector
+        self._owner: int | None = None
+
+    def start(self, timeout: float | None = 5.0) -> None:
+        """Fork the Collector Process and Wait until it Listens
+
+        Args:
+            timeout (float | None, optional): Maximum number of seconds to wait, otherwise wait indefinitely if set to None. Defaults to 5.0.
+
+        Raises:
+            RuntimeError: If the collector did not start listening in time.
+        """
+        context = multiprocessing.get_context("fork")
+        listening = context.Event()
+        self._process = context.Process(
+            target=self._serve,
+            args=(listening,),
+            name="yogger-dump-collector",
+            daemon=True,
+        )
+        self._process.start()
+        self._owner = os.getpid()
+        if not listening.wait(timeout):
+            self._process.terminate()
+            raise RuntimeError(
+                f"Dump collector did not start listening on {self.address!r}"
+            )
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the Collector after it Received what was Sent
+
+        Only stops the collector if called by the process that started it.
+
+        Args:
+            timeout (float | None, optional): Maximum number of seconds to wait before terminating it, otherwise wait indefinitely if set to None. Defaults to 5.0.
+        """
+        process = self._process
+        if process is None or self._owner != os.getpid():
+            return
+
+        self._process = None
+        atexit.unregister(self.stop)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.address)
+                # An empty record stops the collector
+                sock.sendall(FRAME.pack(0))
+        except OSError:
+            pass
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    def _serve(self, listening: "multiprocessing.synchronize.Event") -> None:
+        """Receive and Append Records until Stopped
+
+        Args:
+            listening (multiprocessing.synchronize.Event): Event to set once listening.
+        """
+        sink = DumpSink(
+            self.path,
+            max_bytes=self.max_bytes,
+            backup_count=self.backup_count,
+            max_total_bytes=self.max_total_bytes,
+        )
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.address)
+        server.listen()
+        listening.set()
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ)
+        buffers: dict[socket.socket, bytearray] = {}
+        stopping = False
+        # Once stopping, keep receiving until nothing else was sent
+        while not stopping or buffers:
+            events = selector.select(timeout=0 if stopping else None)
+            if not events:
+                break
+            for key, _ in events:
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = bytearray()
+                    continue
+
+                conn = key.fileobj
+                data = conn.recv(64 * 1024)
+                if not data:
+                    selector.unregister(conn)
+                    conn.close()
+                    del buffers[conn]
+                    continue
+
+                buffer = buffers[conn]
+                buffer += data
+                while len(buffer) >= FRAME.size:
+                    (size,) = FRAME.unpack_from(buffer)
+                    if not size:
+                        stopping = True
+                        del buffer[: FRAME.size]
+                        continue
+                    end = FRAME.size + size
+                    if len(buffer) < end:
+                        break
+                    sink.append(bytes(buffer[FRAME.size : end]))
+                    del buffer[:end]
+
+        selector.close()
+        server.close()
+        os.remove(self.address)
+        sink.close()
@@ -16,3 +16,9 @@ try:
     from requests.exceptions import RequestException
 except (NameError, ModuleNotFoundError):
     HAS_REQUESTS_PACKAGE = False
+
+try:
+    HAS_ZSTANDARD_PACKAGE = True
+    import zstandard
+except (NameError, ModuleNotFoundError):
+    HAS_ZSTANDARD_PACKAGE = False
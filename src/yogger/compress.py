@@ -0,0 +1,176 @@
+"""Compress and read dumps.
+
+This module contains streaming compressors for dumps, and a reader that decompresses
+and prints them:
+
+    python -m yogger.compress PATH [--offset OFFSET]
+"""
+
+import argparse
+import gzip
+import lzma
+import sys
+import zlib
+from collections.abc import Iterator
+from typing import BinaryIO, Final
+
+from .compat import HAS_ZSTANDARD_PACKAGE
+
+if HAS_ZSTANDARD_PACKAGE:
+    from .compat import zstandard
+
+#: Supported compression codecs
+CODECS: Final[tuple[str, ...]] = ("gzip", "lzma", "zstd")
+
+#: File name extensions by codec
+EXTENSIONS: Final[dict[str, str]] = {"gzip": ".gz", "lzma": ".xz", "zstd": ".zst"}
+
+# Leading bytes of a compressed stream by codec
+_MAGIC: Final[dict[str, bytes]] = {
+    "gzip": b"\x1f\x8b",
+    "lzma": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+
+def check_codec(codec: str | None) -> None:
+    """Check if a Compression Codec can be Used
+
+    Args:
+        codec (str | None): Codec to check, or None for no compression.
+
+    Raises:
+        ValueError: If the codec is not supported.
+        ModuleNotFoundError: If the codec is "zstd" and the "zstandard" package is not installed.
+    """
+    if codec is not None and codec not in CODECS:
+        raise ValueError(f"Unsupported compression codec: {codec!r}")
+    if codec == "zstd" and not HAS_ZSTANDARD_PACKAGE:
+        raise ModuleNotFoundError(
+            "The 'zstandard' package is required for zstd compression"
+        )
+
+
+def compressor(fileobj: BinaryIO, codec: str) -> BinaryIO:
+    """Wrap a File Object to Compress what is Written to it as a Single Stream
+
+    Closing the compressor finishes the stream, but does not close the file object.
+    Streams that are appended one after the other can be read as one.
+
+    Args:
+        fileobj (BinaryIO): File object to write the compressed stream to.
+        codec (str): Codec to compress with ("gzip", "lzma", or "zstd").
+
+    Returns:
+        BinaryIO: File object to write the uncompressed data to.
+    """
+    check_codec(codec)
+    if codec == "gzip":
+        # Fast compression, dumps are written while the application waits
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6)
+    if codec == "lzma":
+        return lzma.LZMAFile(fileobj, mode="wb", preset=1)
+    return zstandard.ZstdCompressor().stream_writer(fileobj, closefd=False)
+
+
+def _decompressor(codec: str):
+    """Create a Decompressor for a Single Stream
+
+    Args:
+        codec (str): Codec of the stream.
+
+    Returns:
+        Any: Decompressor with 'decompress', 'eof', and 'unused_data'.
+    """
+    if codec == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if codec == "lzma":
+        return lzma.LZMADecompressor()
+    check_codec(codec)
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def _detect(head: bytes) -> str | None:
+    """Detect the Codec of a Stream
+
+    Args:
+        head (bytes): Leading bytes of the stream.
+
+    Returns:
+        str | None: Codec of the stream, otherwise None if not compressed.
+    """
+    for codec, magic in _MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def iter_dump(
+    fp: BinaryIO,
+    *,
+    single: bool = False,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Decompress a Dump File while Reading it
+
+    Compressed streams that were appended one after the other are read as one, and
+    uncompressed data is passed through.
+
+    Args:
+        fp (BinaryIO): File object to read, positioned at the start of a stream.
+        single (bool, optional): Stop after the first stream, e.g. a single record of a dump sink. Defaults to False.
+        chunk_size (int, optional): Number of bytes to read at a time. Defaults to 64 KiB.
+
+    Yields:
+        bytes: Decompressed data.
+    """
+    data = fp.read(chunk_size)
+    codec = _detect(data)
+    if codec is None:
+        while data:
+            yield data
+            data = fp.read(chunk_size)
+        return
+
+    decompressor = _decompressor(codec)
+    while data:
+        yield decompressor.decompress(data)
+        if decompressor.eof:
+            if single:
+                return
+            # The next stream, if any
+            data = decompressor.unused_data or fp.read(chunk_size)
+            if data:
+                decompressor = _decompressor(_detect(data) or codec)
+            continue
+        data = fp.read(chunk_size)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Decompress and Print a Dump
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, otherwise use `sys.argv` if None. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m yogger.compress",
+        description="Decompress and print a dump.",
+    )
+    parser.add_argument("path", help="Path of the dump file.")
+    parser.add_argument(
+        "--offset",
+        type=int,
+        help="Offset of a single record to print, e.g. from a rotating dump file.",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.path, mode="rb") as rf:
+        if args.offset is not None:
+            rf.seek(args.offset)
+        for data in iter_dump(rf, single=args.offset is not None):
+            sys.stdout.buffer.write(data)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ LOG_FMT: Final[str] = "".join(
     )
 )
 DATE_FMT: Final[str] = "%Y-%m-%d %H:%M:%S"
+RECORD_FMT: Final[str] = "[ {asctime}.{msecs:04.0f}  {levelname}  {name} ]  {message}"
 DUMP_MSG: Final[str] = "".join(
     (
         "\33[1m" if sys.platform != "win32" else "",
@@ -25,3 +26,19 @@ DUMP_MSG: Final[str] = "".join(
         "\nCopy and paste the following to view:\n    cat '{path}'\n",
     )
 )
+DUMP_VIEW_MSG: Final[str] = "".join(
+    (
+        "\33[1m" if sys.platform != "win32" else "",
+        "Dumped stack and locals to {location}",
+        "\33[0m" if sys.platform != "win32" else "",
+        "\nCopy and paste the following to view:\n    {command}\n",
+    )
+)
+LAZY_DUMP_MSG: Final[str] = "".join(
+    (
+        "\33[1m" if sys.platform != "win32" else "",
+        "Captured stack and locals (lazy dump {dump_id})",
+        "\33[0m" if sys.platform != "win32" else "",
+        ", written when flushed with 'yogger.flush_dumps', on exception, or at exit",
+    )
+)
@@ -0,0 +1,244 @@
+"""Filter and redact the variables of dumps.
+
+This module contains a filter that decides which variables are dumped, by name
+pattern, type, and size, and which values and headers are redacted, before any value
+is formatted.
+"""
+
+import fnmatch
+import re
+import sys
+import weakref
+from collections.abc import Iterable, Iterator
+from typing import Any, Final
+
+_INCLUDE: Final = 0
+_EXCLUDE: Final = 1
+_REDACT: Final = 2
+
+#: Headers redacted by default
+DEFAULT_REDACT_HEADERS: Final = (
+    "Authorization",
+    "Cookie",
+    "Proxy-Authorization",
+    "Set-Cookie",
+)
+
+
+class Redacted:
+    """Placeholder for a Redacted Value"""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<redacted>"
+
+
+#: Value written instead of a redacted value
+REDACTED: Final = Redacted()
+
+
+def _compile(patterns: Iterable[str]) -> re.Pattern | None:
+    """Compile Shell-Style Patterns into a Single Regular Expression
+
+    Args:
+        patterns (Iterable[str]): Patterns to compile, e.g. "*password*".
+
+    Returns:
+        re.Pattern | None: Expression matching any of the patterns, otherwise None if there are none.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+class VariableFilter:
+    """Filter Deciding which Variables are Dumped, and which are Redacted
+
+    Applies to the locals of every frame and the attributes of 'self'. Variables are
+    excluded if their name matches 'exclude_names' (or does not match
+    'include_names'), their type is one of 'exclude_types' (or a subclass), or their
+    shallow size (`sys.getsizeof`) is greater than 'max_size'. Excluded variables are
+    left out of dumps without being formatted. Values of variables whose name matches
+    'redact_names' are written as "<redacted>", as are the values of the headers of
+    requests objects named in 'redact_headers'. Names are matched with shell-style
+    patterns (see `fnmatch`), and headers case-insensitively.
+
+    All name patterns are compiled into a single expression, and the decisions are
+    cached by name and by type, so checking a variable usually costs a dictionary
+    lookup for its name and one for its type.
+
+    Args:
+        exclude_names (Iterable[str], optional): Patterns of variable names to exclude, e.g. "_*". Defaults to ().
+        include_names (Iterable[str] | None, optional): Patterns of variable names to dump, excluding all others, otherwise not restricted if None. Defaults to None.
+        exclude_types (Iterable[type], optional): Types of values to exclude, e.g. `socket.socket`. Defaults to ().
+        max_size (int | None, optional): Maximum shallow size in bytes of values to dump, otherwise unlimited if None. Defaults to None.
+        redact_names (Iterable[str], optional): Patterns of variable names to redact the values of, e.g. "*password*". Defaults to ().
+        redact_headers (Iterable[str], optional): Names of the headers of requests objects to redact the values of. Defaults to `DEFAULT_REDACT_HEADERS`.
+        maxsize (int, optional): Maximum number of names to cache the decisions of. Defaults to 4096.
+    """
+
+    def __init__(
+        self,
+        exclude_names: Iterable[str] = (),
+        include_names: Iterable[str] | None = None,
+        exclude_types: Iterable[type] = (),
+        max_size: int | None = None,
+        redact_names: Iterable[str] = (),
+        redact_headers: Iterable[str] = DEFAULT_REDACT_HEADERS,
+        maxsize: int = 4096,
+    ) -> None:
+        self.exclude_names = tuple(exclude_names)
+        self.include_names = None if include_names is None else tuple(include_names)
+        self.exclude_types = tuple(exclude_types)
+        self.max_size = max_size
+        self.redact_names = tuple(redact_names)
+        self.redact_headers = frozenset(header.lower() for header in redact_headers)
+        self.maxsize = maxsize
+
+        # Earlier alternatives take precedence, so redacting wins over excluding
+        groups = [
+            f"(?P<{group}>{pattern.pattern})"
+            for group, pattern in (
+                ("redact", _compile(self.redact_names)),
+                ("exclude", _compile(self.exclude_names)),
+            )
+            if pattern is not None
+        ]
+        self._names_pattern = re.compile("|".join(groups)) if groups else None
+        self._include_pattern = (
+            None if self.include_names is None else _compile(self.include_names)
+        )
+        # Decisions by name and by type
+        self._names: dict[str, int] = {}
+        self._types: "weakref.WeakKeyDictionary[type, bool]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _check_name(self, name: str) -> int:
+        """Decide what to do with a Variable by its Name
+
+        Args:
+            name (str): Name of the variable.
+
+        Returns:
+            int: Whether the variable is included, excluded, or redacted.
+        """
+        match = None if self._names_pattern is None else self._names_pattern.match(name)
+        if match is not None:
+            action = _REDACT if match.lastgroup == "redact" else _EXCLUDE
+        elif self.include_names is not None and (
+            self._include_pattern is None or self._include_pattern.match(name) is None
+        ):
+            action = _EXCLUDE
+        else:
+            action = _INCLUDE
+
+        if len(self._names) >= self.maxsize:
+            self._names.clear()
+        self._names[name] = action
+        return action
+
+    def _exclude_type(self, cls: type) -> bool:
+        """Decide if Values of a Type are Excluded
+
+        Args:
+            cls (type): Type of the value.
+
+        Returns:
+            bool: True if the type is one of the excluded types, or a subclass.
+        """
+        try:
+            return self._types[cls]
+        except KeyError:
+            pass
+        except TypeError:
+            # Not weakly referenceable
+            return issubclass(cls, self.exclude_types)
+        excluded = issubclass(cls, self.exclude_types)
+        self._types[cls] = excluded
+        return excluded
+
+    def filter(self, items: Iterable[tuple[str, Any]]) -> Iterator[tuple[str, Any]]:
+        """Filter Variables, Redacting their Values
+
+        Args:
+            items (Iterable[tuple[str, Any]]): Names and values of the variables.
+
+        Yields:
+            tuple[str, Any]: Names and values of the included variables, with `REDACTED` as the value of redacted variables.
+        """
+        names = self._names
+        for name, value in items:
+            action = names.get(name)
+            if action is None:
+                action = self._check_name(name)
+            if action == _REDACT:
+                yield name, REDACTED
+                continue
+            if action == _EXCLUDE:
+                continue
+            if self.exclude_types and self._exclude_type(type(value)):
+                continue
+            if self.max_size is not None:
+                try:
+                    size = sys.getsizeof(value, 0)
+                except Exception:
+                    # E.g. a broken '__sizeof__'
+                    size = 0
+                if size > self.max_size:
+                    continue
+            yield name, value
+
+    def redact_header(self, name: str) -> bool:
+        """Decide if the Value of a Header is Redacted
+
+        Args:
+            name (str): Name of the header.
+
+        Returns:
+            bool: True if the value should be redacted.
+        """
+        return name.lower() in self.redact_headers
+
+
+_global_filter: VariableFilter | None = None
+
+
+def _set_filter(variable_filter: VariableFilter | None) -> None:
+    """Set the Filter Applied to Dumps
+
+    Args:
+        variable_filter (VariableFilter | None): Filter to apply, otherwise dump all variables if None.
+    """
+    global _global_filter
+    _global_filter = variable_filter
+
+
+def filter_variables(variables: dict[str, Any]) -> dict[str, Any]:
+    """Filter Variables with the Filter Set with `yogger.configure`
+
+    Args:
+        variables (dict[str, Any]): Variables by name, e.g. the locals of a frame.
+
+    Returns:
+        dict[str, Any]: Included variables, with `REDACTED` as the value of redacted variables, otherwise the variables themselves if no filter was set.
+    """
+    variable_filter = _global_filter
+    if variable_filter is None:
+        return variables
+    return dict(variable_filter.filter(list(variables.items())))
+
+
+def redact_header(name: str) -> bool:
+    """Decide if the Value of a Header is Redacted by the Filter Set with `yogger.configure`
+
+    Args:
+        name (str): Name of the header.
+
+    Returns:
+        bool: True if the value should be redacted.
+    """
+    variable_filter = _global_filter
+    return variable_filter is not None and variable_filter.redact_header(name)
@@ -0,0 +1,185 @@
+"""Move log formatting and I/O off the logging threads.
+
+This module contains a queue handler that never blocks the logging thread, and a
+queue listener that formats and writes the queued records in batches on a thread of
+its own.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from collections.abc import Sequence
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue Handler that Drops Records when the Queue is Full
+
+    Records are queued as they are, so their messages are formatted by the listener,
+    with their arguments in the state they are in then. This is only safe for queues
+    that are consumed within the same process.
+
+    Args:
+        maxsize (int, optional): Maximum number of queued records. Defaults to 10000.
+    """
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        super().__init__(queue.Queue(maxsize=maxsize))
+        #: Number of records that were dropped
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def after_fork(self) -> None:
+        """Replace the Queue in a Forked Child, Discarding the Records of the Parent"""
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """Queue Listener that Handles Records in Batches
+
+    Every time the listener wakes up, it drains up to 'batch_size' records from the
+    queue. Stream handlers (not subclasses that override 'emit', such as file
+    handlers) write a batch with a single write and flush under a single lock, other
+    handlers handle the records one at a time. The levels of the handlers are
+    respected. Records that were dropped by the queue handler are reported with a
+    warning after the next batch. Queued records are flushed when stopped, and at
+    exit.
+
+    Args:
+        queue_handler (DroppingQueueHandler): Handler queuing the records to listen for.
+        *handlers (logging.Handler): Handlers to handle the records with.
+        batch_size (int, optional): Maximum number of records to handle at a time. Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        queue_handler: DroppingQueueHandler,
+        *handlers: logging.Handler,
+        batch_size: int = 256,
+    ) -> None:
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.batch_size = batch_size
+        self._reported = 0
+
+    def start(self) -> None:
+        super().start()
+        self._thread.name = "yogger-log-listener"
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+        atexit.unregister(self.stop)
+
+    def after_fork(self) -> None:
+        """Restart the Listener in a Forked Child, Discarding the Queued Records"""
+        self.queue_handler.after_fork()
+        self.queue = self.queue_handler.queue
+        self._reported = 0
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room instead of failing when the queue is full
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        stopping = False
+        while not stopping:
+            batch = []
+            record = q.get()
+            while True:
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = q.get_nowait()
+                except queue.Empty:
+                    break
+
+            self.handle_batch(batch)
+            for _ in range(len(batch) + stopping):
+                q.task_done()
+
+    def handle_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        """Handle a Batch of Records
+
+        Args:
+            records (Sequence[logging.LogRecord]): Records to handle, oldest first.
+        """
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported:
+            records = [
+                *records,
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": logging.getLevelName(logging.WARNING),
+                        "msg": "Dropped %s log records because the queue was full",
+                        "args": (f"{dropped - self._reported:,}",),
+                    }
+                ),
+            ]
+            self._reported = dropped
+
+        if not records:
+            return
+        for handler in self.handlers:
+            if (
+                isinstance(handler, logging.StreamHandler)
+                and type(handler).emit is logging.StreamHandler.emit
+            ):
+                _emit_batch(handler, records)
+            else:
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+
+
+def _emit_batch(
+    handler: logging.StreamHandler,
+    records: Sequence[logging.LogRecord],
+) -> None:
+    """Write a Batch of Records to a Stream Handler with a Single Write
+
+    Args:
+        handler (logging.StreamHandler): Handler to write with.
+        records (Sequence[logging.LogRecord]): Records to write, oldest first.
+    """
+    lines = []
+    for record in records:
+        if record.levelno < handler.level or not handler.filter(record):
+            continue
+        try:
+            lines.append(handler.format(record) + handler.terminator)
+        except Exception:
+            handler.handleError(record)
+    if not lines:
+        return
+
+    with handler.lock:
+        try:
+            handler.stream.write("".join(lines))
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
@@ -0,0 +1,98 @@
+"""Capture dumps now and format them later.
+
+This module contains a ring buffer of shallow stack snapshots that are only formatted
+when the dumps are flushed.
+"""
+
+import collections
+import itertools
+import threading
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from .capture import FrameRecord, snapshot_stack
+
+
+class PendingDump(NamedTuple):
+    """Dump Captured to Format Later"""
+
+    #: Identifier of the dump
+    dump_id: int
+    #: Snapshot of the stack
+    stack: list[FrameRecord]
+    #: Exception that was raised
+    err: Exception | None
+    #: Name of the package to dump from the stack, otherwise the configured package if None
+    package_name: str | None = None
+    #: Path of the file to dump to, otherwise the configured path if None
+    dump_path: str | None = None
+
+
+class SnapshotBuffer:
+    """Ring Buffer of Stack Snapshots to Format Later
+
+    Only a shallow snapshot of the stack is taken: the locals of every frame are
+    copied, but not the values they reference. Values are formatted in the state they
+    are in when the buffer is drained, and are kept alive until then. When full, the
+    oldest snapshot is evicted.
+
+    Args:
+        maxsize (int, optional): Maximum number of snapshots to keep. Defaults to 64.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        #: Number of snapshots that were evicted before being drained
+        self.evicted = 0
+        self._pending: collections.deque[PendingDump] = collections.deque()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def after_fork(self) -> None:
+        """Discard the Snapshots of the Parent in a Forked Child, which Flushes them"""
+        self._lock = threading.Lock()
+        self._pending.clear()
+        self.evicted = 0
+
+    def add(
+        self,
+        stack: Sequence,
+        err: Exception | None = None,
+        package_name: str | None = None,
+        dump_path: str | None = None,
+    ) -> int:
+        """Take a Snapshot of a Stack
+
+        Args:
+            stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to take a snapshot of.
+            err (Exception | None, optional): Exception that was raised. Defaults to None.
+            package_name (str | None, optional): Name of the package to dump from the stack, otherwise the configured package if None. Defaults to None.
+            dump_path (str | None, optional): Path of the file to dump to, otherwise the configured path if None. Defaults to None.
+
+        Returns:
+            int: Identifier of the dump.
+        """
+        pending = PendingDump(
+            next(self._ids), snapshot_stack(stack), err, package_name, dump_path
+        )
+        with self._lock:
+            if len(self._pending) >= self.maxsize:
+                self._pending.popleft()
+                self.evicted += 1
+            self._pending.append(pending)
+        return pending.dump_id
+
+    def drain(self) -> tuple[list[PendingDump], int]:
+        """Remove All Snapshots
+
+        Returns:
+            tuple[list[PendingDump], int]: Snapshots, oldest first, and the number that were evicted since the last drain.
+        """
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            evicted, self.evicted = self.evicted, 0
+        return pending, evicted
@@ -0,0 +1,310 @@
+"""Measure the overhead of dumps.
+
+This module contains counters and histograms of the time spent in each phase of a
+dump, and of what was written. They are only updated if enabled with
+`yogger.configure`, otherwise each dump only checks that they are disabled.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Final
+
+#: Phases of a dump
+CAPTURE: Final = 0
+RESOLVE: Final = 1
+FORMAT: Final = 2
+WRITE: Final = 3
+#: Names of the phases of a dump, by phase
+PHASES: Final = ("capture", "resolve", "format", "write")
+#: Number of buckets per histogram, the last of which is unbounded
+NUM_BUCKETS: Final = 40
+
+
+def _percentile(buckets: list[int], count: int, fraction: float) -> int:
+    """Estimate a Percentile from a Histogram
+
+    Args:
+        buckets (list[int]): Counts of the buckets, where bucket i counts the durations below 2**i nanoseconds.
+        count (int): Total count of the histogram.
+        fraction (float): Fraction of the durations below the percentile.
+
+    Returns:
+        int: Upper bound in nanoseconds of the bucket containing the percentile.
+    """
+    rank = fraction * count
+    seen = 0
+    for bucket, bucket_count in enumerate(buckets):
+        seen += bucket_count
+        if seen >= rank:
+            return 1 << bucket
+    return 1 << (len(buckets) - 1)
+
+
+class DumpStats:
+    """Counters and Histograms of the Time Spent Dumping
+
+    The time spent in each phase of a dump is counted, summed, and added to a
+    histogram of power-of-two buckets of nanoseconds, all of which are allocated
+    up front. Phases are:
+
+    - "capture": walking the stack of the caller or exception, selecting the frames of the package
+    - "resolve": resolving the modules of the frames to write, selecting those of the package
+    - "format": formatting the representation, including encoding it
+    - "write": writing the representation, including compressing it
+
+    Args:
+        log_interval (float | None, optional): Minimum number of seconds between summaries returned by `summary`, otherwise never summarize if None. Defaults to None.
+        clock (Callable[[], int], optional): Monotonic clock in nanoseconds. Defaults to `time.perf_counter_ns`.
+
+    Raises:
+        ValueError: If the log interval is not greater than 0.
+    """
+
+    def __init__(
+        self,
+        log_interval: float | None = None,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        if log_interval is not None and log_interval <= 0:
+            raise ValueError(f"Log interval must be greater than 0: {log_interval!r}")
+
+        self.log_interval = log_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counts = [0] * len(PHASES)
+        self._totals = [0] * len(PHASES)
+        self._maxima = [0] * len(PHASES)
+        self._buckets = [[0] * NUM_BUCKETS for _ in PHASES]
+        self._dumps = 0
+        self._bytes = 0
+        self._frames = 0
+        self._variables = 0
+        self._summarized = clock()
+
+    def after_fork(self) -> None:
+        """Replace the Lock in a Forked Child, as Another Thread may have Held it"""
+        self._lock = threading.Lock()
+
+    def add(self, phase: int, elapsed_ns: int) -> None:
+        """Add the Duration of a Phase
+
+        Args:
+            phase (int): Phase of the dump, e.g. `CAPTURE`.
+            elapsed_ns (int): Number of nanoseconds the phase took.
+        """
+        bucket = min(elapsed_ns.bit_length(), NUM_BUCKETS - 1)
+        with self._lock:
+            self._counts[phase] += 1
+            self._totals[phase] += elapsed_ns
+            if elapsed_ns > self._maxima[phase]:
+                self._maxima[phase] = elapsed_ns
+            self._buckets[phase][bucket] += 1
+
+    def add_frames(self, num_frames: int, num_variables: int) -> None:
+        """Add Formatted Frames
+
+        Args:
+            num_frames (int): Number of frames formatted.
+            num_variables (int): Number of variables formatted, including the attributes of 'self'.
+        """
+        with self._lock:
+            self._frames += num_frames
+            self._variables += num_variables
+
+    def add_dump(self, format_ns: int, write_ns: int, num_bytes: int) -> None:
+        """Add a Written Dump
+
+        Args:
+            format_ns (int): Number of nanoseconds spent formatting the dump.
+            write_ns (int): Number of nanoseconds spent writing the dump.
+            num_bytes (int): Number of bytes of the representation, before compression.
+        """
+        self.add(FORMAT, format_ns)
+        self.add(WRITE, write_ns)
+        with self._lock:
+            self._dumps += 1
+            self._bytes += num_bytes
+
+    def snapshot(self) -> dict[str, Any]:
+        """Take a Snapshot of the Counters and Histograms
+
+        Returns:
+            dict[str, Any]: Number of dumps, bytes written, frames and variables formatted, and, by phase, the count, total, mean, maximum, and estimated percentiles in nanoseconds, with the histogram by upper bound of its non-empty buckets.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            totals = list(self._totals)
+            maxima = list(self._maxima)
+            buckets = [list(phase_buckets) for phase_buckets in self._buckets]
+            snapshot: dict[str, Any] = {
+                "dumps": self._dumps,
+                "bytes_written": self._bytes,
+                "frames": self._frames,
+                "variables": self._variables,
+            }
+
+        for phase, name in enumerate(PHASES):
+            count = counts[phase]
+            snapshot[name] = {
+                "count": count,
+                "total_ns": totals[phase],
+                "mean_ns": totals[phase] // count if count else 0,
+                "max_ns": maxima[phase],
+                **{
+                    f"p{percent}_ns": min(
+                        _percentile(buckets[phase], count, percent / 100),
+                        maxima[phase],
+                    )
+                    for percent in (50, 90, 99)
+                },
+                "histogram": {
+                    1 << bucket: bucket_count
+                    for bucket, bucket_count in enumerate(buckets[phase])
+                    if bucket_count
+                },
+            }
+        return snapshot
+
+    def summary(self) -> str | None:
+        """Summarize the Counters and Histograms, if Due
+
+        Returns:
+            str | None: Summary of the counters and the mean and 99th percentile of each phase, otherwise None if summaries are disabled or one is not due yet.
+        """
+        if self.log_interval is None:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            if now - self._summarized < self.log_interval * 1e9:
+                return None
+            self._summarized = now
+
+        snapshot = self.snapshot()
+        phases = ", ".join(
+            f"{name} {snapshot[name]['mean_ns'] / 1e6:,.3f}ms mean "
+            f"{snapshot[name]['p99_ns'] / 1e6:,.3f}ms p99"
+            for name in PHASES
+        )
+        return (
+            f"Dumped {snapshot['dumps']:,} times ({snapshot['bytes_written']:,} bytes, "
+            f"{snapshot['frames']:,} frames, {snapshot['variables']:,} variables): "
+            f"{phases}"
+        )
+
+
+class DumpTimer:
+    """Timer of a Single Dump, Charging its Time to Formatting Unless Spent Writing
+
+    Args:
+        stats (DumpStats): Statistics to add the dump to when finished.
+    """
+
+    __slots__ = ("stats", "write_ns", "num_bytes", "_start")
+
+    def __init__(self, stats: DumpStats) -> None:
+        self.stats = stats
+        #: Number of nanoseconds spent writing so far
+        self.write_ns = 0
+        #: Number of bytes written so far
+        self.num_bytes = 0
+        self._start = time.perf_counter_ns()
+
+    def wrap(self, write: Callable[[Any], object]) -> Callable[[Any], object]:
+        """Time and Count what is Written with a Write Function
+
+        Args:
+            write (Callable[[Any], object]): Function writing strings or bytes, returning the number of bytes written.
+
+        Returns:
+            Callable[[Any], object]: Function writing with it.
+        """
+
+        def timed_write(data: Any) -> object:
+            start = time.perf_counter_ns()
+            result = write(data)
+            self.write_ns += time.perf_counter_ns() - start
+            self.num_bytes += result if isinstance(result, int) else len(data)
+            return result
+
+        return timed_write
+
+    def call(self, func: Callable[..., object], *args: Any) -> object:
+        """Call a Function Spending Time Writing, without Counting Bytes
+
+        Args:
+            func (Callable[..., object]): Function to call, e.g. to flush a file.
+            *args (Any): Arguments to call it with.
+
+        Returns:
+            object: Result of the function.
+        """
+        start = time.perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            self.write_ns += time.perf_counter_ns() - start
+
+    def finish(self) -> None:
+        """Add the Dump to the Statistics"""
+        elapsed_ns = time.perf_counter_ns() - self._start
+        self.stats.add_dump(
+            max(elapsed_ns - self.write_ns, 0), self.write_ns, self.num_bytes
+        )
+
+
+class TimedFile:
+    """Binary File Object Timing and Counting what is Written to it
+
+    Args:
+        fp (BinaryIO): File object to write to.
+        timer (DumpTimer): Timer of the dump.
+    """
+
+    def __init__(self, fp: Any, timer: DumpTimer) -> None:
+        self._fp = fp
+        self._timer = timer
+        self.write = timer.wrap(fp.write)
+
+    def flush(self) -> None:
+        self._timer.call(self._fp.flush)
+
+    def close(self) -> None:
+        # E.g. finishing a compressed stream
+        self._timer.call(self._fp.close)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fp, name)
+
+
+_global_stats: DumpStats | None = None
+
+
+def _set_stats(dump_stats: DumpStats | None) -> None:
+    """Set the Statistics of Dumps
+
+    Args:
+        dump_stats (DumpStats | None): Statistics to update, otherwise disabled if None.
+    """
+    global _global_stats
+    _global_stats = dump_stats
+
+
+def current_stats() -> DumpStats | None:
+    """Get the Statistics Enabled with `yogger.configure`
+
+    Returns:
+        DumpStats | None: Statistics of dumps, otherwise None if disabled.
+    """
+    return _global_stats
+
+
+def stats() -> dict[str, Any]:
+    """Take a Snapshot of the Statistics of Dumps Enabled with `yogger.configure`
+
+    Returns:
+        dict[str, Any]: Number of dumps, bytes written (before compression), frames and variables formatted, and the time spent in each phase ("capture", "resolve", "format", and "write") as its count, total, mean, maximum, estimated percentiles in nanoseconds, and histogram, otherwise an empty dictionary if disabled.
+    """
+    dump_stats = _global_stats
+    return {} if dump_stats is None else dump_stats.snapshot()
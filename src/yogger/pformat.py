@@ -3,11 +3,19 @@
 This module is used to create a formatted representation of a variable's name and value.
 """
 
+import abc
+import array
 import collections
 import dataclasses
-from typing import Any
+import hashlib
+import math
+import weakref
+from collections.abc import Callable, Iterable
+from itertools import islice
+from typing import Any, Final, NamedTuple
 
 from .compat import HAS_REQUESTS_PACKAGE
+from .filters import REDACTED, redact_header
 
 if HAS_REQUESTS_PACKAGE:
     from .compat import (
@@ -18,226 +26,1333 @@ if HAS_REQUESTS_PACKAGE:
     )
 
 
-def pformat(name: str, value: Any, outer_line_continuation: bool = True) -> str:
+class Limits(NamedTuple):
+    """Budgets for Formatting a Representation
+
+    Each limit is disabled if set to None.
+    """
+
+    #: Maximum depth of nested containers to expand
+    max_depth: int | None = None
+    #: Maximum number of items to represent per container
+    max_items: int | None = None
+    #: Maximum number of characters per scalar representation
+    max_length: int | None = None
+    #: Maximum number of bytes (UTF-8) to write in total
+    max_bytes: int | None = None
+
+
+class _Default:
+    """Sentinel for Limits that Fall Back to the Defaults Set with `yogger.configure`"""
+
+    def __repr__(self) -> str:
+        return "DEFAULT"
+
+
+#: Use the limit set with `yogger.configure`
+DEFAULT: Final = _Default()
+
+#: Limit, None to disable it, or DEFAULT to use the one set with `yogger.configure`
+LimitArg = int | None | _Default
+
+_global_limits: Limits = Limits()
+
+#: Number of bytes of text content of responses to write when 'max_length' is not set
+RESPONSE_CONTENT_LENGTH: Final = 1024
+#: Minimum number of items of a container of numbers, buffer, or bytearray to summarize
+SUMMARY_MIN_ITEMS: Final = 100
+#: Number of items to sample from the start and the end of a summarized value
+SUMMARY_ITEMS: Final = 3
+
+# Types of the items of containers that are represented on a single line, with their
+# subclasses (bool is a subclass of int)
+_PRIMITIVE_TYPES: Final = (int, float, str, bytes, type(None))
+# Types of the items of containers of numbers that are summarized
+_NUMBER_TYPES: Final = frozenset((int, float))
+
+
+def _set_default_limits(limits: Limits) -> None:
+    """Set the Limits Used when None are Provided
+
+    Args:
+        limits (Limits): Default limits.
+    """
+    global _global_limits
+    _global_limits = limits
+
+
+Formatter = Callable[["Writer", str, Any], None]
+
+# Formatters by type, and the resolved formatter by concrete type
+_registry: dict[type, Formatter] = {}
+# Formatters by top-level package and type name, for types of optional packages that
+# are never imported, as their values can only exist once the package was imported
+_lazy_registry: dict[tuple[str, str], Formatter] = {}
+# Entries are tagged with the version they were resolved with, so they can not be
+# written back stale by a concurrent registration, and do not keep types alive
+_registry_version = 0
+_dispatch_cache: "weakref.WeakKeyDictionary[type, tuple[object, Formatter]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _is_shareable(value: Any, min_size: int) -> bool:
+    """Check if a Container should be Tracked as a Shared Reference
+
+    Args:
+        value (Any): Container to check.
+        min_size (int): Minimum size of the container.
+
+    Returns:
+        bool: True if the container is not a tuple and is large enough, or has no size.
+    """
+    if isinstance(value, tuple):
+        return False
+    try:
+        return len(value) >= min_size
+    except TypeError:
+        return True
+
+
+def _resolve_limit(limit: LimitArg, default: int | None) -> int | None:
+    """Resolve a Limit Argument
+
+    Args:
+        limit (LimitArg): Limit provided by the caller.
+        default (int | None): Limit set with `yogger.configure`.
+
+    Returns:
+        int | None: Limit to use, otherwise None if disabled.
+    """
+    return default if isinstance(limit, _Default) else limit
+
+
+class _OutputLimitReached(Exception):
+    """Raised by a Writer to Stop Formatting once 'max_bytes' is Reached"""
+
+
+class Writer:
+    """Writer for Formatted Representations
+
+    Carries the current indentation as state so nested representations are emitted
+    once, in order, instead of being re-indented by every enclosing level. Also
+    carries the formatting budgets, which fall back to the limits set with
+    `yogger.configure` when not provided (None disables a limit), and tracks the identity of expanded
+    containers so cycles and shared references are only expanded once per pass.
+
+    Args:
+        write (Callable[[str], object] | None, optional): Function to flush the output to, otherwise keep it in memory for `getvalue` if set to None. Defaults to None.
+        max_depth (int | None, optional): Maximum depth of nested containers to expand. Defaults to DEFAULT.
+        max_items (int | None, optional): Maximum number of items to represent per container. Defaults to DEFAULT.
+        max_length (int | None, optional): Maximum number of characters per scalar representation. Defaults to DEFAULT.
+        max_bytes (int | None, optional): Maximum number of bytes (UTF-8) to write in total. Defaults to DEFAULT.
+    """
+
+    __slots__ = (
+        "_write",
+        "_pieces",
+        "_indent",
+        "_size",
+        "_active",
+        "_seen",
+        "scope",
+        "depth",
+        "max_depth",
+        "max_items",
+        "max_length",
+        "max_bytes",
+    )
+
+    #: Number of pieces to buffer before flushing to the write function
+    flush_threshold: int = 1024
+    #: Minimum size of a container to be referenced instead of expanded again
+    shared_min_size: int = 8
+
+    def __init__(
+        self,
+        write: Callable[[str], object] | None = None,
+        *,
+        max_depth: LimitArg = DEFAULT,
+        max_items: LimitArg = DEFAULT,
+        max_length: LimitArg = DEFAULT,
+        max_bytes: LimitArg = DEFAULT,
+    ) -> None:
+        self._write = write
+        self._pieces: list[str] = []
+        self._indent = ""
+        self._size = 0
+        # Containers being expanded, by identity
+        self._active: dict[int, str] = {}
+        # Large containers that were expanded, by identity (keeps them alive so ids are not reused)
+        self._seen: dict[int, tuple[Any, str, str | None]] = {}
+        #: Description of where the current variables are from, e.g. a frame
+        self.scope: str | None = None
+        self.depth = 0
+        self.max_depth = _resolve_limit(max_depth, _global_limits.max_depth)
+        self.max_items = _resolve_limit(max_items, _global_limits.max_items)
+        self.max_length = _resolve_limit(max_length, _global_limits.max_length)
+        self.max_bytes = _resolve_limit(max_bytes, _global_limits.max_bytes)
+
+    def _append(self, text: str) -> None:
+        """Append Text to the Buffer, Enforcing 'max_bytes'
+
+        Args:
+            text (str): Text to append.
+
+        Raises:
+            _OutputLimitReached: If 'max_bytes' was reached.
+        """
+        if self.max_bytes is not None:
+            ascii_ = text.isascii()
+            size = len(text) if ascii_ else len(text.encode("utf-8"))
+            remaining = self.max_bytes - self._size
+            if size > remaining:
+                if remaining >= 0:
+                    if ascii_:
+                        head = text[:remaining]
+                    else:
+                        head = text.encode("utf-8")[:remaining].decode(
+                            "utf-8", "ignore"
+                        )
+                    self._pieces.append(head)
+                    self._pieces.append(
+                        f"... output truncated at {self.max_bytes:,} bytes"
+                    )
+                    # Anything else would be past the limit
+                    self._size = self.max_bytes + 1
+                raise _OutputLimitReached
+            self._size += size
+
+        self._pieces.append(text)
+        if self._write is not None and len(self._pieces) >= self.flush_threshold:
+            self.flush()
+
+    def write(self, text: str) -> None:
+        """Write Text, Indenting any Newlines it Contains
+
+        Args:
+            text (str): Text to write.
+        """
+        if "\n" in text:
+            text = text.replace("\n", "\n" + self._indent)
+        self._append(text)
+
+    def newline(self) -> None:
+        """Write a Newline Followed by the Current Indentation"""
+        self._append("\n" + self._indent)
+
+    def indent(self) -> None:
+        """Increase the Indentation of Subsequent Lines"""
+        self._indent += "  "
+
+    def dedent(self) -> None:
+        """Decrease the Indentation of Subsequent Lines"""
+        self._indent = self._indent[:-2]
+
+    def format(self, name: str, value: Any, outer_line_continuation: bool = True) -> None:
+        """Write the Formatted Representation of a Variable's Name and Value
+
+        Args:
+            name (str): Name of the variable to represent.
+            value (Any): Value to represent.
+            outer_line_continuation (bool, optional): Whether the outermost representation should be line continued. Defaults to True.
+        """
+        _format(self, name, value, outer_line_continuation)
+
+    def enter(self, name: str, value: Any) -> bool:
+        """Enter a Nested Container, otherwise Write a Placeholder
+
+        A placeholder is written instead if the container is already being expanded
+        (a cycle), was already expanded in this pass (a shared reference), or
+        'max_depth' was reached. Must be followed by `exit` if True is returned.
+
+        Only containers with at least 'shared_min_size' items (or without a size, e.g.
+        dataclasses) are tracked as shared references, as expanding small ones again
+        is cheaper than tracking every one of them. Tuples are never tracked.
+
+        Args:
+            name (str): Name of the variable to represent.
+            value (Any): Value to represent.
+
+        Returns:
+            bool: True if the container should be expanded.
+        """
+        key = id(value)
+        if key in self._active:
+            _write_header(self, name, value)
+            self.write(f" ... recursive reference to {self._active[key]}")
+            return False
+        if key in self._seen:
+            _, first_name, first_scope = self._seen[key]
+            _write_header(self, name, value)
+            self.write(f" ... same object as {first_name}")
+            if first_scope != self.scope:
+                self.write(f" ({first_scope})")
+            return False
+        if self.max_depth is not None and self.depth >= self.max_depth:
+            _write_header(self, name, value)
+            self.write(" ... max depth reached")
+            return False
+        self._active[key] = name
+        if _is_shareable(value, self.shared_min_size):
+            self._seen[key] = (value, name, self.scope)
+        self.depth += 1
+        return True
+
+    def exit(self, value: Any) -> None:
+        """Exit a Nested Container
+
+        Args:
+            value (Any): Value that was represented.
+        """
+        del self._active[id(value)]
+        self.depth -= 1
+
+    def checkpoint(self) -> tuple[str, int]:
+        """Save the Indentation and Depth to Recover from a Failed Representation
+
+        Returns:
+            tuple[str, int]: State to pass to `restore`.
+        """
+        return self._indent, self.depth
+
+    def restore(self, state: tuple[str, int]) -> None:
+        """Restore the Indentation and Depth Saved with `checkpoint`
+
+        Containers that were being expanded are no longer considered active.
+
+        Args:
+            state (tuple[str, int]): State returned by `checkpoint`.
+        """
+        self._indent, self.depth = state
+        self._active.clear()
+
+    def flush(self) -> None:
+        """Flush the Buffered Output to the Write Function"""
+        if self._write is not None and self._pieces:
+            self._write("".join(self._pieces))
+            self._pieces.clear()
+
+    def getvalue(self) -> str:
+        """Get the Buffered Output
+
+        Returns:
+            str: Output that has not been flushed.
+        """
+        return "".join(self._pieces)
+
+
+def pformat(
+    name: str,
+    value: Any,
+    outer_line_continuation: bool = True,
+    *,
+    max_depth: LimitArg = DEFAULT,
+    max_items: LimitArg = DEFAULT,
+    max_length: LimitArg = DEFAULT,
+    max_bytes: LimitArg = DEFAULT,
+) -> str:
     """Create a formatted representation of a variable's name and value.
 
+    Limits that are not provided fall back to those set with `yogger.configure`, and
+    are disabled if set to None.
+
     Args:
         name (str): Name of the variable to represent.
         value (Any): Value to represent.
         outer_line_continuation (bool, optional): Whether the outermost representation should be line continued. Defaults to True.
+        max_depth (int | None, optional): Maximum depth of nested containers to expand. Defaults to DEFAULT.
+        max_items (int | None, optional): Maximum number of items to represent per container. Defaults to DEFAULT.
+        max_length (int | None, optional): Maximum number of characters per scalar representation. Defaults to DEFAULT.
+        max_bytes (int | None, optional): Maximum number of bytes (UTF-8) to write in total. Defaults to DEFAULT.
 
     Returns:
         str: Formatted representation of a variable's name and value.
     """
-    msg = None
-    # Support for requests package
-    if HAS_REQUESTS_PACKAGE:
-        if isinstance(value, Response):
-            # Requests response
-            msg = _requests_response_repr(name, value)
-        elif type(value) in (PreparedRequest, Request):
-            # Requests request
-            msg = _requests_request_repr(name, value)
-        elif isinstance(value, RequestException):
-            # Requests exception
-            msg = _requests_exception_repr(name, value)
-        if msg is not None:
-            return msg
-
-    if isinstance(value, dict):
-        # Dictionary
-        msg = _dict_repr(name, value)
-    elif isinstance(value, (list, tuple, set, collections.deque)):
-        # Container of objects (list, tuple, set, or deque)
-        msg = _object_container_repr(name, value)
-    elif dataclasses.is_dataclass(value):
-        # Dataclass
-        msg = _dataclass_repr(name, value)
-    if msg is not None:
-        return msg
-
-    # Other (also includes string, bytes, ranges, etc.)
-    msg = f"{name} = {value!r}"
-    # Apply line continuation if contains any newlines
-    if outer_line_continuation:
-        msg = _apply_line_continuation(msg)
-    return msg
-
-
-def _apply_line_continuation(msg: str) -> str:
+    w = Writer(
+        max_depth=max_depth,
+        max_items=max_items,
+        max_length=max_length,
+        max_bytes=max_bytes,
+    )
+    try:
+        _format(w, name, value, outer_line_continuation)
+    except _OutputLimitReached:
+        pass
+    return w.getvalue()
+
+
+def _format(
+    w: Writer,
+    name: str,
+    value: Any,
+    outer_line_continuation: bool = True,
+) -> None:
+    """Write a formatted representation of a variable's name and value.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the variable to represent.
+        value (Any): Value to represent.
+        outer_line_continuation (bool, optional): Whether the outermost representation should be line continued. Defaults to True.
+    """
+    handler = _dispatch(type(value))
+    if handler is _write_scalar and not outer_line_continuation:
+        w.write(f"{name} = {_scalar_repr(w, value)}")
+    else:
+        handler(w, name, value)
+
+
+def register_formatter(
+    cls: type,
+    func: Formatter | None = None,
+) -> Any:
+    """Register a formatter for a type and its subclasses.
+
+    Similar to `functools.singledispatch`, can be used as a decorator. The formatter
+    is called with the writer, the name, and the value to represent, e.g.
+
+        @yogger.register_formatter(MyRow)
+        def _(w, name, value):
+            w.write(f"{name} = <MyRow id={value.id}>")
+
+    Args:
+        cls (type): Type to format.
+        func (Formatter | None, optional): Formatter to register, otherwise return a decorator if set to None. Defaults to None.
+
+    Returns:
+        Any: The formatter, or a decorator to register it.
+    """
+    if func is None:
+        return lambda func: register_formatter(cls, func)
+
+    global _registry_version
+    _registry[cls] = func
+    _registry_version += 1
+    _dispatch_cache.clear()
+    return func
+
+
+def _dispatch(cls: type) -> Formatter:
+    """Resolve the formatter for a type, cached per concrete type.
+
+    Types are matched through their MRO first, then through abstract base classes
+    (including virtual subclasses registered with `ABC.register`).
+
+    Args:
+        cls (type): Type to resolve.
+
+    Returns:
+        Formatter: Formatter for the type.
+    """
+    # ABC registrations can change what a type matches, like in functools.singledispatch
+    version = (_registry_version, abc.get_cache_token())
+    entry = _dispatch_cache.get(cls)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    for base in cls.__mro__:
+        if base in _registry:
+            handler = _registry[base]
+            break
+    else:
+        abstract = _find_abstract(cls)
+        lazy = _find_lazy(cls)
+        if abstract is not None:
+            handler = _registry[abstract]
+        elif lazy is not None:
+            handler = lazy
+        elif dataclasses.is_dataclass(cls):
+            # Dataclass
+            handler = _write_dataclass
+        else:
+            # Other (also includes string, bytes, ranges, etc.)
+            handler = _write_scalar
+
+    _dispatch_cache[cls] = (version, handler)
+    return handler
+
+
+def _find_abstract(cls: type) -> type | None:
+    """Find the most specific registered abstract base class of a type.
+
+    Args:
+        cls (type): Type to resolve.
+
+    Returns:
+        type | None: Registered abstract base class, otherwise None if none match.
+    """
+    matches = [
+        base
+        for base in list(_registry)
+        if isinstance(base, abc.ABCMeta) and issubclass(cls, base)
+    ]
+    for base in matches:
+        if all(issubclass(base, other) for other in matches):
+            return base
+    # Ambiguous, use the first one registered
+    return matches[0] if matches else None
+
+
+def _find_lazy(cls: type) -> Formatter | None:
+    """Find the formatter of a type of an optional package through its MRO.
+
+    Args:
+        cls (type): Type to resolve.
+
+    Returns:
+        Formatter | None: Formatter for the type, otherwise None if none match.
+    """
+    for base in cls.__mro__:
+        key = (base.__module__.partition(".")[0], base.__name__)
+        if key in _lazy_registry:
+            return _lazy_registry[key]
+    return None
+
+
+def _write_scalar(w: Writer, name: str, value: Any) -> None:
+    """Write a formatted representation of a scalar (or any other) variable.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the variable to represent.
+        value (Any): Value to represent.
+    """
+    _write_line_continued(w, f"{name} = {_scalar_repr(w, value)}")
+
+
+def _write_line_continued(w: Writer, msg: str) -> None:
     """Prefix with a backslash and indent if the string contains any newlines.
 
     Args:
+        w (Writer): Writer to use.
         msg (str): Representation to apply line continuation to.
+    """
+    if "\n" in msg:
+        w.write("\\")
+        w.indent()
+        w.newline()
+        w.write(msg)
+        w.dedent()
+    else:
+        w.write(msg)
+
+
+def _scalar_repr(w: Writer, value: Any) -> str:
+    """Create the representation of a scalar value, truncated to 'max_length'.
+
+    Strings and bytes are sliced to 'max_length' (or the rest of 'max_bytes') before
+    their representation is created.
+
+    Args:
+        w (Writer): Writer to use.
+        value (Any): Value to represent.
 
     Returns:
-        str: String with line continuation and indent applied.
+        str: Representation of the value.
     """
-    if "\n" in msg:
-        msg = "\\\n  " + msg.replace("\n", "\n  ")
-    return msg
+    max_length = w.max_length
+    if max_length is not None:
+        if isinstance(value, (str, bytes, bytearray)) and len(value) > max_length:
+            unit = "characters" if isinstance(value, str) else "bytes"
+            return f"{value[:max_length]!r}... {len(value) - max_length:,} more {unit}"
+        return _truncate_repr(w, repr(value))
+    if w.max_bytes is not None and isinstance(value, (str, bytes, bytearray)):
+        # Anything past the remaining budget would be cut by the writer anyway
+        remaining = max(w.max_bytes - w._size, 0)
+        if len(value) > remaining:
+            return repr(value[: remaining + 1])
+    return repr(value)
+
+
+def _truncate_repr(w: Writer, text: str) -> str:
+    """Truncate a representation to 'max_length'.
+
+    Args:
+        w (Writer): Writer to use.
+        text (str): Representation to truncate.
+
+    Returns:
+        str: Truncated representation.
+    """
+    if w.max_length is not None and len(text) > w.max_length:
+        return f"{text[:w.max_length]}... {len(text) - w.max_length:,} more characters"
+    return text
+
+
+def _limit_items(w: Writer, items: Iterable, size: int) -> Iterable:
+    """Limit the items of a container to 'max_items'.
+
+    Args:
+        w (Writer): Writer to use.
+        items (Iterable): Items of the container.
+        size (int): Number of items in the container.
+
+    Returns:
+        Iterable: Items to represent.
+    """
+    if w.max_items is not None and size > w.max_items:
+        return islice(items, w.max_items)
+    return items
+
+
+def _write_more_items(w: Writer, size: int) -> None:
+    """Write a marker for the items that were skipped due to 'max_items'.
+
+    Args:
+        w (Writer): Writer to use.
+        size (int): Number of items in the container.
+    """
+    if w.max_items is not None and size > w.max_items:
+        w.newline()
+        w.write(f"... {size - w.max_items:,} more items")
+
+
+def _write_header(w: Writer, name: str, value: Any) -> None:
+    """Write the name and type of a variable that is represented on multiple lines.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the variable to represent.
+        value (Any): Value to represent.
+    """
+    w.write(f"{name} = <{type(value).__module__}.{type(value).__name__}>")
 
 
-# TODO: Reimplement as stated on https://setuptools.pypa.io/en/latest/userguide/entry_point.html
 if HAS_REQUESTS_PACKAGE:
 
-    def _requests_request_repr(name: str, request: Request) -> str:
-        """Create a formatted representation of a `requests.Request` object.
+    def _write_requests_headers(w: Writer, name: str, headers: Any) -> None:
+        """Write a formatted representation of the headers of a requests object.
 
-        Args:
-            name (str): Name of the requests request.
-            request (requests.Request): Request object from the requests module.
+        The values of the headers redacted by the filter set with `yogger.configure`
+        are not written.
 
-        Returns:
-            str: Formatted representation of a `requests.Request` object.
+        Args:
+            w (Writer): Writer to use.
+            name (str): Name of the requests object.
+            headers (Any): Headers of the requests object.
         """
-        msg = ""
-        msg += f"{name} = {request!r}"
-        msg += f"\n  {name}.method = {request.method}"
-        msg += f"\n  {name}.url = {request.url}"
-        msg += f"\n  {name}.headers = "
-        if not request.headers:
+        w.newline()
+        w.write(f"{name}.headers = ")
+        if not headers:
             # Empty or missing headers
-            msg += f"{request.headers!r}"
+            w.write(f"{headers!r}")
         else:
-            msg += "\\"
-            for field in request.headers:
-                msg += f'\n    {field} = {pformat("_", request.headers[field])}'
+            w.write("\\")
+            w.indent()
+            for field in headers:
+                w.newline()
+                w.write(f"{field} = ")
+                if redact_header(field):
+                    w.write(repr(REDACTED))
+                else:
+                    _format(w, "_", headers[field])
+            w.dedent()
 
+    def _write_requests_request(w: Writer, name: str, request: Request) -> None:
+        """Write a formatted representation of a `requests.Request` object.
+
+        Args:
+            w (Writer): Writer to use.
+            name (str): Name of the requests request.
+            request (requests.Request): Request object from the requests module.
+        """
+        if not w.enter(name, request):
+            return
+        w.write(f"{name} = {request!r}")
+        w.indent()
+        w.newline()
+        w.write(f"{name}.method = {request.method}")
+        w.newline()
+        w.write(f"{name}.url = {request.url}")
+        _write_requests_headers(w, name, request.headers)
         for attr in ("body", "params", "data"):
             if hasattr(request, attr) and getattr(request, attr):
-                msg += f"\n  {name}.{attr} = "
-                msg += pformat("_", getattr(request, attr)).replace("\n", "\n  ")
-        return msg
+                w.newline()
+                w.write(f"{name}.{attr} = ")
+                _format(w, "_", getattr(request, attr))
+        w.dedent()
+        w.exit(request)
 
-    def _requests_response_repr(
+    def _write_requests_response(
+        w: Writer,
         name: str,
         response: Response,
         *,
         include_history: bool = True,
-    ) -> str:
-        """Create a formatted representation of a `requests.Response` object.
+    ) -> None:
+        """Write a formatted representation of a `requests.Response` object.
 
         Args:
+            w (Writer): Writer to use.
             name (str): Name of the requests response.
             response (requests.Response): Response object from the requests module.
             include_history (bool, optional): Include the request redirect history in the representation (not yet accessable to user). Defaults to True.
-
-        Returns:
-            str: Formatted representation of a `requests.Response` object.
         """
-        msg = ""
-        msg += f"{name} = {response!r}"
-        msg += f"\n  {name}.url = {response.url}"
-        msg += f"\n  {name}.request = "
-        msg += pformat("_", response.request).replace("\n", "\n  ")
+        if not w.enter(name, response):
+            return
+        w.write(f"{name} = {response!r}")
+        w.indent()
+        w.newline()
+        w.write(f"{name}.url = {response.url}")
+        w.newline()
+        w.write(f"{name}.request = ")
+        _format(w, "_", response.request)
         if include_history and response.history:
-            msg += f"\n  {name}.history = ["
+            w.newline()
+            w.write(f"{name}.history = [")
+            w.indent()
             for prev_resp in response.history:
-                msg += "\n    "
-                msg += _requests_response_repr(
-                    "_", prev_resp, include_history=False
-                ).replace("\n", "\n    ")
+                w.newline()
+                _write_requests_response(w, "_", prev_resp, include_history=False)
+            w.dedent()
+            w.newline()
+            w.write("]")
 
-            msg += "\n  ]"
+        w.newline()
+        w.write(f"{name}.status_code = {response.status_code}")
+        _write_requests_headers(w, name, response.headers)
+        w.newline()
+        w.write(f"{name}.content = ")
+        _write_requests_content(w, response)
+        w.dedent()
+        w.exit(response)
 
-        msg += f"\n  {name}.status_code = {response.status_code}"
-        msg += f"\n  {name}.headers = "
-        if not response.headers:
-            # Empty or missing headers
-            msg += f"{response.headers!r}"
-        else:
-            msg += "\\"
-            for field in response.headers:
-                msg += f'\n    {field} = {pformat("_", response.headers[field])}'
+    def _write_requests_content(w: Writer, response: Response) -> None:
+        """Write a bounded representation of the content of a `requests.Response` object.
+
+        Content that was not read yet (e.g. of a streamed response) is never read, so
+        the stream is left for the application: its length and encoding are written
+        instead. Text content is truncated to 'max_length' characters (otherwise
+        `RESPONSE_CONTENT_LENGTH`), and binary content is summarized by its size and
+        hash.
+
+        Args:
+            w (Writer): Writer to use.
+            response (requests.Response): Response object from the requests module.
+        """
+        # Only read through 'response.content', which would consume the stream
+        content = response._content
+        headers = response.headers
+        if content is False:
+            state = "consumed" if response._content_consumed else "not read"
+            length = _get_header(headers, "Content-Length")
+            size = f"{int(length):,} bytes" if length and length.isdigit() else None
+            details = ", ".join(
+                f"{key}: {value}"
+                for key, value in (
+                    ("Content-Length", size),
+                    ("Content-Encoding", _get_header(headers, "Content-Encoding")),
+                    ("encoding", response.encoding),
+                )
+                if value is not None
+            )
+            w.write(f"<{state}{', ' + details if details else ''}>")
+            return
+        if not isinstance(content, bytes) or not content:
+            _format(w, "_", content)
+            return
+
+        max_length = RESPONSE_CONTENT_LENGTH if w.max_length is None else w.max_length
+        if _is_text(_get_header(headers, "Content-Type"), content[:max_length]):
+            if len(content) > max_length:
+                w.write(
+                    f"_ = {content[:max_length]!r}..."
+                    f" {len(content) - max_length:,} more bytes"
+                )
+            else:
+                _format(w, "_", content)
+            return
 
-        msg += f'\n  {name}.content = {pformat("_", response.content)}'
-        return msg
+        digest = hashlib.sha256(content).hexdigest()
+        w.write(f"<{len(content):,} bytes, sha256: {digest}>")
 
-    def _requests_exception_repr(name: str, err: RequestException) -> str:
-        """Create a formatted representation of a `requests.exceptions.RequestException` object.
+    def _write_requests_exception(w: Writer, name: str, err: RequestException) -> None:
+        """Write a formatted representation of a `requests.exceptions.RequestException` object.
 
         Args:
+            w (Writer): Writer to use.
             name (str): Name of the requests Exception.
             err (requests.exceptions.RequestException): Exception object from the requests module.
-
-        Returns:
-            str: Formatted representation of a requests exception.
         """
-        msg = ""
-        msg += f"{name} = {err!r}"
-        msg += "\n  " + pformat(f"{name}.request", err.request).replace("\n", "\n  ")
-        msg += "\n  " + pformat(f"{name}.response", err.response).replace("\n", "\n  ")
-        return msg
+        if not w.enter(name, err):
+            return
+        w.write(f"{name} = {err!r}")
+        w.indent()
+        w.newline()
+        _format(w, f"{name}.request", err.request)
+        w.newline()
+        _format(w, f"{name}.response", err.response)
+        w.dedent()
+        w.exit(err)
+
+
+def _get_header(headers: Any, field: str) -> str | None:
+    """Get the value of a header, case-insensitively.
+
+    Args:
+        headers (Any): Headers to search, e.g. a `requests.structures.CaseInsensitiveDict`.
+        field (str): Name of the header.
+
+    Returns:
+        str | None: Value of the header, otherwise None if missing.
+    """
+    if not headers:
+        return None
+    value = headers.get(field)
+    if value is None:
+        field = field.lower()
+        value = next((v for k, v in headers.items() if k.lower() == field), None)
+    return value
+
+
+def _is_text(content_type: str | None, prefix: bytes) -> bool:
+    """Check if content is text, from its type, otherwise by decoding a prefix of it.
 
+    Args:
+        content_type (str | None): Value of the Content-Type header.
+        prefix (bytes): Prefix of the content.
+
+    Returns:
+        bool: True if the content is text.
+    """
+    if content_type is not None:
+        media_type = content_type.partition(";")[0].strip().lower()
+        return (
+            "charset=" in content_type.lower()
+            or media_type.startswith("text/")
+            or media_type.endswith(
+                ("json", "xml", "javascript", "x-www-form-urlencoded")
+            )
+        )
+    try:
+        prefix.decode("utf-8")
+    except UnicodeDecodeError as err:
+        # A character cut off at the end of the prefix
+        return err.start >= len(prefix) - 3
+    return True
 
-def _dict_repr(name: str, value: dict) -> str:
-    """Create a formatted respresentation of a dictionary variable's name and value.
+
+def _write_dict(w: Writer, name: str, value: dict) -> None:
+    """Write a formatted respresentation of a dictionary variable's name and value.
 
     Args:
+        w (Writer): Writer to use.
         name (str): Name of the dict to represent.
         value (dict): Value to represent.
+    """
+    if not w.enter(name, value):
+        return
+    _write_header(w, name, value)
+    w.indent()
+    size = len(value)
+    for k, v in _limit_items(w, value.items(), size):
+        w.newline()
+        _format(w, f"{name}[{k!r}]", v)
+    if not size:
+        w.newline()
+    _write_more_items(w, size)
+    w.dedent()
+    w.exit(value)
+
+
+def _object_container_repr(
+    w: Writer,
+    value: list | tuple | set | collections.deque,
+    items: Iterable,
+    size: int,
+) -> str:
+    """Create a single line representation of a container, applying the limits to its items.
+
+    Args:
+        w (Writer): Writer to use.
+        value (list | tuple | set | collections.deque): Container to represent.
+        items (Iterable): Items of the container to represent.
+        size (int): Number of items in the container.
 
     Returns:
-        str: Formatted representation of a dictionary's name and variable.
+        str: Representation of the container.
     """
-    msg = ""
-    msg += f"{name} = <{type(value).__module__}.{type(value).__name__}>\n  "
-    msg += "\n  ".join(
-        pformat(f"{name}[{k!r}]", v).replace("\n", "\n  ") for k, v in value.items()
-    )
-    return msg
+    if not size:
+        return repr(value)
+    if isinstance(value, collections.deque):
+        opening, closing = "deque([", "])"
+    elif isinstance(value, tuple):
+        opening, closing = "(", ")"
+    elif isinstance(value, set):
+        opening, closing = "{", "}"
+    else:
+        opening, closing = "[", "]"
+    parts = [_scalar_repr(w, v) for v in items]
+    if len(parts) < size:
+        parts.append(f"... {size - len(parts):,} more items")
+    elif size == 1 and opening == "(":
+        # Single item tuple
+        return f"({parts[0]},)"
+    return opening + ", ".join(parts) + closing
 
 
-def _object_container_repr(
+def _write_object_container(
+    w: Writer,
     name: str,
     value: list | tuple | set | collections.deque,
-) -> str:
-    """Create a formatted representation of a container of objects (list, tuple, set, collections.deque).
+) -> None:
+    """Write a formatted representation of a container of objects (list, tuple, set, collections.deque).
 
     Args:
+        w (Writer): Writer to use.
         name (str): Name of the collection variable to represent.
         value (list | tuple | set | collections.deque): Value to represent.
+    """
+    size = num_items = len(value)
+    if w.max_items is not None and size > w.max_items:
+        items: Iterable = list(islice(value, w.max_items))
+        num_items = w.max_items
+    else:
+        items = value
+    # Classify the types of the items in a single pass in C
+    if size >= SUMMARY_MIN_ITEMS:
+        types = set(map(type, value))
+        if float in types and types <= _NUMBER_TYPES:
+            _write_numbers_summary(w, name, value)
+            return
+    else:
+        types = set(map(type, items))
+    if all(issubclass(cls, _PRIMITIVE_TYPES) for cls in types):
+        # Single line (all values are primitives)
+        if items is value and w.max_length is None:
+            msg = repr(value)
+        else:
+            msg = _object_container_repr(w, value, items, size)
+        _write_line_continued(w, f"{name} = {msg}")
+        return
 
-    Returns:
-        str: Formatted representation of a container of objects' name and value.
+    if not w.enter(name, value):
+        return
+    # Multiple lines (not all values are primitives), always line continued
+    w.write("\\")
+    w.indent()
+    w.newline()
+    _write_header(w, name, value)
+    w.indent()
+    # Runs of primitives are written on a single line each, other items are formatted
+    # with the formatter of their type, resolved once per type
+    run: list[str] = []
+    handlers: dict[type, Formatter] = {}
+    for i, v in enumerate(items):
+        if isinstance(v, _PRIMITIVE_TYPES):
+            run.append(_scalar_repr(w, v))
+            continue
+        _write_run(w, name, i, run)
+        cls = type(v)
+        handler = handlers.get(cls)
+        if handler is None:
+            handler = handlers[cls] = _dispatch(cls)
+        w.newline()
+        handler(w, f"{name}[{i}]", v)
+    _write_run(w, name, num_items, run)
+    _write_more_items(w, size)
+    w.dedent()
+    w.dedent()
+    w.exit(value)
+
+
+def _write_run(w: Writer, name: str, end: int, run: list[str]) -> None:
+    """Write a run of consecutive primitive items of a container on a single line.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the container.
+        end (int): Index of the item following the run.
+        run (list[str]): Representations of the items of the run, cleared once written.
     """
-    msg = ""
-    if all(isinstance(v, (int, str)) for v in value):
-        # Single line (all values are int or str)
-        msg = f"{name} = {value!r}"
+    if not run:
+        return
+    w.newline()
+    start = end - len(run)
+    if len(run) == 1:
+        _write_line_continued(w, f"{name}[{start}] = {run[0]}")
     else:
-        # Multiple lines (not all values are int or str)
-        msg += f"{name} = <{type(value).__module__}.{type(value).__name__}>\n  "
-        msg += "\n  ".join(
-            pformat(f"{name}[{i}]", v).replace("\n", "\n  ")
-            for i, v in enumerate(value)
-        )
+        _write_line_continued(w, f"{name}[{start}:{end}] = [{', '.join(run)}]")
+    run.clear()
+
 
-    # Apply line continuation if contains any newlines
-    msg = _apply_line_continuation(msg)
-    return msg
+def _write_summary(
+    w: Writer,
+    name: str,
+    value: Any,
+    fields: Iterable[tuple[str, str]],
+) -> None:
+    """Write a summary of a variable, a field per line.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the variable to represent.
+        value (Any): Value to represent.
+        fields (Iterable[tuple[str, str]]): Names and representations of the fields of the summary, line continued if on multiple lines.
+    """
+    _write_header(w, name, value)
+    w.indent()
+    for field, text in fields:
+        w.newline()
+        _write_line_continued(w, f"{name}.{field} = {text}")
+    w.dedent()
 
 
-def _dataclass_repr(name: str, value: object) -> str:
-    """Create a formatted representation of a dataclass' name and value.
+def _sample_size(w: Writer) -> int:
+    """Get the number of items to sample from each end of a summarized value.
 
     Args:
-        name (str): Name of the dataclass to represent.
-        value (object): Value to represent.
+        w (Writer): Writer to use.
 
     Returns:
-        str: Formatted representation of a dataclass' name and value.
+        int: `SUMMARY_ITEMS`, or 'max_items' if lower.
     """
-    msg = ""
-    msg += f"{name} = <{type(value).__module__}.{type(value).__name__}>\n  "
-    msg += "\n  ".join(
-        " = ".join(
-            (
-                pformat(f"{name}.{f.name}", f.name),
-                pformat(f"{name}.{f.name}", getattr(value, f.name)),
+    if w.max_items is not None:
+        return min(SUMMARY_ITEMS, w.max_items)
+    return SUMMARY_ITEMS
+
+
+def _sample_repr(w: Writer, head: Iterable, tail: Iterable, size: int) -> str:
+    """Create a single line representation of a sample of the items of a value.
+
+    Args:
+        w (Writer): Writer to use.
+        head (Iterable): Items from the start of the value.
+        tail (Iterable): Items from the end of the value, disjoint from the head.
+        size (int): Number of items in the value.
+
+    Returns:
+        str: Representation of the sample, e.g. "[0.1, 0.2, ... 996 more items, 0.9]".
+    """
+    parts = [_scalar_repr(w, v) for v in head]
+    tail_parts = [_scalar_repr(w, v) for v in tail]
+    skipped = size - len(parts) - len(tail_parts)
+    if skipped > 0:
+        parts.append(f"... {skipped:,} more items")
+    return "[" + ", ".join(parts + tail_parts) + "]"
+
+
+def _sample_sequence(w: Writer, value: Any, size: int) -> str:
+    """Create a single line representation of a sample of the items of a sequence.
+
+    Args:
+        w (Writer): Writer to use.
+        value (Any): Sequence supporting slicing.
+        size (int): Number of items in the sequence.
+
+    Returns:
+        str: Representation of the sample.
+    """
+    n = _sample_size(w)
+    if size <= 2 * n:
+        return _sample_repr(w, value, (), size)
+    return _sample_repr(w, value[:n], value[size - n :], size)
+
+
+def _numbers_stats(values: Iterable[int | float]) -> list[tuple[str, str]]:
+    """Compute the minimum, maximum, mean, and number of NaNs of numbers.
+
+    Args:
+        values (Iterable[int | float]): Numbers to compute the statistics of.
+
+    Returns:
+        list[tuple[str, str]]: Names and representations of the statistics, otherwise only the number of NaNs if all are NaN.
+    """
+    # Builtins iterate in C, unlike a loop updating every statistic
+    values = values if isinstance(values, (list, tuple, array.array)) else list(values)
+    try:
+        nan = sum(map(math.isnan, values))
+    except OverflowError:
+        # Integers too large for a float are not NaN
+        nan = 0
+    if nan:
+        values = [v for v in values if v == v]
+    if not values:
+        return [("nan", f"{nan:,}")]
+    return [
+        ("min", repr(min(values))),
+        ("max", repr(max(values))),
+        ("mean", repr(sum(values) / len(values))),
+        ("nan", f"{nan:,}"),
+    ]
+
+
+def _write_numbers_summary(
+    w: Writer,
+    name: str,
+    value: list | tuple | set | collections.deque,
+) -> None:
+    """Write a summary of a large container of numbers, instead of every number.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the container to represent.
+        value (list | tuple | set | collections.deque): Value to represent.
+    """
+    size = len(value)
+    if isinstance(value, (list, tuple)):
+        sample = _sample_sequence(w, value, size)
+    else:
+        n = _sample_size(w)
+        sample = _sample_repr(w, islice(value, n), (), size)
+    _write_summary(
+        w,
+        name,
+        value,
+        [("len", f"{size:,}"), *_numbers_stats(value), ("sample", sample)],
+    )
+
+
+def _write_array(w: Writer, name: str, value: array.array) -> None:
+    """Write a formatted representation of an `array.array`, summarized if large.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the array to represent.
+        value (array.array): Value to represent.
+    """
+    size = len(value)
+    if size < SUMMARY_MIN_ITEMS:
+        _write_scalar(w, name, value)
+        return
+    fields = [
+        ("typecode", repr(value.typecode)),
+        ("len", f"{size:,}"),
+        ("nbytes", f"{size * value.itemsize:,}"),
+    ]
+    if value.typecode != "u":
+        fields.extend(_numbers_stats(value))
+    fields.append(("sample", _sample_sequence(w, value, size)))
+    _write_summary(w, name, value, fields)
+
+
+def _write_bytearray(w: Writer, name: str, value: bytearray) -> None:
+    """Write a formatted representation of a `bytearray`, summarized if large.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the bytearray to represent.
+        value (bytearray): Value to represent.
+    """
+    size = len(value)
+    if size < SUMMARY_MIN_ITEMS:
+        _write_scalar(w, name, value)
+        return
+    n = _sample_size(w)
+    _write_summary(
+        w,
+        name,
+        value,
+        [
+            ("len", f"{size:,}"),
+            ("head", repr(bytes(value[:n * 8]))),
+            ("sha256", hashlib.sha256(value).hexdigest()),
+        ],
+    )
+
+
+def _write_memoryview(w: Writer, name: str, value: memoryview) -> None:
+    """Write a summary of a `memoryview`, without copying the memory it references.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the memoryview to represent.
+        value (memoryview): Value to represent.
+    """
+    try:
+        fields = [
+            ("format", repr(value.format)),
+            ("shape", repr(value.shape)),
+            ("nbytes", f"{value.nbytes:,}"),
+            ("readonly", repr(value.readonly)),
+        ]
+    except ValueError:
+        # Released
+        _write_scalar(w, name, value)
+        return
+    if value.ndim == 1:
+        size = len(value)
+        n = _sample_size(w)
+        if size <= 2 * n:
+            sample = _sample_repr(w, value.tolist(), (), size)
+        else:
+            sample = _sample_repr(
+                w, value[:n].tolist(), value[size - n :].tolist(), size
             )
-        ).replace("\n", "\n  ")
-        for f in dataclasses.fields(value)
+        fields.append(("sample", sample))
+    _write_summary(w, name, value, fields)
+
+
+def _write_numpy_array(w: Writer, name: str, value: Any) -> None:
+    """Write a summary of a `numpy.ndarray`, with vectorized statistics.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the array to represent.
+        value (numpy.ndarray): Value to represent.
+    """
+    import numpy as np  # Already imported, as the array exists
+
+    size = int(value.size)
+    fields = [
+        ("shape", repr(value.shape)),
+        ("dtype", str(value.dtype)),
+        ("nbytes", f"{value.nbytes:,}"),
+    ]
+    kind = value.dtype.kind
+    if size and kind in "iuf":
+        nan = int(np.count_nonzero(np.isnan(value))) if kind == "f" else 0
+        if nan < size:
+            stats = (
+                (np.nanmin, np.nanmax, np.nanmean)
+                if nan
+                else (np.min, np.max, np.mean)
+            )
+            fields.extend(
+                (stat, repr(func(value).item()))
+                for stat, func in zip(("min", "max", "mean"), stats)
+            )
+        fields.append(("nan", f"{nan:,}"))
+
+    # Only the sampled items are copied
+    n = _sample_size(w)
+    flat = value.flat
+    if size <= 2 * n:
+        sample = _sample_repr(w, flat[:size].tolist(), (), size)
+    else:
+        sample = _sample_repr(w, flat[:n].tolist(), flat[size - n :].tolist(), size)
+    fields.append(("sample", sample))
+    _write_summary(w, name, value, fields)
+
+
+def _python_scalar(value: Any) -> Any:
+    """Convert a NumPy scalar to the equivalent Python scalar.
+
+    Args:
+        value (Any): Scalar to convert, e.g. a `numpy.float64`.
+
+    Returns:
+        Any: Python scalar, otherwise the value itself if it is not a NumPy scalar.
+    """
+    item = getattr(value, "item", None)
+    return value if item is None else item()
+
+
+def _write_pandas_series(w: Writer, name: str, value: Any) -> None:
+    """Write a summary of a `pandas.Series`, with vectorized statistics.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the series to represent.
+        value (pandas.Series): Value to represent.
+    """
+    size = len(value)
+    nan = int(value.isna().sum())
+    fields = [
+        ("name", repr(value.name)),
+        ("len", f"{size:,}"),
+        ("dtype", str(value.dtype)),
+        ("memory_usage", f"{int(value.memory_usage(deep=False)):,}"),
+    ]
+    if nan < size and value.dtype.kind in "iuf":
+        fields.extend(
+            (stat, repr(_python_scalar(getattr(value, stat)())))
+            for stat in ("min", "max", "mean")
+        )
+    fields.append(("nan", f"{nan:,}"))
+
+    n = _sample_size(w)
+    if size <= 2 * n:
+        sample = _sample_repr(w, value.tolist(), (), size)
+    else:
+        sample = _sample_repr(
+            w, value.iloc[:n].tolist(), value.iloc[size - n :].tolist(), size
+        )
+    fields.append(("sample", sample))
+    _write_summary(w, name, value, fields)
+
+
+def _write_pandas_dataframe(w: Writer, name: str, value: Any) -> None:
+    """Write a summary of a `pandas.DataFrame`, with the rows at its start and end.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the dataframe to represent.
+        value (pandas.DataFrame): Value to represent.
+    """
+    num_rows, num_columns = value.shape
+    n = _sample_size(w)
+    max_columns = 4 * n
+    dtypes = value.dtypes
+    columns = [
+        f"{column!r}: {dtypes.iloc[i]}"
+        for i, column in enumerate(value.columns[:max_columns])
+    ]
+    if num_columns > len(columns):
+        columns.append(f"... {num_columns - len(columns):,} more columns")
+
+    # Only the sampled rows are copied
+    if num_rows > 2 * n:
+        rows = value.iloc[[*range(n), *range(num_rows - n, num_rows)]]
+    else:
+        rows = value
+    _write_summary(
+        w,
+        name,
+        value,
+        [
+            ("shape", repr(value.shape)),
+            ("columns", "{" + ", ".join(columns) + "}"),
+            ("memory_usage", f"{int(value.memory_usage(deep=False).sum()):,}"),
+            ("nan", f"{int(value.isna().sum().sum()):,}"),
+            ("rows", rows.to_string(max_cols=max_columns)),
+        ],
     )
-    return msg
+
+
+def _write_dataclass(w: Writer, name: str, value: object) -> None:
+    """Write a formatted representation of a dataclass' name and value.
+
+    Args:
+        w (Writer): Writer to use.
+        name (str): Name of the dataclass to represent.
+        value (object): Value to represent.
+    """
+    if not w.enter(name, value):
+        return
+    _write_header(w, name, value)
+    w.indent()
+    fields = dataclasses.fields(value)
+    for f in _limit_items(w, fields, len(fields)):
+        w.newline()
+        _format(w, f"{name}.{f.name}", f.name)
+        w.write(" = ")
+        _format(w, f"{name}.{f.name}", getattr(value, f.name))
+    if not fields:
+        w.newline()
+    _write_more_items(w, len(fields))
+    w.dedent()
+    w.exit(value)
+
+
+register_formatter(dict, _write_dict)
+register_formatter(list, _write_object_container)
+register_formatter(tuple, _write_object_container)
+register_formatter(set, _write_object_container)
+register_formatter(collections.deque, _write_object_container)
+register_formatter(array.array, _write_array)
+register_formatter(bytearray, _write_bytearray)
+register_formatter(memoryview, _write_memoryview)
+
+# Support for NumPy and pandas packages, without importing them
+_lazy_registry[("numpy", "ndarray")] = _write_numpy_array
+_lazy_registry[("pandas", "Series")] = _write_pandas_series
+_lazy_registry[("pandas", "DataFrame")] = _write_pandas_dataframe
+
+# Support for requests package
+if HAS_REQUESTS_PACKAGE:
+    register_formatter(Response, _write_requests_response)
+    register_formatter(Request, _write_requests_request)
+    register_formatter(PreparedRequest, _write_requests_request)
+    register_formatter(RequestException, _write_requests_exception)
@@ -0,0 +1,46 @@
+"""Resolve dump policies by logger.
+
+This module contains the policy deciding whether and how the stack is dumped when
+logging, which is attached to a logger hierarchy and resolved by the most specific
+logger name.
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import NamedTuple
+
+
+class DumpPolicy(NamedTuple):
+    """Policy for Dumping the Stack when Logging"""
+
+    #: Minimum level to dump the stack at, otherwise never dump if None
+    level: int | None = logging.WARNING
+    #: Name of the package to dump from the stack, otherwise the configured package if None
+    package_name: str | None = None
+    #: Path of the file to dump to, otherwise the configured path if None
+    dump_path: str | None = None
+
+
+def resolve_policy(
+    policies: Mapping[str, DumpPolicy],
+    name: str,
+) -> DumpPolicy | None:
+    """Resolve the Policy of a Logger
+
+    A policy applies to the logger it is attached to and its children ("" to all
+    loggers), unless a child has a policy of its own.
+
+    Args:
+        policies (Mapping[str, DumpPolicy]): Policies by logger name.
+        name (str): Name of the logger.
+
+    Returns:
+        DumpPolicy | None: Policy of the most specific logger, otherwise None if no policy applies.
+    """
+    while True:
+        policy = policies.get(name)
+        if policy is not None:
+            return policy
+        if not name:
+            return None
+        name = name.rpartition(".")[0]
@@ -0,0 +1,129 @@
+"""Deduplicate and rate limit dumps.
+
+This module contains a limiter that decides whether a dump should be written, keyed
+on the call site of the dump, before any frames are inspected or files are created.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+
+
+class DumpLimiter:
+    """Deduplicate and Rate Limit Dumps by Fingerprint
+
+    A dump is allowed while its fingerprint was dumped fewer than 'first_n' times and
+    a token is available in a bucket shared by all fingerprints. The bucket holds up
+    to 'rate' tokens and is refilled with 'rate' tokens every 'per' seconds.
+    Suppressed dumps are only counted, and a summary of them is returned by `summary`
+    at most once every 'summary_interval' seconds.
+
+    Fingerprints are remembered up to 'maxsize', after which the oldest is forgotten
+    (and may be dumped again).
+
+    Args:
+        first_n (int | None, optional): Maximum number of dumps per fingerprint, otherwise unlimited if None. Defaults to None.
+        rate (int | None, optional): Maximum number of dumps per 'per' seconds, otherwise unlimited if None. Defaults to None.
+        per (float, optional): Window of the rate in seconds. Defaults to 60.0.
+        summary_interval (float, optional): Minimum number of seconds between summaries of suppressed dumps. Defaults to 60.0.
+        maxsize (int, optional): Maximum number of fingerprints to remember. Defaults to 4096.
+        clock (Callable[[], float], optional): Monotonic clock in seconds. Defaults to `time.monotonic`.
+    """
+
+    def __init__(
+        self,
+        first_n: int | None = None,
+        rate: int | None = None,
+        per: float = 60.0,
+        summary_interval: float = 60.0,
+        maxsize: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.first_n = first_n
+        self.rate = rate
+        self.per = per
+        self.summary_interval = summary_interval
+        self.maxsize = maxsize
+        self._clock = clock
+        #: Number of dumps that were suppressed
+        self.suppressed = 0
+        # Number of dumps by fingerprint
+        self._counts: dict[Hashable, int] = {}
+        # Number of suppressed dumps by fingerprint, since the last summary
+        self._suppressed: dict[Hashable, int] = {}
+        self._tokens = float(rate or 0)
+        self._refilled = clock()
+        self._summarized = self._refilled
+        self._lock = threading.Lock()
+
+    def after_fork(self) -> None:
+        """Replace the Lock in a Forked Child, as Another Thread may have Held it"""
+        self._lock = threading.Lock()
+
+    def allow(self, fingerprint: Hashable) -> bool:
+        """Decide if a Dump should be Written
+
+        Args:
+            fingerprint (Hashable): Fingerprint of the dump, e.g. its call site.
+
+        Returns:
+            bool: True if the dump should be written, otherwise False if it was suppressed.
+        """
+        with self._lock:
+            count = self._counts.get(fingerprint, 0)
+            if (self.first_n is not None and count >= self.first_n) or (
+                self.rate is not None and not self._take_token()
+            ):
+                self.suppressed += 1
+                if fingerprint in self._suppressed:
+                    self._suppressed[fingerprint] += 1
+                elif len(self._suppressed) < self.maxsize:
+                    self._suppressed[fingerprint] = 1
+                return False
+
+            if not count and len(self._counts) >= self.maxsize:
+                del self._counts[next(iter(self._counts))]
+            self._counts[fingerprint] = count + 1
+            return True
+
+    def _take_token(self) -> bool:
+        """Take a Token from the Bucket, Refilling it First
+
+        Returns:
+            bool: True if a token was available.
+        """
+        now = self._clock()
+        rate = float(self.rate or 0)
+        self._tokens = min(
+            rate,
+            self._tokens + (now - self._refilled) * rate / self.per,
+        )
+        self._refilled = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def summary(self) -> str | None:
+        """Summarize the Suppressed Dumps, if Due
+
+        Returns:
+            str | None: Summary of the dumps suppressed since the last summary, otherwise None if there were none or it is not due yet.
+        """
+        if not self._suppressed:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            if not self._suppressed or now - self._summarized < self.summary_interval:
+                return None
+            num_dumps = sum(self._suppressed.values())
+            num_sites = len(self._suppressed)
+            elapsed = now - self._summarized
+            self._suppressed.clear()
+            self._summarized = now
+
+        return (
+            f"Suppressed {num_dumps:,} dumps from {num_sites:,} call sites "
+            f"in the last {elapsed:,.0f}s"
+        )
@@ -0,0 +1,142 @@
+"""Record recent log records in memory.
+
+This module contains a logging handler that keeps the most recent records of all
+levels in a ring buffer (a "flight recorder"), so they can be written together with a
+dump without writing every record as it is logged.
+"""
+
+import collections
+import logging
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+from .constants import DATE_FMT, RECORD_FMT
+from .structured import encode_record
+
+_formatter = logging.Formatter(fmt=RECORD_FMT, datefmt=DATE_FMT, style="{")
+
+
+class FlightRecorder(logging.Handler):
+    """Logging Handler Keeping the Most Recent Records in Memory
+
+    Handling a record only appends it to a bounded deque: it is neither formatted nor
+    locked, as the message is only formatted when the records are written with a
+    dump. Arguments of a record are therefore represented in the state they are in
+    when written, and are kept alive until the record is evicted.
+
+    Args:
+        capacity (int, optional): Maximum number of records to keep, evicting the oldest. Defaults to 1000.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        super().__init__()
+        self.capacity = capacity
+        self._records: collections.deque[logging.LogRecord] = collections.deque(
+            maxlen=capacity
+        )
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Appending to a deque is thread-safe, so skip the handler lock
+        if self.filters and not self.filter(record):
+            return False
+        self._records.append(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._records.append(record)
+
+    def records(self) -> list[logging.LogRecord]:
+        """Take a Snapshot of the Records
+
+        Returns:
+            list[logging.LogRecord]: Records, oldest first.
+        """
+        return list(self._records)
+
+    def clear(self) -> None:
+        """Remove All Records"""
+        self._records.clear()
+
+
+def _failure_marker(err: Exception, record: logging.LogRecord) -> str:
+    """Create a Marker for a Record that Failed to Format
+
+    Args:
+        err (Exception): Exception that was raised while formatting the record.
+        record (logging.LogRecord): Record that failed to format.
+
+    Returns:
+        str: Marker with the unformatted message.
+    """
+    return f"<record failed to format: {type(err).__name__}: {err}> {record.msg!r}"
+
+
+def format_records(records: Sequence[logging.LogRecord]) -> Iterator[str]:
+    """Format Log Records, Marking those that Fail to Format
+
+    Records are formatted like the stream handler added by `yogger.configure`, without
+    colors.
+
+    Args:
+        records (Sequence[logging.LogRecord]): Records to format.
+
+    Yields:
+        str: Formatted records.
+    """
+    for record in records:
+        try:
+            yield _formatter.format(record)
+        except Exception as err:
+            # E.g. arguments that do not match the message
+            yield _failure_marker(err, record)
+
+
+def record_dict(record: logging.LogRecord) -> dict[str, Any]:
+    """Create a Structured Representation of a Log Record
+
+    Args:
+        record (logging.LogRecord): Record to represent.
+
+    Returns:
+        dict[str, Any]: Time, level, logger name, location, and message of the record.
+    """
+    try:
+        message = record.getMessage()
+    except Exception as err:
+        message = _failure_marker(err, record)
+    return {
+        "type": "log",
+        "time": record.created,
+        "level": record.levelname,
+        "logger": record.name,
+        "file": record.pathname,
+        "line": record.lineno,
+        "message": message,
+    }
+
+
+def write_records(
+    write: Callable[[str | bytes], object],
+    records: Sequence[logging.LogRecord],
+    format: str = "text",
+    dump_id: str | None = None,
+) -> None:
+    """Write Log Records after a Dump
+
+    Args:
+        write (Callable[[str | bytes], object]): Function to write with, which must accept bytes for the "binary" format.
+        records (Sequence[logging.LogRecord]): Records to write, oldest first.
+        format (str, optional): Format of the dump ("text", "jsonl", or "binary"). Defaults to "text".
+        dump_id (str | None, optional): Identifier of the dump to add to every structured record. Defaults to None.
+    """
+    if format == "text":
+        write("\nRecent log records:\n")
+        for line in format_records(records):
+            write(line + "\n")
+        return
+
+    for record in records:
+        data = record_dict(record)
+        if dump_id is not None:
+            data["dump"] = dump_id
+        write(encode_record(data, format))
@@ -0,0 +1,159 @@
+"""Sample dumps to bound their overhead.
+
+This module contains a sampler that decides whether the stack should be dumped when
+logging, by logger name and level, before any frames are inspected: a skipped dump
+only costs a dictionary lookup and a random draw.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+
+
+class DumpSampler:
+    """Sample Dumps by Logger and Level, within a Budget of CPU Time
+
+    A dump is sampled with the probability of the most specific rule that applies to
+    the logger and level, otherwise with the default 'rate'. Rules are keyed by the
+    name of a logger, which also applies to its children ("" for all loggers), or by a
+    pair of a logger name and a level, which also applies to the levels above it. The
+    probability of each logger and level is resolved once and cached.
+
+    If 'cpu_fraction' is set, dumps are also adaptively skipped to spend at most that
+    fraction of the time dumping: a budget accrues 'cpu_fraction' seconds per second
+    (up to 'cpu_fraction * window' seconds), and the time each dump took, as measured
+    by the caller with `record`, is charged to it. A dump is skipped while the budget
+    is overdrawn.
+
+    Args:
+        rate (float, optional): Default probability of dumping. Defaults to 1.0.
+        rates (Mapping[str | tuple[str, int], float] | None, optional): Probabilities of dumping by logger name, or by logger name and level. Defaults to None.
+        cpu_fraction (float | None, optional): Maximum fraction of the time to spend dumping, otherwise unlimited if None. Defaults to None.
+        window (float, optional): Number of seconds of budget that can be saved up when 'cpu_fraction' is set. Defaults to 10.0.
+        clock (Callable[[], float], optional): Monotonic clock in seconds. Defaults to `time.perf_counter`.
+        draw (Callable[[], float], optional): Random number generator in [0, 1). Defaults to `random.random`.
+
+    Raises:
+        ValueError: If a probability is not between 0 and 1, or the CPU fraction is not greater than 0 and at most 1.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        rates: Mapping[str | tuple[str, int], float] | None = None,
+        cpu_fraction: float | None = None,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.perf_counter,
+        draw: Callable[[], float] = random.random,
+    ) -> None:
+        rates = dict(rates or {})
+        for probability in (rate, *rates.values()):
+            if not 0.0 <= probability <= 1.0:
+                raise ValueError(f"Probability must be between 0 and 1: {probability!r}")
+        if cpu_fraction is not None and not 0.0 < cpu_fraction <= 1.0:
+            raise ValueError(
+                f"CPU fraction must be greater than 0 and at most 1: {cpu_fraction!r}"
+            )
+
+        self.rate = rate
+        self.rates = rates
+        self.cpu_fraction = cpu_fraction
+        self.window = window
+        self._clock = clock
+        self._draw = draw
+        #: Number of dumps that were skipped
+        self.skipped = 0
+        # Rules by logger name, as (level, probability) pairs, highest level first
+        self._rules: dict[str, list[tuple[int, float]]] = {}
+        for key, probability in rates.items():
+            name, level = (key, 0) if isinstance(key, str) else key
+            self._rules.setdefault(name, []).append((level, probability))
+        for rules in self._rules.values():
+            rules.sort(reverse=True)
+        # Resolved probabilities by logger name and level
+        self._cache: dict[tuple[str, int], float] = {}
+        self._budget = 0.0 if cpu_fraction is None else cpu_fraction * window
+        self._refilled = clock()
+        self._lock = threading.Lock()
+
+    def after_fork(self) -> None:
+        """Replace the Lock in a Forked Child, as Another Thread may have Held it"""
+        self._lock = threading.Lock()
+
+    def probability(self, name: str, level: int) -> float:
+        """Resolve the Probability of Dumping for a Logger and Level
+
+        Args:
+            name (str): Name of the logger.
+            level (int): Level of the record.
+
+        Returns:
+            float: Probability of the most specific rule, otherwise the default rate.
+        """
+        key = (name, level)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        probability = self.rate
+        while True:
+            rules = self._rules.get(name)
+            if rules is not None:
+                match = next((p for min_level, p in rules if level >= min_level), None)
+                if match is not None:
+                    probability = match
+                    break
+            if not name:
+                break
+            name = name.rpartition(".")[0]
+
+        self._cache[key] = probability
+        return probability
+
+    def sample(self, name: str, level: int) -> bool:
+        """Decide if the Stack should be Dumped
+
+        Args:
+            name (str): Name of the logger.
+            level (int): Level of the record.
+
+        Returns:
+            bool: True if the stack should be dumped, otherwise False if the dump was skipped.
+        """
+        probability = self.probability(name, level)
+        if probability < 1.0 and (probability <= 0.0 or self._draw() >= probability):
+            self.skipped += 1
+            return False
+
+        if self.cpu_fraction is not None and not self._within_budget():
+            self.skipped += 1
+            return False
+        return True
+
+    def _within_budget(self) -> bool:
+        """Refill the Budget and Check that it is not Overdrawn
+
+        Returns:
+            bool: True if the budget is not overdrawn.
+        """
+        now = self._clock()
+        with self._lock:
+            fraction = float(self.cpu_fraction or 0)
+            self._budget = min(
+                fraction * self.window,
+                self._budget + (now - self._refilled) * fraction,
+            )
+            self._refilled = now
+            return self._budget >= 0.0
+
+    def record(self, elapsed: float) -> None:
+        """Charge the Time a Dump Took to the Budget
+
+        Args:
+            elapsed (float): Number of seconds the dump took.
+        """
+        if self.cpu_fraction is not None:
+            with self._lock:
+                self._budget -= elapsed
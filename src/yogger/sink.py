@@ -0,0 +1,359 @@
+"""Write dumps to a single rotating file.
+
+This module contains a sink that keeps one file open for all dumps, rotating it by
+size and count in the style of `logging.handlers.RotatingFileHandler`.
+"""
+
+import atexit
+import io
+import os
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from typing import BinaryIO, Final, NamedTuple
+
+from .compress import check_codec, compressor
+from .structured import check_format, failure_marker
+
+#: How processes forked after configuring share dump files
+MULTIPROCESS_MODES: Final[tuple[str, ...]] = ("shard", "append", "collect")
+
+# Length of a record sent to a collector
+FRAME: Final[struct.Struct] = struct.Struct(">I")
+
+
+class DumpLocation(NamedTuple):
+    """Location of a Dump"""
+
+    #: Path of the file containing the dump
+    path: str
+    #: Offset of the record in the file, otherwise None if the dump is a file of its own or not written yet
+    offset: int | None = None
+    #: Identifier of the record in the file, otherwise None if the dump is a file of its own
+    record_id: str | None = None
+    #: Codec the dump is compressed with, otherwise None if not compressed
+    compression: str | None = None
+    #: Format of the dump ("text", "jsonl", or "binary")
+    format: str = "text"
+
+
+def shard_path(path: str, pid: int | None = None) -> str:
+    """Insert a Process ID into a Path, before the Extensions of its File Name
+
+    Args:
+        path (str): Path to insert the process ID into, e.g. "dumps.log.gz".
+        pid (int | None, optional): Process ID to insert, otherwise that of the current process if None. Defaults to None.
+
+    Returns:
+        str: Path with the process ID, e.g. "dumps.1234.log.gz".
+    """
+    if pid is None:
+        pid = os.getpid()
+    head, name = os.path.split(path)
+    stem, dot, extensions = name.partition(".")
+    if not stem:
+        # Hidden file without extensions
+        return f"{path}.{pid}"
+    return os.path.join(head, f"{stem}.{pid}{dot}{extensions}")
+
+
+def append_atomic(fp: BinaryIO, data: bytes) -> None:
+    """Append Data to an Unbuffered File Opened for Appending with a Single Write
+
+    With O_APPEND, every write is appended at the end of the file as it is when
+    written, so processes appending to the same file do not interleave.
+
+    Args:
+        fp (BinaryIO): Unbuffered file opened with mode "ab".
+        data (bytes): Data to append.
+    """
+    view = memoryview(data)
+    while view:
+        # Only loops if interrupted, e.g. by a full disk
+        view = view[fp.write(view) :]
+
+
+class DumpSink:
+    """Single Rotating File for Dumps
+
+    Dumps are appended to one open file as records, each starting with a
+    "--- dump <id> ---" line. Before a record is written, the file is rotated if it
+    reached 'max_bytes': "path" is renamed to "path.1", "path.1" to "path.2", and so
+    on, up to 'backup_count' files. Records are never split, so a file can exceed
+    'max_bytes' by one record. The oldest backups are removed while all files
+    together exceed 'max_total_bytes'.
+
+    If compressed, every record is a compressed stream of its own that starts at its
+    offset, and sizes are those of the compressed files. In the structured formats,
+    records start without a line, as every structured record carries the identifier.
+
+    Records are streamed to the file as they are formatted. For several processes
+    appending to the same file, records are instead formatted in memory and appended
+    with a single write ('atomic'), or sent to a collector process that appends them
+    ('collector', see `yogger.collector.DumpCollector`). Rotation by several processes
+    is best effort: a process that finds the file rotated by another reopens it.
+
+    Args:
+        path (str): Path of the file.
+        max_bytes (int, optional): Size in bytes at which the file is rotated. Defaults to 10 MiB.
+        backup_count (int, optional): Maximum number of rotated files to keep. Defaults to 5.
+        max_total_bytes (int | None, optional): Maximum size in bytes of all files together, otherwise only limited by the count if None. Defaults to None.
+        compression (str | None, optional): Codec to compress the records with ("gzip", "lzma", or "zstd"), otherwise not compressed if None. Defaults to None.
+        format (str, optional): Format of the records ("text", "jsonl", or "binary"). Defaults to "text".
+        per_process (bool, optional): Write to a file of each process's own, with the process ID inserted into the path. Defaults to False.
+        atomic (bool, optional): Append every record with a single write to a file opened with O_APPEND. Defaults to False.
+        collector (str | None, optional): Address of a collector to send the records to instead of writing them, otherwise write them if None. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        max_total_bytes: int | None = None,
+        compression: str | None = None,
+        format: str = "text",
+        per_process: bool = False,
+        atomic: bool = False,
+        collector: str | None = None,
+    ) -> None:
+        check_codec(compression)
+        check_format(format)
+        self.base_path = path
+        self.per_process = per_process
+        self.path = shard_path(path) if per_process else path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_total_bytes = max_total_bytes
+        self.compression = compression
+        self.format = format
+        self.atomic = atomic
+        self.collector = collector
+        self._fp: BinaryIO | None = None
+        self._sock: socket.socket | None = None
+        self._num_records = 0
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def reserve_id(self) -> str:
+        """Reserve the Identifier of a Record to Write Later
+
+        Returns:
+            str: Identifier of the record, unique across processes appending to the file.
+        """
+        with self._lock:
+            self._num_records += 1
+            return f"{os.getpid()}-{self._num_records}"
+
+    def write(
+        self,
+        write_dump: Callable[[Callable[[str | bytes], object]], None],
+        record_id: str | None = None,
+    ) -> DumpLocation:
+        """Write a Record
+
+        Args:
+            write_dump (Callable[[Callable[[str | bytes], object]], None]): Function that writes the dump using the write function it is called with, which encodes strings as UTF-8.
+            record_id (str | None, optional): Identifier reserved with `reserve_id`, otherwise reserve one if None. Defaults to None.
+
+        Returns:
+            DumpLocation: Location of the record.
+        """
+        if record_id is None:
+            record_id = self.reserve_id()
+
+        if self.atomic or self.collector is not None:
+            buffer = io.BytesIO()
+            try:
+                self._write_record(buffer, write_dump, record_id)
+            finally:
+                # Even if the dump failed, as the marker is part of the record
+                if self.collector is None:
+                    location = self.append(buffer.getvalue(), record_id)
+                else:
+                    self._send(buffer.getvalue())
+                    location = DumpLocation(
+                        self.path, None, record_id, self.compression, self.format
+                    )
+            return location
+
+        with self._lock:
+            fp = self._open()
+            if fp.tell() >= self.max_bytes:
+                self._rotate()
+                fp = self._open()
+
+            offset = fp.tell()
+            try:
+                self._write_record(fp, write_dump, record_id)
+            finally:
+                fp.flush()
+
+        return DumpLocation(
+            self.path, offset, record_id, self.compression, self.format
+        )
+
+    def append(self, data: bytes, record_id: str | None = None) -> DumpLocation:
+        """Append a Formatted Record with a Single Write
+
+        Args:
+            data (bytes): Record to append, including its header and compression.
+            record_id (str | None, optional): Identifier of the record. Defaults to None.
+
+        Returns:
+            DumpLocation: Location of the record.
+        """
+        with self._lock:
+            fp = self._open(buffering=0)
+            if not self._is_current(fp):
+                # Rotated by another process
+                fp.close()
+                self._fp = None
+                fp = self._open(buffering=0)
+            if os.fstat(fp.fileno()).st_size >= self.max_bytes:
+                self._rotate()
+                fp = self._open(buffering=0)
+
+            append_atomic(fp, data)
+            # Appended at the end as it was when written, not as it is now
+            offset = fp.tell() - len(data)
+
+        return DumpLocation(
+            self.path, offset, record_id, self.compression, self.format
+        )
+
+    def after_fork(self) -> None:
+        """Re-Initialize the Sink in a Forked Child
+
+        The file and connection of the parent are closed, and the lock (which another
+        thread of the parent may have held) is replaced. With 'per_process=True', the
+        child writes to a file of its own.
+        """
+        self._lock = threading.Lock()
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self.per_process:
+            self.path = shard_path(self.base_path)
+
+    def _write_record(
+        self,
+        fp: BinaryIO,
+        write_dump: Callable[[Callable[[str | bytes], object]], None],
+        record_id: str,
+    ) -> None:
+        """Write a Record to a File Object, Compressing it if Needed
+
+        Args:
+            fp (BinaryIO): File object to write to.
+            write_dump (Callable[[Callable[[str | bytes], object]], None]): Function that writes the dump.
+            record_id (str): Identifier of the record.
+        """
+        out = fp if self.compression is None else compressor(fp, self.compression)
+        write = lambda data: out.write(
+            data.encode("utf-8") if isinstance(data, str) else data
+        )
+        text = self.format == "text"
+        if text:
+            write(f"--- dump {record_id} ---\n")
+        try:
+            write_dump(write)
+            if text:
+                write("\n")
+        except Exception as exc:
+            # The location may already be logged, so leave a trace of it there
+            write(failure_marker(exc, self.format, record_id))
+            raise
+        finally:
+            if out is not fp:
+                out.close()
+
+    def _send(self, data: bytes) -> None:
+        """Send a Formatted Record to the Collector
+
+        Args:
+            data (bytes): Record to send.
+        """
+        with self._lock:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sock.connect(self.collector)
+            self._sock.sendall(FRAME.pack(len(data)) + data)
+
+    def close(self) -> None:
+        """Close the File and the Connection to the Collector"""
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+        atexit.unregister(self.close)
+
+    def _open(self, buffering: int = -1) -> BinaryIO:
+        """Open the File if not Already Open
+
+        Args:
+            buffering (int, optional): Buffering policy of `open` if not already open, 0 for unbuffered. Defaults to -1.
+
+        Returns:
+            BinaryIO: File positioned at its end.
+        """
+        if self._fp is None:
+            self._fp = open(self.path, mode="ab", buffering=buffering)
+        return self._fp
+
+    def _is_current(self, fp: BinaryIO) -> bool:
+        """Check if an Open File is Still the File at the Path
+
+        Args:
+            fp (BinaryIO): Open file to check.
+
+        Returns:
+            bool: True if the path was not rotated or removed since it was opened.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(fp.fileno())
+        return (stat.st_dev, stat.st_ino) == (opened.st_dev, opened.st_ino)
+
+    def _rotate(self) -> None:
+        """Rotate the Files and Enforce the Total Size"""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+        if self.max_total_bytes is not None:
+            self._remove_oldest()
+
+    def _remove_oldest(self) -> None:
+        """Remove the Oldest Backups while the Files Exceed the Total Size"""
+        backups = []
+        for i in range(1, self.backup_count + 1):
+            backup = f"{self.path}.{i}"
+            try:
+                backups.append((backup, os.path.getsize(backup)))
+            except OSError:
+                break
+
+        total = sum(size for _, size in backups)
+        while backups and total > self.max_total_bytes:
+            backup, size = backups.pop()
+            os.remove(backup)
+            total -= size
@@ -0,0 +1,246 @@
+"""Create structured representations of interpreter stacks.
+
+This module contains a structured alternative to the text format, with one record per
+frame that can be indexed and searched without parsing the text:
+
+- "jsonl": Newline-delimited JSON.
+- "binary": Each record is the length of its UTF-8 JSON encoding (4 bytes, big-endian) followed by the encoding.
+
+Records are read and printed as newline-delimited JSON with:
+
+    python -m yogger.structured PATH
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, BinaryIO, Final
+
+from .capture import _resolver, select_frames
+from .compress import iter_dump
+from .filters import filter_variables
+from .metrics import RESOLVE, current_stats
+from .pformat import DEFAULT, LimitArg, Writer, _scalar_repr
+
+#: Supported dump formats
+FORMATS: Final[tuple[str, ...]] = ("text", "jsonl", "binary")
+
+#: File name extensions by format
+FORMAT_EXTENSIONS: Final[dict[str, str]] = {
+    "text": "",
+    "jsonl": ".jsonl",
+    "binary": ".bin",
+}
+
+_LENGTH: Final[struct.Struct] = struct.Struct(">I")
+
+
+def check_format(format: str) -> None:
+    """Check if a Dump Format is Supported
+
+    Args:
+        format (str): Format to check.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported dump format: {format!r}")
+
+
+def _typed_repr(w: Writer, value: Any) -> dict[str, str]:
+    """Create the Type and Truncated Representation of a Value
+
+    Args:
+        w (Writer): Writer with the limits to apply.
+        value (Any): Value to represent.
+
+    Returns:
+        dict[str, str]: Type name and representation of the value.
+    """
+    try:
+        value_repr = _scalar_repr(w, value)
+    except Exception as err:
+        # E.g. mutated while dumping in the background
+        value_repr = f"<changed during dump: {type(err).__name__}: {err}>"
+    return {
+        "type": f"{type(value).__module__}.{type(value).__name__}",
+        "repr": value_repr,
+    }
+
+
+def iter_records(
+    stack: Sequence,
+    *,
+    err: Exception | None = None,
+    package_name: str | None = None,
+    dump_id: str | None = None,
+    max_length: LimitArg = DEFAULT,
+) -> Iterator[dict[str, Any]]:
+    """Create Structured Records of the Frames in a Stack
+
+    Every selected frame is a record with its file, line, function, module, and locals
+    (and the attributes of 'self') as typed single line representations, truncated to
+    'max_length'. Values are not expanded, so the other limits do not apply. The
+    exception, if any, is the last record.
+
+    Args:
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of frames to represent.
+        err (Exception | None, optional): Exception that was raised. Defaults to None.
+        package_name (str | None, optional): Name of the package to dump from the stack, otherwise non-exclusive if set to None. Defaults to None.
+        dump_id (str | None, optional): Identifier of the dump to add to every record. Defaults to None.
+        max_length (int | None, optional): Maximum number of characters per representation. Defaults to DEFAULT.
+
+    Yields:
+        dict[str, Any]: Records, outermost frame first.
+    """
+    w = Writer(max_length=max_length, max_bytes=None)
+    stats = current_stats()
+    if stats is None:
+        frame_records: Iterable = select_frames(stack, package_name)
+    else:
+        start = time.perf_counter_ns()
+        frame_records = list(select_frames(stack, package_name))
+        stats.add(RESOLVE, time.perf_counter_ns() - start)
+
+    for frame_record in frame_records:
+        frame = frame_record[0]
+        module = _resolver.module(frame)
+        locals_ = frame.f_locals
+        variables = filter_variables(locals_)
+        record: dict[str, Any] = {
+            "type": "frame",
+            "file": frame_record.filename,
+            "line": frame_record.lineno,
+            "function": frame_record.function,
+            "module": None if module is None else module.__name__,
+            "locals": {
+                name: _typed_repr(w, value) for name, value in variables.items()
+            },
+        }
+        for label in ("thread", "task"):
+            name = getattr(frame_record, label, None)
+            if name is not None:
+                record[label] = name
+        if ("self" in locals_) and hasattr(locals_["self"], "__dict__"):
+            attributes = filter_variables(vars(locals_["self"]))
+            record["attributes"] = {
+                name: _typed_repr(w, value) for name, value in list(attributes.items())
+            }
+        if stats is not None:
+            stats.add_frames(1, len(variables) + len(record.get("attributes", ())))
+        if dump_id is not None:
+            record["dump"] = dump_id
+        yield record
+
+    if err is not None:
+        record = {
+            "type": "exception",
+            "exception": f"{type(err).__module__}.{type(err).__name__}",
+            "message": str(err),
+            "args": repr(err.args),
+        }
+        if dump_id is not None:
+            record["dump"] = dump_id
+        yield record
+
+
+def encode_record(record: dict[str, Any], format: str) -> str | bytes:
+    """Encode a Record
+
+    Args:
+        record (dict[str, Any]): Record to encode.
+        format (str): Format to encode with ("jsonl" or "binary").
+
+    Returns:
+        str | bytes: Line of JSON for "jsonl", otherwise the length-prefixed bytes for "binary".
+    """
+    text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    if format == "jsonl":
+        return text + "\n"
+    data = text.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def failure_marker(
+    exc: Exception,
+    format: str,
+    dump_id: str | None = None,
+) -> str | bytes:
+    """Create a Marker for a Dump that Failed while it was Written
+
+    Args:
+        exc (Exception): Exception that was raised while writing the dump.
+        format (str): Format of the dump.
+        dump_id (str | None, optional): Identifier of the dump to add to the record. Defaults to None.
+
+    Returns:
+        str | bytes: Line of text for "text", otherwise an "error" record.
+    """
+    if format == "text":
+        return f"\n<dump failed: {type(exc).__name__}: {exc}>\n"
+    record = {"type": "error", "error": f"{type(exc).__name__}: {exc}"}
+    if dump_id is not None:
+        record["dump"] = dump_id
+    return encode_record(record, format)
+
+
+def read_records(fp: BinaryIO) -> Iterator[dict[str, Any]]:
+    """Read the Records of a Structured Dump, Decompressing it if Needed
+
+    Args:
+        fp (BinaryIO): File object to read, in either structured format.
+
+    Yields:
+        dict[str, Any]: Records.
+    """
+    buffer = b""
+    binary: bool | None = None
+    for chunk in iter_dump(fp):
+        buffer += chunk
+        if binary is None and buffer:
+            # JSON records start with "{", lengths with a zero byte (below 16 MiB)
+            binary = not buffer.startswith(b"{")
+        while True:
+            if binary:
+                if len(buffer) < _LENGTH.size:
+                    break
+                (size,) = _LENGTH.unpack_from(buffer)
+                end = _LENGTH.size + size
+                if len(buffer) < end:
+                    break
+                yield json.loads(buffer[_LENGTH.size : end])
+                buffer = buffer[end:]
+            else:
+                line, sep, rest = buffer.partition(b"\n")
+                if not sep:
+                    break
+                if line.strip():
+                    yield json.loads(line)
+                buffer = rest
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the Records of a Structured Dump as Newline-Delimited JSON
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, otherwise use `sys.argv` if None. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m yogger.structured",
+        description="Print the records of a structured dump as newline-delimited JSON.",
+    )
+    parser.add_argument("path", help="Path of the dump file.")
+    args = parser.parse_args(argv)
+
+    with open(args.path, mode="rb") as rf:
+        for record in read_records(rf):
+            sys.stdout.write(encode_record(record, "jsonl"))
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Capture the stacks of asyncio tasks.
+
+This module contains alternatives to the thread stack for asyncio code: within a task,
+the thread stack only shows the running coroutines, not the tasks awaiting them, and
+`asyncio.Task.get_stack` only shows the outermost frame of a suspended task.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from types import FrameType
+
+from .capture import FrameRecord
+
+
+def await_chain(coro: object) -> list[FrameType]:
+    """Walk the Await Chain of a Suspended Coroutine
+
+    Args:
+        coro (object): Coroutine, generator, or asynchronous generator to walk.
+
+    Returns:
+        list[FrameType]: Frames of the coroutine and the coroutines it awaits, outermost first.
+    """
+    frames = []
+    while coro is not None:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "gi_frame", None)
+            or getattr(coro, "ag_frame", None)
+        )
+        if frame is None:
+            # Finished, or not a coroutine (e.g. the iterator of a future)
+            break
+        frames.append(frame)
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    return frames
+
+
+def task_stack(task: asyncio.Task) -> list[FrameRecord]:
+    """Capture the Stack of a Suspended Task
+
+    Args:
+        task (asyncio.Task): Task to capture.
+
+    Returns:
+        list[FrameRecord]: Frame records of the await chain of the task, outermost first.
+    """
+    name = task.get_name()
+    return [
+        FrameRecord(
+            frame, frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name, name
+        )
+        for frame in await_chain(task.get_coro())
+    ]
+
+
+def _awaiting(
+    task: asyncio.Task,
+    tasks: Sequence[asyncio.Task],
+) -> asyncio.Task | None:
+    """Find the Task Awaiting a Task
+
+    Relies on the future a task waits on ('_fut_waiter'), which is the awaited task
+    itself, or a future gathering it.
+
+    Args:
+        task (asyncio.Task): Awaited task.
+        tasks (Sequence[asyncio.Task]): Tasks to search.
+
+    Returns:
+        asyncio.Task | None: Task awaiting the task, otherwise None if not found.
+    """
+    for other in tasks:
+        waiter = getattr(other, "_fut_waiter", None)
+        if waiter is not None and (
+            waiter is task or task in getattr(waiter, "_children", ())
+        ):
+            return other
+    return None
+
+
+def with_tasks(stack: Sequence, *, all_tasks: bool = False) -> list:
+    """Extend the Stack of the Current Task with the Stacks of Other Tasks
+
+    The stacks of the tasks awaiting the current task (directly, or through
+    `asyncio.gather`) are prepended, outermost first. Frames are labeled with the name
+    of their task. Outside of a task, the stack is returned as it is.
+
+    Args:
+        stack (Sequence[inspect.FrameInfo | FrameRecord]): Stack of the current task, e.g. from `capture_stack` or `capture_trace`.
+        all_tasks (bool, optional): Also append the stacks of all other pending tasks. Defaults to False.
+
+    Returns:
+        list[inspect.FrameInfo | FrameRecord]: Frame records, outermost first.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return list(stack)
+    current = asyncio.current_task(loop)
+    if current is None:
+        return list(stack)
+
+    tasks = list(asyncio.all_tasks(loop))
+    chain = [current]
+    while True:
+        parent = _awaiting(chain[-1], tasks)
+        if parent is None or parent in chain:
+            break
+        chain.append(parent)
+
+    records: list = []
+    for parent in reversed(chain[1:]):
+        records.extend(task_stack(parent))
+    name = current.get_name()
+    records.extend(
+        FrameRecord(
+            frame_record[0],
+            frame_record.filename,
+            frame_record.lineno,
+            frame_record.function,
+            name,
+        )
+        for frame_record in stack
+    )
+    if all_tasks:
+        for other in sorted(tasks, key=lambda task: task.get_name()):
+            if other not in chain:
+                records.extend(task_stack(other))
+    return records
@@ -0,0 +1,147 @@
+import os
+import threading
+import unittest
+from tempfile import mkstemp as tempfile_mkstemp
+from unittest import mock
+
+from yogger import base
+from yogger.background import DumpWorker
+from yogger.capture import capture_stack
+
+
+class DumpWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.results = []
+
+    def blocked_job(self):
+        self.started.set()
+        self.release.wait()
+        self.results.append("blocked")
+
+    def start_blocked(self, worker):
+        worker.submit(self.blocked_job)
+        self.assertTrue(self.started.wait(timeout=5))
+        # Fill the queue
+        self.assertTrue(worker.submit(lambda: None))
+
+    def test_flush(self):
+        worker = DumpWorker()
+        for i in range(10):
+            self.assertTrue(worker.submit(lambda i=i: self.results.append(i)))
+        self.assertTrue(worker.flush(timeout=5))
+        self.assertEqual(self.results, list(range(10)))
+        worker.close()
+
+    def test_overflow_drop(self):
+        worker = DumpWorker(maxsize=1, overflow="drop")
+        self.start_blocked(worker)
+        self.assertFalse(worker.submit(lambda: self.results.append("dropped")))
+        self.assertEqual(worker.dropped, 1)
+        self.release.set()
+        worker.close()
+        self.assertNotIn("dropped", self.results)
+
+    def test_overflow_sample(self):
+        worker = DumpWorker(maxsize=1, overflow="sample", sample_every=2)
+        self.start_blocked(worker)
+        self.assertFalse(worker.submit(lambda: None))
+        # The second overflowing job blocks until there is room
+        threading.Timer(0.1, self.release.set).start()
+        self.assertTrue(worker.submit(lambda: None))
+        self.assertEqual(worker.dropped, 1)
+        worker.close()
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            DumpWorker(overflow="invalid")
+
+    def test_close_runs_pending_jobs(self):
+        worker = DumpWorker()
+        worker.submit(self.blocked_job)
+        self.release.set()
+        worker.close()
+        self.assertEqual(self.results, ["blocked"])
+        self.assertFalse(worker.submit(lambda: None))
+
+    def test_job_exception(self):
+        worker = DumpWorker()
+        worker.submit(lambda: 1 / 0)
+        worker.submit(lambda: self.results.append("after"))
+        worker.close()
+        self.assertEqual(self.results, ["after"])
+
+
+class AsyncDumpTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_async=True,
+            dump_queue_size=1,
+            remove_handlers=False,
+        )
+        self.worker = base._global_dump_worker
+
+    def test_dump_written_after_flush(self):
+        my_variable = {"a": 0}
+        path = base._dump(stack=capture_stack(), err=None, dump_path=None).path
+        self.addCleanup(os.remove, path)
+        self.assertTrue(self.worker.flush(timeout=5))
+        with open(path, encoding="utf-8") as rf:
+            self.assertIn("my_variable['a'] = 0", rf.read())
+
+    def test_dropped_dump(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        self.worker.submit(lambda: (started.set(), release.wait()))
+        self.assertTrue(started.wait(timeout=5))
+        self.worker.submit(lambda: None)
+
+        paths = []
+
+        def mkstemp(*args, **kwargs):
+            fd, path = tempfile_mkstemp(*args, **kwargs)
+            paths.append(path)
+            return fd, path
+
+        with mock.patch("tempfile.mkstemp", mkstemp):
+            path = base._dump(stack=capture_stack(), err=None, dump_path=None)
+        self.assertIsNone(path)
+        self.assertEqual(len(paths), 1)
+        self.assertFalse(os.path.exists(paths[0]))
+
+    def test_dump_on_exception_dropped(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        self.worker.submit(lambda: (started.set(), release.wait()))
+        self.assertTrue(started.wait(timeout=5))
+        self.worker.submit(lambda: None)
+
+        with mock.patch.object(base, "_logger") as logger:
+            with self.assertRaises(ValueError):
+                with base.dump_on_exception():
+                    raise ValueError("test")
+        logger.fatal.assert_not_called()
+
+    def test_mutated_during_dump(self):
+        class Mutating(dict):
+            def items(self):
+                for item in super().items():
+                    self[len(self)] = None
+                    yield item
+
+        my_variable = Mutating(a=0)
+        path = base._dump(stack=capture_stack(), err=None, dump_path=None).path
+        self.addCleanup(os.remove, path)
+        self.assertTrue(self.worker.flush(timeout=5))
+        with open(path, encoding="utf-8") as rf:
+            self.assertIn(
+                "<changed during dump: RuntimeError: "
+                "dictionary changed size during iteration>",
+                rf.read(),
+            )
@@ -0,0 +1,99 @@
+import io
+import unittest
+
+from yogger.base import dump, dumps
+from yogger.capture import capture_stack
+
+
+class Example:
+    def __init__(self):
+        self.value = 1
+
+    def stack(self):
+        return capture_stack()
+
+
+class DumpsTest(unittest.TestCase):
+    def test_dumps_locals(self):
+        my_variable = {"a": [1, (2, 3)]}
+        result = dumps(capture_stack(), package_name=__name__)
+        self.assertIn(
+            "\n".join(
+                (
+                    "  my_variable <class 'dict'> = my_variable = <builtins.dict>",
+                    "    \\",
+                    "      my_variable['a'] = <builtins.list>",
+                    "        my_variable['a'][0] = 1",
+                    "        my_variable['a'][1] = (2, 3)",
+                )
+            ),
+            result,
+        )
+        self.assertFalse(result.endswith("\n"))
+
+    def test_dumps_exception(self):
+        err = ValueError("test")
+        result = dumps(capture_stack(), err=err, package_name=__name__)
+        self.assertTrue(
+            result.endswith(
+                "\n\nException:\n  builtins.ValueError: test\n  args: ('test',)"
+            )
+        )
+
+    def test_dumps_object_dict(self):
+        result = dumps(Example().stack(), package_name=__name__)
+        self.assertRegex(result, r"Object dict:\nself.__dict__ = [^\0]*\n\nLocals from file")
+        self.assertTrue(
+            result.endswith(
+                "Object dict:\n"
+                "self.__dict__ = <builtins.dict>\n"
+                "  self.__dict__['value'] = 1"
+            )
+        )
+
+    def test_dumps_object_dict_limits(self):
+        example = Example()
+        example.value = "a" * 100
+        result = dumps(example.stack(), package_name=__name__, max_length=4)
+        self.assertTrue(
+            result.endswith("self.__dict__['value'] = 'aaaa'... 96 more characters")
+        )
+
+    def test_dumps_exception_max_bytes(self):
+        my_variable = "a" * 1000
+        err = ValueError("test")
+        result = dumps(capture_stack(), err=err, package_name=__name__, max_bytes=200)
+        self.assertIn("... output truncated at ", result)
+        self.assertTrue(
+            result.endswith(
+                "\n\nException:\n  builtins.ValueError: test\n  args: ('test',)"
+            )
+        )
+        self.assertLessEqual(len(result.split("... output truncated at ")[0]), 200)
+
+    def test_dump_text(self):
+        stack = Example().stack()[-1:]
+        fp = io.StringIO()
+        dump(fp, stack, package_name=__name__)
+        self.assertEqual(fp.getvalue(), dumps(stack, package_name=__name__) + "\n")
+
+    def test_dump_bytes(self):
+        stack = Example().stack()[-1:]
+        fp = io.BytesIO()
+        dump(fp, stack, package_name=__name__)
+        self.assertEqual(
+            fp.getvalue().decode("utf-8"),
+            dumps(stack, package_name=__name__) + "\n",
+        )
+
+    def test_dumps_shared_reference(self):
+        def inner(arg):
+            return capture_stack()
+
+        shared = dict.fromkeys("abcdefgh", 0)
+        result = dumps(inner(shared)[-2:], package_name=__name__)
+        self.assertRegex(
+            result,
+            r"  arg <class 'dict'> = arg = <builtins.dict> \.\.\. same object as shared "
+            r"\(line \d+, in test_dumps_shared_reference\)",
+        )
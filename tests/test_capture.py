@@ -0,0 +1,128 @@
+import inspect
+import sys
+import unittest
+
+from yogger.capture import (
+    FrameRecord,
+    ModuleResolver,
+    capture_stack,
+    capture_trace,
+)
+
+
+def _inner(depth=0, package_name=None):
+    return capture_stack(depth, package_name=package_name)
+
+
+class CaptureTest(unittest.TestCase):
+    def test_capture_stack_matches_inspect(self):
+        expected = inspect.stack()[::-1]
+        records = capture_stack()
+        self.assertEqual(
+            [(r.filename, r.function) for r in records],
+            [(f.filename, f.function) for f in expected],
+        )
+        self.assertEqual(records[-1].lineno, expected[-1].lineno + 1)
+
+    def test_capture_stack_depth(self):
+        records = _inner(1)
+        self.assertEqual(records[-1].function, "test_capture_stack_depth")
+
+    def test_capture_stack_record_fields(self):
+        record = capture_stack()[-1]
+        self.assertIsInstance(record, FrameRecord)
+        self.assertIs(record[0], record.frame)
+        self.assertIn("self", record.frame.f_locals)
+
+    def test_capture_stack_package_name(self):
+        records = _inner(package_name=__name__)
+        self.assertEqual(
+            [r.function for r in records],
+            ["test_capture_stack_package_name", "_inner"],
+        )
+
+    def test_capture_stack_unknown_package_name(self):
+        self.assertEqual(_inner(package_name="not_a_package"), [])
+
+    def test_capture_trace(self):
+        try:
+            _raise()
+        except ValueError:
+            tb = sys.exc_info()[2]
+            records = capture_trace(tb)
+            expected = inspect.trace()
+
+        self.assertEqual(
+            [(r.filename, r.lineno, r.function) for r in records],
+            [(f.filename, f.lineno, f.function) for f in expected],
+        )
+
+    def test_capture_trace_package_name(self):
+        try:
+            _raise()
+        except ValueError:
+            records = capture_trace(sys.exc_info()[2], package_name="not_a_package")
+
+        self.assertEqual(records, [])
+
+    def test_capture_trace_none(self):
+        self.assertEqual(capture_trace(None), [])
+
+
+class ModuleResolverTest(unittest.TestCase):
+    def test_module(self):
+        resolver = ModuleResolver()
+        self.assertIs(resolver.module(sys._getframe()), sys.modules[__name__])
+
+    def test_module_copied_namespace(self):
+        resolver = ModuleResolver()
+        namespace = dict(globals())
+        frame = eval(compile("sys._getframe()", __file__, "eval"), namespace)
+        self.assertIs(resolver.module(frame), sys.modules[__name__])
+
+    def test_in_package(self):
+        resolver = ModuleResolver()
+        frame = sys._getframe()
+        self.assertTrue(resolver.in_package(frame, __name__))
+        self.assertFalse(resolver.in_package(frame, __name__[:-1]))
+        self.assertFalse(resolver.in_package(frame, "not_a_package"))
+
+    def test_in_package_moduleless(self):
+        resolver = ModuleResolver()
+        frame = eval("sys._getframe()", {"sys": sys})
+        self.assertIsNone(resolver.in_package(frame, __name__))
+
+    def test_maxsize(self):
+        resolver = ModuleResolver(maxsize=1)
+        resolver.in_package(sys._getframe(), "a")
+        resolver.in_package(sys._getframe(), "b")
+        self.assertEqual(len(resolver._packages_by_code), 1)
+
+    def test_invalidated_on_import(self):
+        resolver = ModuleResolver()
+        resolver.in_package(sys._getframe(), "a")
+        sys.modules["_yogger_test_module"] = sys.modules[__name__]
+        try:
+            resolver.in_package(sys._getframe(), "b")
+        finally:
+            del sys.modules["_yogger_test_module"]
+        self.assertEqual(len(resolver._packages_by_code), 1)
+
+    def test_invalidated_on_replace(self):
+        resolver = ModuleResolver()
+        namespace = dict(globals())
+        frame = eval(compile("sys._getframe()", __file__, "eval"), namespace)
+        self.assertTrue(resolver.in_package(frame, __name__))
+        module = sys.modules[__name__]
+        replacement = type(module)("_yogger_replacement")
+        replacement.__file__ = module.__file__
+        # Same number of modules, but a different one registered under the name
+        sys.modules[__name__] = replacement
+        try:
+            self.assertIsNot(resolver.module(frame), module)
+        finally:
+            sys.modules[__name__] = module
+
+
+def _raise():
+    raise ValueError("test")
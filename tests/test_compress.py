@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.compat import HAS_ZSTANDARD_PACKAGE
+from yogger.compress import check_codec, compressor, iter_dump, main
+from yogger.sink import DumpSink
+
+
+def compress(codec, *chunks):
+    raw = io.BytesIO()
+    for chunk in chunks:
+        with compressor(raw, codec) as out:
+            out.write(chunk)
+    return raw.getvalue()
+
+
+class CompressTest(unittest.TestCase):
+    codecs = ["gzip", "lzma"] + (["zstd"] if HAS_ZSTANDARD_PACKAGE else [])
+
+    def test_round_trip(self):
+        for codec in self.codecs:
+            with self.subTest(codec=codec):
+                data = compress(codec, b"first\n", b"second\n")
+                self.assertEqual(
+                    b"".join(iter_dump(io.BytesIO(data), chunk_size=7)),
+                    b"first\nsecond\n",
+                )
+
+    def test_single(self):
+        data = compress("gzip", b"first\n", b"second\n")
+        self.assertEqual(
+            b"".join(iter_dump(io.BytesIO(data), single=True)),
+            b"first\n",
+        )
+
+    def test_uncompressed(self):
+        self.assertEqual(b"".join(iter_dump(io.BytesIO(b"plain\n"))), b"plain\n")
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            check_codec("invalid")
+        with self.assertRaises(ValueError):
+            with base.dump_on_exception(compression="invalid"):
+                pass
+
+    @unittest.skipIf(HAS_ZSTANDARD_PACKAGE, "zstandard is installed")
+    def test_zstd_not_installed(self):
+        with self.assertRaises(ModuleNotFoundError):
+            check_codec("zstd")
+
+
+class CompressedDumpTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log.gz")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+
+    def read(self, *args):
+        stdout = mock.Mock(buffer=io.BytesIO())
+        with mock.patch("sys.stdout", stdout):
+            main([*args, self.path])
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_dump_on_exception(self):
+        base.configure(__name__, dump_compression="gzip", remove_handlers=False)
+        my_variable = {"a": 0}
+        with mock.patch.object(base, "_logger") as logger:
+            with self.assertRaises(ValueError):
+                with base.dump_on_exception(self.path):
+                    raise ValueError("test")
+        self.assertIn("python -m yogger.compress", logger.fatal.call_args[0][0])
+        with open(self.path, "rb") as rf:
+            self.assertEqual(rf.read(2), b"\x1f\x8b")
+        contents = self.read()
+        self.assertIn("my_variable['a'] = 0", contents)
+        self.assertTrue(contents.endswith("args: ('test',)\n"))
+
+    def test_sink(self):
+        sink = DumpSink(self.path, compression="lzma")
+        self.addCleanup(sink.close)
+        sink.write(lambda write: write("first"))
+        location = sink.write(lambda write: write("second"))
+        self.assertEqual(
+            self.read("--offset", str(location.offset)),
+            f"--- dump {location.record_id} ---\nsecond\n",
+        )
+        self.assertEqual(self.read().count("--- dump "), 2)
@@ -0,0 +1,108 @@
+import io
+import json
+import socket
+import unittest
+
+import requests
+
+from yogger import base, pformat
+from yogger.filters import REDACTED, VariableFilter, _set_filter
+
+
+class VariableFilterTest(unittest.TestCase):
+    def test_filter(self):
+        variable_filter = VariableFilter(
+            exclude_names=["_*", "secret_*"],
+            exclude_types=[socket.socket],
+            max_size=1024,
+            redact_names=["*password*", "secret_key"],
+        )
+        with socket.socket() as sock:
+            variables = {
+                "a": 0,
+                "_private": 1,
+                "secret_token": "abc",
+                "secret_key": "abc",
+                "db_password": "abc",
+                "sock": sock,
+                "buffer": bytes(2048),
+            }
+            self.assertEqual(
+                dict(variable_filter.filter(variables.items())),
+                {"a": 0, "secret_key": REDACTED, "db_password": REDACTED},
+            )
+        # Decisions are cached
+        self.assertEqual(set(variable_filter._names), set(variables))
+
+    def test_include_names(self):
+        variable_filter = VariableFilter(include_names=["request*"])
+        variables = {"request": 0, "request_id": 1, "response": 2}
+        self.assertEqual(
+            list(variable_filter.filter(variables.items())),
+            [("request", 0), ("request_id", 1)],
+        )
+
+
+class FilteredDumpTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_filter=VariableFilter(
+                exclude_names=["unformatted"], redact_names=["token"]
+            ),
+            remove_handlers=False,
+        )
+
+    def test_dumps(self):
+        class Unformatted:
+            def __repr__(self):
+                raise AssertionError("Formatted an excluded variable")
+
+        class Client:
+            def __init__(self):
+                self.token = "abc"
+                self.unformatted = Unformatted()
+                self.url = "https://example.com"
+
+        def func(self, token, unformatted):
+            return base.capture_stack()
+
+        client = Client()
+        stack = func(client, "abc", Unformatted())
+        self.assertEqual(
+            base.dumps(stack[-1:]).splitlines(),
+            [
+                f'Locals from file "{__file__}", line {stack[-1].lineno}, in func:',
+                f"  self {type(client)} = self = {client!r}",
+                "  token <class 'yogger.filters.Redacted'> = token = <redacted>",
+                "",
+                "Object dict:",
+                "self.__dict__ = <builtins.dict>",
+                "  self.__dict__['token'] = <redacted>",
+                "  self.__dict__['url'] = 'https://example.com'",
+            ],
+        )
+
+        fp = io.StringIO()
+        base.dump(fp, stack[-1:], format="jsonl")
+        record = json.loads(fp.getvalue())
+        self.assertEqual(list(record["locals"]), ["self", "token"])
+        self.assertEqual(record["locals"]["token"]["repr"], "<redacted>")
+        self.assertEqual(list(record["attributes"]), ["token", "url"])
+
+    def test_requests_headers(self):
+        request = requests.Request(
+            "GET",
+            "https://example.com",
+            headers={"authorization": "Bearer abc", "Accept": "*/*"},
+        )
+        self.assertEqual(
+            pformat("request", request).splitlines()[-2:],
+            [
+                "    authorization = <redacted>",
+                "    Accept = _ = '*/*'",
+            ],
+        )
+        _set_filter(None)
+        self.assertIn("Bearer abc", pformat("request", request))
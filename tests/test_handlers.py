@@ -0,0 +1,90 @@
+import io
+import logging
+import logging.handlers
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.handlers import BatchQueueListener, DroppingQueueHandler
+
+
+class BatchQueueListenerTest(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.Logger(__name__, logging.DEBUG)
+        self.stream = io.StringIO()
+        self.stream_handler = logging.StreamHandler(self.stream)
+
+    def make_listener(self, maxsize=10, **kwargs):
+        queue_handler = DroppingQueueHandler(maxsize=maxsize)
+        self.logger.addHandler(queue_handler)
+        listener = BatchQueueListener(queue_handler, self.stream_handler, **kwargs)
+        self.addCleanup(listener.stop)
+        return listener
+
+    def test_single_write_per_batch(self):
+        listener = self.make_listener()
+        for i in range(5):
+            self.logger.info("record %d", i)
+        with mock.patch.object(self.stream, "write", wraps=self.stream.write) as write:
+            listener.start()
+            listener.stop()
+        write.assert_called_once()
+        self.assertEqual(
+            self.stream.getvalue(), "".join(f"record {i}\n" for i in range(5))
+        )
+
+    def test_batch_size(self):
+        listener = self.make_listener(batch_size=2)
+        for i in range(5):
+            self.logger.info("record %d", i)
+        with mock.patch.object(self.stream, "write", wraps=self.stream.write) as write:
+            listener.start()
+            listener.stop()
+        self.assertEqual(write.call_count, 3)
+
+    def test_dropped(self):
+        listener = self.make_listener(maxsize=2)
+        for i in range(5):
+            self.logger.info("record %d", i)
+        self.assertEqual(listener.queue_handler.dropped, 3)
+        listener.start()
+        listener.stop()
+        self.assertEqual(
+            self.stream.getvalue(),
+            "record 0\nrecord 1\nDropped 3 log records because the queue was full\n",
+        )
+
+    def test_handler_level(self):
+        self.stream_handler.setLevel(logging.WARNING)
+        other_handler = logging.handlers.BufferingHandler(capacity=10)
+        other_handler.setLevel(logging.INFO)
+        queue_handler = DroppingQueueHandler()
+        self.logger.addHandler(queue_handler)
+        listener = BatchQueueListener(queue_handler, self.stream_handler, other_handler)
+        self.logger.debug("debug")
+        self.logger.info("info")
+        self.logger.warning("warning")
+        listener.start()
+        listener.stop()
+        self.assertEqual(self.stream.getvalue(), "warning\n")
+        self.assertEqual(len(other_handler.buffer), 2)
+
+
+class AsyncHandlersTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+
+    def test_configure(self):
+        base.configure(__name__, async_handlers=True, remove_handlers=False)
+        listener = base._global_log_listener
+        root_logger = logging.getLogger()
+        self.assertIs(root_logger.handlers[-1], listener.queue_handler)
+        stream_handler = listener.handlers[0]
+        stream = io.StringIO()
+        stream_handler.setStream(stream)
+
+        logging.getLogger(__name__).warning("test")
+        base.configure(__name__, remove_handlers=False)
+        self.assertIsNone(base._global_log_listener)
+        self.assertNotIn(listener.queue_handler, root_logger.handlers)
+        self.assertIn(f"WARNING\33[0m  {__name__} ]  test\n", stream.getvalue())
@@ -0,0 +1,81 @@
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.capture import capture_stack
+from yogger.lazy import SnapshotBuffer
+
+
+class SnapshotBufferTest(unittest.TestCase):
+    def test_evicts_oldest(self):
+        buffer = SnapshotBuffer(maxsize=2)
+        ids = [buffer.add(capture_stack()) for _ in range(3)]
+        self.assertEqual(len(buffer), 2)
+        pending, evicted = buffer.drain()
+        self.assertEqual([dump.dump_id for dump in pending], ids[1:])
+        self.assertEqual(evicted, 1)
+        self.assertEqual(buffer.drain(), ([], 0))
+
+    def test_shallow_snapshot(self):
+        buffer = SnapshotBuffer()
+        my_list = [0]
+        my_int = 0
+        buffer.add(capture_stack())
+        my_list.append(1)
+        my_int = 1
+        (pending,), _ = buffer.drain()
+        locals_ = pending.stack[-1].frame.f_locals
+        self.assertEqual(locals_["my_list"], [0, 1])
+        self.assertEqual(locals_["my_int"], 0)
+        self.assertEqual(my_int, 1)
+
+
+class LazyDumpTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_locals=True,
+            dump_path=self.path,
+            dump_lazy=True,
+            remove_handlers=False,
+        )
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+        self.logger = base.Yogger(__name__)
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as rf:
+            return rf.read()
+
+    def test_flush_dumps(self):
+        my_variable = {"a": 0}
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            self.logger.warning("test")
+        self.assertIn("(lazy dump 1)", logs.output[1])
+        self.assertFalse(os.path.exists(self.path))
+
+        my_variable["a"] = 1
+        with mock.patch.object(base, "_logger") as logger:
+            locations = base.flush_dumps()
+        self.assertEqual([location.path for location in locations], [self.path])
+        self.assertIn("Lazy dump 1:", logger.log.call_args[0][1])
+        self.assertIn("my_variable['a'] = 1", self.read())
+        self.assertEqual(base.flush_dumps(), [])
+
+    def test_dump_on_exception_flushes(self):
+        my_variable = {"a": 0}
+        with self.assertLogs(self.logger, logging.WARNING):
+            self.logger.warning("test")
+        with mock.patch.object(base, "_logger"):
+            with self.assertRaises(ValueError):
+                with base.dump_on_exception():
+                    raise ValueError("test")
+        contents = self.read()
+        self.assertEqual(contents.count("my_variable['a'] = 0"), 2)
+        self.assertTrue(contents.endswith("args: ('test',)\n"))
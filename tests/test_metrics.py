@@ -0,0 +1,140 @@
+import gzip
+import logging
+import os
+import tempfile
+import unittest
+
+import yogger
+from yogger import base
+from yogger.metrics import CAPTURE, DumpStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class DumpStatsTest(unittest.TestCase):
+    def test_snapshot(self):
+        stats = DumpStats()
+        for elapsed_ns in (100, 200, 300, 5000):
+            stats.add(CAPTURE, elapsed_ns)
+        stats.add_frames(3, 10)
+        stats.add_dump(1000, 50, 4096)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["dumps"], 1)
+        self.assertEqual(snapshot["bytes_written"], 4096)
+        self.assertEqual(snapshot["frames"], 3)
+        self.assertEqual(snapshot["variables"], 10)
+        capture = snapshot["capture"]
+        self.assertEqual(capture["count"], 4)
+        self.assertEqual(capture["total_ns"], 5600)
+        self.assertEqual(capture["mean_ns"], 1400)
+        self.assertEqual(capture["max_ns"], 5000)
+        # Upper bounds of power-of-two buckets, capped at the maximum
+        self.assertEqual(capture["histogram"], {128: 1, 256: 1, 512: 1, 8192: 1})
+        self.assertEqual(capture["p50_ns"], 256)
+        self.assertEqual(capture["p99_ns"], 5000)
+        self.assertEqual(snapshot["format"]["total_ns"], 1000)
+        self.assertEqual(snapshot["write"]["total_ns"], 50)
+        self.assertEqual(snapshot["resolve"]["count"], 0)
+        self.assertEqual(snapshot["resolve"]["mean_ns"], 0)
+
+    def test_summary(self):
+        clock = FakeClock()
+        self.assertIsNone(DumpStats(clock=clock).summary())
+
+        stats = DumpStats(log_interval=60.0, clock=clock)
+        stats.add_dump(2_000_000, 1_000_000, 1024)
+        self.assertIsNone(stats.summary())
+        clock.now = 60 * 10**9
+        summary = stats.summary()
+        self.assertIn("Dumped 1 times (1,024 bytes", summary)
+        self.assertIn("format 2.000ms mean", summary)
+        # Not due again yet
+        self.assertIsNone(stats.summary())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DumpStats(log_interval=0)
+
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dump.log")
+        self.logger = base.Yogger(__name__)
+
+    def _configure(self, **kwargs):
+        base.configure(__name__, remove_handlers=False, **kwargs)
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+
+    def test_disabled(self):
+        self._configure(dump_locals=True, dump_path=self.path)
+        with self.assertLogs(self.logger, logging.WARNING):
+            self.logger.warning("test")
+        self.assertEqual(yogger.stats(), {})
+
+    def test_dump_locals(self):
+        self._configure(dump_locals=True, dump_path=self.path, dump_stats=True)
+        my_variable = 0
+        with self.assertLogs(self.logger, logging.WARNING):
+            self.logger.warning("test")
+
+        stats = yogger.stats()
+        self.assertEqual(stats["dumps"], 1)
+        self.assertEqual(stats["bytes_written"], os.path.getsize(self.path))
+        self.assertEqual(stats["frames"], 1)
+        self.assertGreaterEqual(stats["variables"], 2)
+        for phase in ("capture", "resolve", "format", "write"):
+            self.assertEqual(stats[phase]["count"], 1)
+            self.assertGreater(stats[phase]["total_ns"], 0)
+
+    def test_compressed(self):
+        self._configure(dump_path=self.path, dump_compression="gzip", dump_stats=True)
+        try:
+            raise ValueError("test")
+        except ValueError as err:
+            base._dump(stack=yogger.capture_stack(), err=err, dump_path=None)
+
+        with gzip.open(self.path, "rb") as rf:
+            content = rf.read()
+        stats = yogger.stats()
+        # Before compression
+        self.assertEqual(stats["bytes_written"], len(content))
+        self.assertEqual(stats["write"]["count"], 1)
+
+    def test_sink(self):
+        self._configure(
+            dump_locals=True,
+            dump_path=self.path,
+            dump_max_file_bytes=1 << 20,
+            dump_format="jsonl",
+            dump_stats=True,
+        )
+        with self.assertLogs(self.logger, logging.WARNING):
+            self.logger.warning("test")
+        base._global_dump_sink.close()
+
+        stats = yogger.stats()
+        self.assertEqual(stats["dumps"], 1)
+        self.assertEqual(stats["bytes_written"], os.path.getsize(self.path))
+        self.assertEqual(stats["frames"], 1)
+
+    def test_log_interval(self):
+        self._configure(dump_path=self.path, dump_stats=True, dump_stats_interval=1e-9)
+        with self.assertLogs(level=logging.INFO) as logs:
+            base._dump(stack=yogger.capture_stack(), err=None, dump_path=None)
+        # Summarized before the dump
+        self.assertIn(":Dumped 0 times (0 bytes", logs.output[0])
+        self.assertEqual(yogger.stats()["dumps"], 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            base.configure(__name__, dump_stats=True, dump_stats_interval=-1.0)
@@ -0,0 +1,103 @@
+import os
+import re
+import tempfile
+import unittest
+
+from yogger import base
+from yogger.capture import capture_stack
+from yogger.sink import shard_path
+
+
+def fork(child):
+    pid = os.fork()
+    if not pid:
+        code = 1
+        try:
+            code = 0 if child() else 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def wait(test, pids):
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        test.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+class ShardPathTest(unittest.TestCase):
+    def test_shard_path(self):
+        self.assertEqual(shard_path("/tmp/dumps.log.gz", 42), "/tmp/dumps.42.log.gz")
+        self.assertEqual(shard_path("/tmp/dumps", 42), "/tmp/dumps.42")
+        self.assertEqual(shard_path("/tmp/.dumps", 42), "/tmp/.dumps.42")
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+class MultiprocessTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+
+    def configure(self, **kwargs):
+        base.configure(
+            __name__,
+            dump_path=self.path,
+            dump_max_file_bytes=1024 * 1024 * 1024,
+            remove_handlers=False,
+            **kwargs,
+        )
+
+    def write_dumps(self, n=20):
+        # Larger than a pipe buffer, so interleaving writes would split it
+        my_variable = "x" * 100_000
+        for _ in range(n):
+            base._dump(stack=capture_stack(), err=None, dump_path=None)
+        return True
+
+    def assert_records(self, contents, n):
+        records = re.split(r"^--- dump \S+ ---\n", contents, flags=re.MULTILINE)
+        self.assertEqual(records[0], "")
+        self.assertEqual(len(records) - 1, n)
+        for record in records[1:]:
+            self.assertEqual(record.count(f"my_variable = '{'x' * 100_000}'\n"), 1)
+
+    def test_append(self):
+        self.configure(dump_multiprocess="append")
+        pids = [fork(self.write_dumps) for _ in range(2)]
+        self.write_dumps()
+        wait(self, pids)
+        with open(self.path, encoding="utf-8") as rf:
+            self.assert_records(rf.read(), 60)
+
+    def test_collect(self):
+        self.configure(dump_multiprocess="collect")
+        pids = [fork(self.write_dumps) for _ in range(2)]
+        wait(self, pids)
+        # Stops the collector after it received the dumps
+        base.configure(__name__, remove_handlers=False)
+        with open(self.path, encoding="utf-8") as rf:
+            self.assert_records(rf.read(), 40)
+
+    def test_shard(self):
+        self.configure(dump_multiprocess="shard")
+        pid = fork(lambda: self.write_dumps(1))
+        wait(self, [pid])
+        with open(shard_path(self.path, pid), encoding="utf-8") as rf:
+            self.assert_records(rf.read(), 1)
+        self.assertFalse(os.path.exists(shard_path(self.path)))
+
+    def test_reinit_after_fork(self):
+        self.configure(dump_async=True)
+        worker = base._global_dump_worker
+
+        def child():
+            self.assertIsNot(base._global_dump_worker, worker)
+            self.write_dumps(1)
+            return base._global_dump_worker.flush(timeout=5)
+
+        wait(self, [fork(child)])
+        with open(self.path, encoding="utf-8") as rf:
+            self.assert_records(rf.read(), 1)
@@ -1,11 +1,32 @@
+import abc
+import array
 import collections
 import dataclasses
+import gc
+import hashlib
+import importlib.util
+import io
+import math
 import unittest
 from itertools import product
 
 import requests
 
-from yogger.pformat import pformat
+from yogger.pformat import (
+    RESPONSE_CONTENT_LENGTH,
+    Limits,
+    _dispatch,
+    _dispatch_cache,
+    _registry,
+    _set_default_limits,
+    _write_dict,
+    _write_scalar,
+    pformat,
+    register_formatter,
+)
+
+HAS_NUMPY_PACKAGE = importlib.util.find_spec("numpy") is not None
+HAS_PANDAS_PACKAGE = importlib.util.find_spec("pandas") is not None
 
 
 class PformatTest(unittest.TestCase):
@@ -481,3 +502,459 @@ class PformatTest(unittest.TestCase):
                 )
             ),
         )
+
+
+class PformatResponseContentTest(unittest.TestCase):
+    def response(self, content_type, content):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = requests.structures.CaseInsensitiveDict(
+            {"Content-Type": content_type, "Content-Length": str(len(content))}
+        )
+        response.raw = io.BytesIO(content)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def test_not_read(self):
+        response = self.response("application/json", b'{"a": 0}')
+        self.assertEqual(
+            pformat("response", response).splitlines()[-1],
+            "  response.content = <not read, Content-Length: 8 bytes, encoding: utf-8>",
+        )
+        # The stream was left for the application
+        self.assertEqual(response.json(), {"a": 0})
+
+    def test_consumed(self):
+        response = self.response("application/json", b'{"a": 0}')
+        list(response.iter_content())
+        self.assertEqual(
+            pformat("response", response).splitlines()[-1],
+            "  response.content = <consumed, Content-Length: 8 bytes, encoding: utf-8>",
+        )
+
+    def test_text_prefix(self):
+        response = self.response("text/plain", b"a" * (RESPONSE_CONTENT_LENGTH + 10))
+        response.content
+        self.assertEqual(
+            pformat("response", response).splitlines()[-1],
+            f"  response.content = _ = b'{'a' * RESPONSE_CONTENT_LENGTH}'... 10 more bytes",
+        )
+        self.assertEqual(
+            pformat("response", response, max_length=3).splitlines()[-1],
+            "  response.content = _ = b'aaa'... 1,031 more bytes",
+        )
+
+    def test_binary(self):
+        content = bytes(range(256)) * 10
+        response = self.response("application/octet-stream", content)
+        response.content
+        self.assertEqual(
+            pformat("response", response).splitlines()[-1],
+            "  response.content = <2,560 bytes, sha256: "
+            + hashlib.sha256(content).hexdigest()
+            + ">",
+        )
+
+
+class PformatContainerTest(unittest.TestCase):
+    def test_primitives_single_line(self):
+        self.assertEqual(
+            pformat("my_variable", [1, 2.5, "a", b"b", True, None]),
+            "my_variable = [1, 2.5, 'a', b'b', True, None]",
+        )
+        self.assertEqual(
+            pformat("my_variable", collections.deque([2.5, None]), max_items=1),
+            "my_variable = deque([2.5, ... 1 more items])",
+        )
+
+    def test_runs(self):
+        self.assertEqual(
+            pformat("my_variable", [1, 2.5, [0], None, {"a": 0}, "b", b"c"], max_items=6),
+            "\n".join(
+                (
+                    "\\",
+                    "  my_variable = <builtins.list>",
+                    "    my_variable[0:2] = [1, 2.5]",
+                    "    my_variable[2] = [0]",
+                    "    my_variable[3] = None",
+                    "    my_variable[4] = <builtins.dict>",
+                    "      my_variable[4]['a'] = 0",
+                    "    my_variable[5] = 'b'",
+                    "    ... 1 more items",
+                )
+            ),
+        )
+
+
+class PformatSummaryTest(unittest.TestCase):
+    def test_float_list(self):
+        self.assertEqual(
+            pformat("my_variable", [i / 2 for i in range(200)] + [math.nan]),
+            "\n".join(
+                (
+                    "my_variable = <builtins.list>",
+                    "  my_variable.len = 201",
+                    "  my_variable.min = 0.0",
+                    "  my_variable.max = 99.5",
+                    "  my_variable.mean = 49.75",
+                    "  my_variable.nan = 1",
+                    "  my_variable.sample = [0.0, 0.5, 1.0, ... 195 more items, 99.0, 99.5, nan]",
+                )
+            ),
+        )
+
+    def test_array(self):
+        self.assertEqual(
+            pformat("my_variable", array.array("i", range(1000)), max_items=2),
+            "\n".join(
+                (
+                    "my_variable = <array.array>",
+                    "  my_variable.typecode = 'i'",
+                    "  my_variable.len = 1,000",
+                    f"  my_variable.nbytes = {1000 * array.array('i').itemsize:,}",
+                    "  my_variable.min = 0",
+                    "  my_variable.max = 999",
+                    "  my_variable.mean = 499.5",
+                    "  my_variable.nan = 0",
+                    "  my_variable.sample = [0, 1, ... 996 more items, 998, 999]",
+                )
+            ),
+        )
+        # Small arrays are not summarized
+        self.assertEqual(
+            pformat("my_variable", array.array("i", [0])),
+            "my_variable = array('i', [0])",
+        )
+
+    def test_bytearray(self):
+        value = bytearray(1000)
+        self.assertEqual(
+            pformat("my_variable", value).splitlines()[1:],
+            [
+                "  my_variable.len = 1,000",
+                f"  my_variable.head = {bytes(24)!r}",
+                f"  my_variable.sha256 = {hashlib.sha256(value).hexdigest()}",
+            ],
+        )
+
+    def test_memoryview(self):
+        self.assertEqual(
+            pformat("my_variable", memoryview(b"abc")),
+            "\n".join(
+                (
+                    "my_variable = <builtins.memoryview>",
+                    "  my_variable.format = 'B'",
+                    "  my_variable.shape = (3,)",
+                    "  my_variable.nbytes = 3",
+                    "  my_variable.readonly = True",
+                    "  my_variable.sample = [97, 98, 99]",
+                )
+            ),
+        )
+
+    @unittest.skipUnless(HAS_NUMPY_PACKAGE, "requires numpy")
+    def test_numpy_array(self):
+        import numpy as np
+
+        value = np.arange(1000, dtype=np.float64).reshape(100, 10)
+        value[0, 0] = np.nan
+        self.assertEqual(
+            pformat("my_variable", value),
+            "\n".join(
+                (
+                    "my_variable = <numpy.ndarray>",
+                    "  my_variable.shape = (100, 10)",
+                    "  my_variable.dtype = float64",
+                    "  my_variable.nbytes = 8,000",
+                    "  my_variable.min = 1.0",
+                    "  my_variable.max = 999.0",
+                    "  my_variable.mean = 500.0",
+                    "  my_variable.nan = 1",
+                    "  my_variable.sample = [nan, 1.0, 2.0, ... 994 more items, 997.0, 998.0, 999.0]",
+                )
+            ),
+        )
+
+    @unittest.skipUnless(HAS_PANDAS_PACKAGE, "requires pandas")
+    def test_pandas_dataframe(self):
+        import pandas as pd
+
+        value = pd.DataFrame({"a": range(100), "b": [0.5] * 100})
+        lines = pformat("my_variable", value).splitlines()
+        self.assertEqual(
+            lines[:5],
+            [
+                "my_variable = <pandas.core.frame.DataFrame>",
+                "  my_variable.shape = (100, 2)",
+                "  my_variable.columns = {'a': int64, 'b': float64}",
+                f"  my_variable.memory_usage = {int(value.memory_usage().sum()):,}",
+                "  my_variable.nan = 0",
+            ],
+        )
+        # Line continuation, header, and the first and last rows
+        self.assertEqual(len(lines), 5 + 2 + 6)
+
+
+class PformatLimitsTest(unittest.TestCase):
+    def test_max_items_single_line(self):
+        self.assertEqual(
+            pformat("my_variable", list(range(2_000_000)), max_items=3),
+            "my_variable = [0, 1, 2, ... 1,999,997 more items]",
+        )
+
+    def test_max_items_multiple_lines(self):
+        self.assertEqual(
+            pformat("my_variable", [[0], [1], [2]], max_items=2),
+            "\n".join(
+                (
+                    "\\",
+                    "  my_variable = <builtins.list>",
+                    "    my_variable[0] = [0]",
+                    "    my_variable[1] = [1]",
+                    "    ... 1 more items",
+                )
+            ),
+        )
+
+    def test_max_items_dict(self):
+        self.assertEqual(
+            pformat("my_variable", dict.fromkeys(range(5), 0), max_items=1),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_variable[0] = 0",
+                    "  ... 4 more items",
+                )
+            ),
+        )
+
+    def test_max_depth(self):
+        self.assertEqual(
+            pformat("my_variable", {"a": {"b": {"c": 0}}}, max_depth=2),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_variable['a'] = <builtins.dict>",
+                    "    my_variable['a']['b'] = <builtins.dict> ... max depth reached",
+                )
+            ),
+        )
+
+    def test_max_length_str(self):
+        self.assertEqual(
+            pformat("my_variable", "abcdefghij", max_length=4),
+            "my_variable = 'abcd'... 6 more characters",
+        )
+
+    def test_max_length_bytes(self):
+        self.assertEqual(
+            pformat("my_variable", b"abcdefghij" * 5_000_000, max_length=4),
+            "my_variable = b'abcd'... 49,999,996 more bytes",
+        )
+
+    def test_max_length_other(self):
+        self.assertEqual(
+            pformat("my_variable", range(10), max_length=5),
+            "my_variable = range... 7 more characters",
+        )
+
+    def test_max_bytes(self):
+        self.assertEqual(
+            pformat("my_variable", {"a": 0, "b": 1}, max_bytes=40),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_varia... output truncated at 40 bytes",
+                )
+            ),
+        )
+
+    def test_max_bytes_encoded(self):
+        # "é" is 2 bytes in UTF-8, so only 3 of them fit after "x = '"
+        self.assertEqual(
+            pformat("x", "éééééé", max_bytes=12),
+            "x = 'ééé... output truncated at 12 bytes",
+        )
+
+    def test_max_bytes_large_str(self):
+        self.assertEqual(
+            pformat("x", "a" * 50_000_000, max_bytes=10),
+            "x = 'aaaaa... output truncated at 10 bytes",
+        )
+
+    def test_max_length_single_line_items(self):
+        self.assertEqual(
+            pformat("my_variable", ["abcdefghij", 1], max_length=4),
+            "my_variable = ['abcd'... 6 more characters, 1]",
+        )
+        self.assertEqual(
+            pformat("my_variable", ("abcdefghij",), max_length=4),
+            "my_variable = ('abcd'... 6 more characters,)",
+        )
+        self.assertEqual(pformat("my_variable", set(), max_length=4), "my_variable = set()")
+
+    def test_max_items_zero(self):
+        self.assertEqual(
+            pformat("my_variable", {"a": 0}, max_items=0),
+            "my_variable = <builtins.dict>\n  ... 1 more items",
+        )
+
+    def test_none_disables_configured_limit(self):
+        self.addCleanup(_set_default_limits, Limits())
+        _set_default_limits(Limits(max_items=1))
+        self.assertEqual(
+            pformat("my_variable", [0, 1, 2]),
+            "my_variable = [0, ... 2 more items]",
+        )
+        self.assertEqual(
+            pformat("my_variable", [0, 1, 2], max_items=None),
+            "my_variable = [0, 1, 2]",
+        )
+
+
+class PformatReferencesTest(unittest.TestCase):
+    def test_recursive_dict(self):
+        my_variable = {"a": 0}
+        my_variable["self"] = my_variable
+        self.assertEqual(
+            pformat("my_variable", my_variable),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_variable['a'] = 0",
+                    "  my_variable['self'] = <builtins.dict> ... recursive reference to my_variable",
+                )
+            ),
+        )
+
+    def test_recursive_list(self):
+        my_variable = [0]
+        my_variable.append(my_variable)
+        self.assertEqual(
+            pformat("my_variable", my_variable),
+            "\n".join(
+                (
+                    "\\",
+                    "  my_variable = <builtins.list>",
+                    "    my_variable[0] = 0",
+                    "    my_variable[1] = <builtins.list> ... recursive reference to my_variable",
+                )
+            ),
+        )
+
+    def test_shared_reference(self):
+        shared = dict.fromkeys("abcdefgh", 0)
+        result = pformat("my_variable", {"x": shared, "y": shared})
+        self.assertTrue(
+            result.startswith(
+                "my_variable = <builtins.dict>\n"
+                "  my_variable['x'] = <builtins.dict>\n"
+                "    my_variable['x']['a'] = 0\n"
+            )
+        )
+        self.assertTrue(
+            result.endswith(
+                "\n  my_variable['y'] = <builtins.dict> ... same object as my_variable['x']"
+            )
+        )
+
+    def test_shared_reference_small(self):
+        shared = {"a": 0}
+        self.assertEqual(
+            pformat("my_variable", {"x": shared, "y": shared}),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_variable['x'] = <builtins.dict>",
+                    "    my_variable['x']['a'] = 0",
+                    "  my_variable['y'] = <builtins.dict>",
+                    "    my_variable['y']['a'] = 0",
+                )
+            ),
+        )
+
+    def test_shared_reference_tuple(self):
+        shared = tuple([0] * 8 + [[0]])
+        result = pformat("my_variable", [shared, shared])
+        self.assertNotIn("same object as", result)
+
+
+class PformatRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self._registry = dict(_registry)
+
+    def tearDown(self):
+        _registry.clear()
+        _registry.update(self._registry)
+        _dispatch_cache.clear()
+
+    def test_register_formatter(self):
+        class Row:
+            id = 1
+
+        @register_formatter(Row)
+        def _(w, name, value):
+            w.write(f"{name} = <Row id={value.id}>")
+
+        self.assertEqual(
+            pformat("my_variable", {"row": Row()}),
+            "\n".join(
+                (
+                    "my_variable = <builtins.dict>",
+                    "  my_variable['row'] = <Row id=1>",
+                )
+            ),
+        )
+
+    def test_register_formatter_subclass(self):
+        class Row:
+            pass
+
+        class SubRow(Row):
+            pass
+
+        register_formatter(Row, lambda w, name, value: w.write(f"{name} = <Row>"))
+        self.assertEqual(pformat("my_variable", SubRow()), "my_variable = <Row>")
+
+    def test_register_formatter_clears_cache(self):
+        class Row(dict):
+            pass
+
+        self.assertIs(_dispatch(Row), _write_dict)
+        register_formatter(Row, lambda w, name, value: w.write(f"{name} = <Row>"))
+        self.assertEqual(pformat("my_variable", Row()), "my_variable = <Row>")
+
+    def test_register_formatter_abc(self):
+        class Base(abc.ABC):
+            pass
+
+        class Row:
+            pass
+
+        register_formatter(Base, lambda w, name, value: w.write(f"{name} = <Base>"))
+        self.assertIs(_dispatch(Row), _write_scalar)
+        Base.register(Row)
+        self.assertEqual(pformat("my_variable", Row()), "my_variable = <Base>")
+
+    def test_dispatch_cache_weak(self):
+        class Row:
+            pass
+
+        _dispatch(Row)
+        self.assertIn(Row, _dispatch_cache)
+        del Row
+        gc.collect()
+        self.assertEqual(
+            [cls for cls in _dispatch_cache if cls.__name__ == "Row"],
+            [],
+        )
+
+    def test_dataclass_type(self):
+        @dataclasses.dataclass
+        class Person:
+            name: str
+
+        self.assertRegex(
+            pformat("my_variable", Person),
+            r"^my_variable = <class '.*Person'>$",
+        )
@@ -0,0 +1,68 @@
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.policy import DumpPolicy, resolve_policy
+
+
+class ResolvePolicyTest(unittest.TestCase):
+    def test_resolve_policy(self):
+        policies = {
+            "": DumpPolicy(logging.CRITICAL),
+            "app": DumpPolicy(),
+            "app.db": DumpPolicy(logging.ERROR),
+        }
+        self.assertEqual(resolve_policy(policies, "app.db.pool").level, logging.ERROR)
+        self.assertEqual(resolve_policy(policies, "app.http").level, logging.WARNING)
+        self.assertEqual(resolve_policy(policies, "application").level, logging.CRITICAL)
+        self.assertIsNone(resolve_policy({"app": DumpPolicy()}, "other"))
+
+
+class PolicyDumpTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "db.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_locals=True,
+            dump_policies={
+                f"{__name__}.db": DumpPolicy(logging.ERROR, dump_path=self.path),
+                f"{__name__}.http": DumpPolicy(None),
+            },
+            remove_handlers=False,
+        )
+
+    def test_dump_locals(self):
+        db_logger = base.Yogger(f"{__name__}.db.pool")
+        http_logger = base.Yogger(f"{__name__}.http")
+        with mock.patch.object(base, "capture_stack") as capture_stack:
+            with self.assertLogs(db_logger, logging.WARNING):
+                db_logger.warning("test")
+            with self.assertLogs(http_logger, logging.WARNING):
+                http_logger.error("test")
+        capture_stack.assert_not_called()
+
+        my_variable = 0
+        with self.assertLogs(db_logger, logging.ERROR) as logs:
+            db_logger.error("test")
+        self.assertIn(self.path, logs.output[1])
+        with open(self.path, encoding="utf-8") as rf:
+            self.assertIn("my_variable = 0", rf.read())
+
+    def test_cached(self):
+        logger = base.Yogger(f"{__name__}.http")
+        with self.assertLogs(logger, logging.WARNING):
+            logger.warning("test")
+        self.assertEqual(logger.__dict__["_dump_policy"], DumpPolicy(None, __name__))
+
+        # Reconfiguring clears the cached policy
+        base.configure(__name__, remove_handlers=False)
+        self.assertNotIn("_dump_policy", logger.__dict__)
+        with self.assertLogs(logger, logging.WARNING):
+            logger.warning("test")
+        self.assertIsNone(logger._dump_policy.level)
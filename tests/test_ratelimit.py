@@ -0,0 +1,123 @@
+import logging
+import os
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.capture import fingerprint_stack, fingerprint_trace
+from yogger.ratelimit import DumpLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DumpLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_first_n(self):
+        limiter = DumpLimiter(first_n=2, clock=self.clock)
+        self.assertEqual([limiter.allow("a") for _ in range(4)], [True, True, False, False])
+        self.assertTrue(limiter.allow("b"))
+        self.assertEqual(limiter.suppressed, 2)
+
+    def test_rate(self):
+        limiter = DumpLimiter(rate=2, per=10.0, clock=self.clock)
+        self.assertEqual([limiter.allow(i) for i in range(3)], [True, True, False])
+        self.clock.now = 5.0
+        self.assertTrue(limiter.allow(3))
+        self.assertFalse(limiter.allow(4))
+
+    def test_summary(self):
+        limiter = DumpLimiter(first_n=1, summary_interval=60.0, clock=self.clock)
+        self.assertIsNone(limiter.summary())
+        for fingerprint in ("a", "a", "a", "b", "b"):
+            limiter.allow(fingerprint)
+        self.assertIsNone(limiter.summary())
+        self.clock.now = 60.0
+        self.assertEqual(
+            limiter.summary(),
+            "Suppressed 3 dumps from 2 call sites in the last 60s",
+        )
+        self.assertIsNone(limiter.summary())
+
+    def test_maxsize(self):
+        limiter = DumpLimiter(first_n=1, maxsize=2, clock=self.clock)
+        for fingerprint in ("a", "b", "c"):
+            self.assertTrue(limiter.allow(fingerprint))
+        # The oldest was forgotten
+        self.assertTrue(limiter.allow("a"))
+        self.assertFalse(limiter.allow("c"))
+
+
+class FingerprintTest(unittest.TestCase):
+    def test_fingerprint_stack(self):
+        fingerprints = []
+        for _ in range(2):
+            fingerprints.append(fingerprint_stack())
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertEqual(fingerprints[0][0][0], id(self.test_fingerprint_stack.__code__))
+        self.assertNotEqual(fingerprint_stack(), fingerprints[0])
+
+    def test_fingerprint_trace(self):
+        try:
+            raise ValueError("test")
+        except ValueError as err:
+            fingerprint = fingerprint_trace(err.__traceback__)
+        self.assertEqual(
+            fingerprint,
+            ((id(self.test_fingerprint_trace.__code__), fingerprint[0][1]),),
+        )
+
+
+class LimitedDumpTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_locals=True,
+            dump_first_n=1,
+            dump_summary_interval=0.0,
+            remove_handlers=False,
+        )
+        self.paths = []
+        dump = base._dump
+
+        def _dump(**kwargs):
+            location = dump(**kwargs)
+            self.paths.append(location.path)
+            self.addCleanup(os.remove, location.path)
+            return location
+
+        patcher = mock.patch.object(base, "_dump", _dump)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.logger = base.Yogger(__name__)
+
+    def test_dump_locals(self):
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            for _ in range(3):
+                self.logger.warning("test")
+            self.logger.warning("other")
+        self.assertEqual(len(self.paths), 2)
+        self.assertIn(
+            f"WARNING:{__name__}:Suppressed 1 dumps from 1 call sites in the last 0s",
+            logs.output,
+        )
+
+    def test_dump_on_exception(self):
+        with self.assertLogs(level=logging.WARNING) as logs:
+            for _ in range(3):
+                with self.assertRaises(ValueError):
+                    with base.dump_on_exception():
+                        raise ValueError("test")
+        self.assertEqual(len(self.paths), 1)
+        self.assertIn(
+            "WARNING:root:Suppressed 1 dumps from 1 call sites in the last 0s",
+            logs.output,
+        )
@@ -0,0 +1,92 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.recorder import FlightRecorder, format_records
+
+
+class FlightRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.Logger(__name__, logging.DEBUG)
+        self.recorder = FlightRecorder(capacity=2)
+        self.logger.addHandler(self.recorder)
+
+    def test_keeps_most_recent(self):
+        for i in range(3):
+            self.logger.debug("record %d", i)
+        self.assertEqual(
+            [record.getMessage() for record in self.recorder.records()],
+            ["record 1", "record 2"],
+        )
+
+    def test_formatting_deferred(self):
+        my_list = [0]
+        self.logger.debug("my_list: %s", my_list)
+        my_list.append(1)
+        (line,) = format_records(self.recorder.records())
+        self.assertTrue(line.endswith(f"DEBUG  {__name__} ]  my_list: [0, 1]"))
+
+    def test_format_failure(self):
+        self.logger.debug("%d", "not a number")
+        (line,) = format_records(self.recorder.records())
+        self.assertTrue(line.startswith("<record failed to format: TypeError: "))
+
+
+class FlightRecorderDumpTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+        self.root_level = logging.getLogger().level
+        self.logger = logging.getLogger(__name__)
+
+    def configure(self, **kwargs):
+        base.configure(
+            __name__,
+            dump_path=self.path,
+            dump_log_records=2,
+            remove_handlers=False,
+            **kwargs,
+        )
+        self.handler = logging.getLogger().handlers[-2]
+
+    def raise_in_dump(self):
+        with mock.patch.object(base, "_logger"):
+            with self.assertRaises(ValueError):
+                with base.dump_on_exception():
+                    raise ValueError("test")
+
+    def test_dump_on_exception(self):
+        self.configure()
+        self.assertEqual(self.handler.level, self.root_level)
+        for i in range(3):
+            self.logger.debug("record %d", i)
+        self.raise_in_dump()
+        with open(self.path, encoding="utf-8") as rf:
+            contents = rf.read()
+        self.assertIn("args: ('test',)\n\nRecent log records:\n", contents)
+        self.assertNotIn("record 0", contents)
+        self.assertTrue(contents.endswith(f"DEBUG  {__name__} ]  record 2\n"))
+
+    def test_structured(self):
+        self.configure(dump_format="jsonl")
+        self.logger.debug("record")
+        self.raise_in_dump()
+        with open(self.path, encoding="utf-8") as rf:
+            last = json.loads(rf.readlines()[-1])
+        self.assertEqual(last["type"], "log")
+        self.assertEqual(last["message"], "record")
+
+    def test_reconfigure_restores_level(self):
+        self.configure()
+        self.assertEqual(logging.getLogger().level, logging.DEBUG)
+        base.configure(__name__, remove_handlers=False)
+        self.assertEqual(logging.getLogger().level, self.root_level)
+        self.assertIsNone(base._global_flight_recorder)
@@ -0,0 +1,103 @@
+import logging
+import os
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.sampling import DumpSampler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DumpSamplerTest(unittest.TestCase):
+    def test_probability(self):
+        sampler = DumpSampler(
+            rate=0.5,
+            rates={
+                "app": 0.1,
+                ("app", logging.ERROR): 1.0,
+                "app.db": 0.0,
+                ("", logging.CRITICAL): 0.9,
+            },
+        )
+        self.assertEqual(sampler.probability("other", logging.WARNING), 0.5)
+        self.assertEqual(sampler.probability("other", logging.CRITICAL), 0.9)
+        self.assertEqual(sampler.probability("app.http", logging.WARNING), 0.1)
+        self.assertEqual(sampler.probability("app.http", logging.CRITICAL), 1.0)
+        self.assertEqual(sampler.probability("app.db", logging.ERROR), 0.0)
+        self.assertEqual(sampler.probability("application", logging.WARNING), 0.5)
+
+    def test_sample(self):
+        draws = iter([0.2, 0.7])
+        sampler = DumpSampler(rate=0.5, rates={"off": 0.0}, draw=lambda: next(draws))
+        self.assertTrue(sampler.sample("app", logging.WARNING))
+        self.assertFalse(sampler.sample("app", logging.WARNING))
+        self.assertFalse(sampler.sample("off", logging.WARNING))
+        self.assertEqual(sampler.skipped, 2)
+
+    def test_cpu_fraction(self):
+        clock = FakeClock()
+        sampler = DumpSampler(cpu_fraction=0.1, window=1.0, clock=clock)
+        self.assertTrue(sampler.sample("app", logging.WARNING))
+        sampler.record(0.3)
+        self.assertFalse(sampler.sample("app", logging.WARNING))
+        # Overdrawn by 0.2s, which takes 2s to accrue
+        clock.now = 1.5
+        self.assertFalse(sampler.sample("app", logging.WARNING))
+        clock.now = 2.0
+        self.assertTrue(sampler.sample("app", logging.WARNING))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DumpSampler(rates={"app": 1.5})
+        with self.assertRaises(ValueError):
+            DumpSampler(cpu_fraction=0.0)
+
+
+class SampledDumpTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__,
+            dump_locals=True,
+            dump_sample_rates={__name__: 0.0, (__name__, logging.ERROR): 1.0},
+            remove_handlers=False,
+        )
+        self.paths = []
+        dump = base._dump
+
+        def _dump(**kwargs):
+            location = dump(**kwargs)
+            self.paths.append(location.path)
+            self.addCleanup(os.remove, location.path)
+            return location
+
+        patcher = mock.patch.object(base, "_dump", _dump)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.logger = base.Yogger(__name__)
+
+    def test_dump_locals(self):
+        with mock.patch.object(base, "capture_stack") as capture_stack:
+            with self.assertLogs(self.logger, logging.WARNING) as logs:
+                self.logger.warning("test")
+        # Skipped before inspecting the frames
+        capture_stack.assert_not_called()
+        self.assertEqual(logs.output, [f"WARNING:{__name__}:test"])
+
+        my_variable = 0
+        with self.assertLogs(self.logger, logging.WARNING):
+            self.logger.error("test")
+        self.assertEqual(len(self.paths), 1)
+        with open(self.paths[0], encoding="utf-8") as rf:
+            self.assertIn("my_variable = 0", rf.read())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            base.configure(__name__, dump_sample_rate=-0.1, remove_handlers=False)
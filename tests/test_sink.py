@@ -0,0 +1,114 @@
+import logging
+import os
+import re
+import tempfile
+import unittest
+
+from yogger import base
+from yogger.capture import capture_stack
+from yogger.sink import DumpLocation, DumpSink
+
+
+class DumpSinkTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log")
+
+    def make_sink(self, **kwargs):
+        sink = DumpSink(self.path, **kwargs)
+        self.addCleanup(sink.close)
+        return sink
+
+    def test_write(self):
+        sink = self.make_sink()
+        first = sink.write(lambda write: write("first"))
+        second = sink.write(lambda write: write("second"), "custom")
+        self.assertEqual(first, DumpLocation(self.path, 0, f"{os.getpid()}-1"))
+        self.assertEqual(second.record_id, "custom")
+        with open(self.path, "rb") as rf:
+            rf.seek(second.offset)
+            self.assertEqual(rf.read(), b"--- dump custom ---\nsecond\n")
+
+    def test_write_failed(self):
+        sink = self.make_sink()
+
+        def write_dump(write):
+            write("partial")
+            raise ValueError("test")
+
+        with self.assertRaises(ValueError):
+            sink.write(write_dump, "1")
+        with open(self.path, encoding="utf-8") as rf:
+            self.assertEqual(
+                rf.read(),
+                "--- dump 1 ---\npartial\n<dump failed: ValueError: test>\n",
+            )
+
+    def test_rotate(self):
+        sink = self.make_sink(max_bytes=50, backup_count=2)
+        for i in range(4):
+            location = sink.write(lambda write: write("x" * 50), str(i))
+            self.assertEqual(location.offset, 0)
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.path))),
+            ["dumps.log", "dumps.log.1", "dumps.log.2"],
+        )
+        with open(f"{self.path}.2", encoding="utf-8") as rf:
+            self.assertTrue(rf.read().startswith("--- dump 1 ---\n"))
+
+    def test_max_total_bytes(self):
+        sink = self.make_sink(max_bytes=50, backup_count=5, max_total_bytes=150)
+        for i in range(6):
+            sink.write(lambda write: write("x" * 50), str(i))
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.path))),
+            ["dumps.log", "dumps.log.1", "dumps.log.2"],
+        )
+
+
+class SinkDumpTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+
+    def test_dump_locals(self):
+        base.configure(
+            __name__,
+            dump_locals=True,
+            dump_path=self.path,
+            dump_max_file_bytes=1024 * 1024,
+            remove_handlers=False,
+        )
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+        logger = base.Yogger(__name__)
+        my_variable = {"a": 0}
+        with self.assertLogs(logger, logging.WARNING) as logs:
+            logger.warning("first")
+            logger.warning("second")
+        self.assertIn(f'"{self.path}:0" (dump {os.getpid()}-1)', logs.output[1])
+        match = re.search(r':(\d+)" \(dump (\S+)\)', logs.output[3])
+        with open(self.path, encoding="utf-8") as rf:
+            contents = rf.read()
+        self.assertEqual(contents.count("my_variable['a'] = 0"), 2)
+        self.assertTrue(
+            contents[int(match[1]) :].startswith(f"--- dump {match[2]} ---\n")
+        )
+
+    def test_dump_async(self):
+        base.configure(
+            __name__,
+            dump_path=self.path,
+            dump_max_file_bytes=1024 * 1024,
+            dump_async=True,
+            remove_handlers=False,
+        )
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+        my_variable = {"a": 0}
+        location = base._dump(stack=capture_stack(), err=None, dump_path=None)
+        self.assertEqual(location, DumpLocation(self.path, None, f"{os.getpid()}-1"))
+        self.assertTrue(base._global_dump_worker.flush(timeout=5))
+        with open(self.path, encoding="utf-8") as rf:
+            self.assertIn("my_variable['a'] = 0", rf.read())
@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.base import dump, dumps
+from yogger.capture import capture_stack
+from yogger.structured import read_records
+
+
+class Example:
+    def __init__(self):
+        self.value = "a" * 10
+
+    def stack(self):
+        return capture_stack()
+
+
+class StructuredDumpTest(unittest.TestCase):
+    def test_dumps_jsonl(self):
+        my_variable = {"a": [1, (2, 3)]}
+        err = ValueError("test")
+        lines = dumps(
+            capture_stack(), err=err, package_name=__name__, format="jsonl"
+        ).splitlines()
+        frame, exception = map(json.loads, lines)
+        self.assertEqual(frame["type"], "frame")
+        self.assertEqual(frame["function"], "test_dumps_jsonl")
+        self.assertEqual(frame["module"], __name__)
+        self.assertEqual(
+            frame["locals"]["my_variable"],
+            {"type": "builtins.dict", "repr": "{'a': [1, (2, 3)]}"},
+        )
+        self.assertEqual(
+            exception,
+            {
+                "type": "exception",
+                "exception": "builtins.ValueError",
+                "message": "test",
+                "args": "('test',)",
+            },
+        )
+
+    def test_attributes_max_length(self):
+        result = dumps(
+            Example().stack(), package_name=__name__, format="jsonl", max_length=4
+        )
+        record = json.loads(result.splitlines()[-1])
+        self.assertEqual(
+            record["attributes"]["value"],
+            {"type": "builtins.str", "repr": "'aaaa'... 6 more characters"},
+        )
+
+    def test_dump_binary(self):
+        my_variable = 1
+        fp = io.BytesIO()
+        dump(fp, capture_stack(), package_name=__name__, format="binary")
+        fp.seek(0)
+        (record,) = read_records(fp)
+        self.assertEqual(record["locals"]["my_variable"]["repr"], "1")
+
+    def test_dumps_binary(self):
+        with self.assertRaises(ValueError):
+            dumps(capture_stack(), format="binary")
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            dumps(capture_stack(), format="invalid")
+
+
+class StructuredFileTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dumps")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+
+    def read(self):
+        with open(self.path, "rb") as rf:
+            return list(read_records(rf))
+
+    def test_dump_on_exception(self):
+        base.configure(
+            __name__,
+            dump_format="binary",
+            dump_compression="gzip",
+            remove_handlers=False,
+        )
+        my_variable = 1
+        with mock.patch.object(base, "_logger") as logger:
+            with self.assertRaises(ValueError):
+                with base.dump_on_exception(self.path):
+                    raise ValueError("test")
+        self.assertIn("python -m yogger.structured", logger.fatal.call_args[0][0])
+        records = self.read()
+        self.assertEqual(records[0]["locals"]["my_variable"]["repr"], "1")
+        self.assertEqual(records[-1]["type"], "exception")
+
+    def test_sink(self):
+        base.configure(
+            __name__,
+            dump_path=self.path,
+            dump_max_file_bytes=1024 * 1024,
+            dump_format="jsonl",
+            remove_handlers=False,
+        )
+        self.addCleanup(setattr, base, "_global_dump_path", None)
+        my_variable = 1
+        location = base._dump(stack=capture_stack(), err=None, dump_path=None)
+        self.assertIn("grep '\"dump\":", base._dump_msg(location))
+        (record,) = self.read()
+        self.assertEqual(record["dump"], location.record_id)
+        self.assertEqual(record["locals"]["my_variable"]["repr"], "1")
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.capture import capture_stack
+from yogger.tasks import task_stack, with_tasks
+
+
+async def leaf(event):
+    leaf_variable = 1
+    await event.wait()
+
+
+async def middle(event):
+    middle_variable = 2
+    await leaf(event)
+
+
+class TaskStackTest(unittest.IsolatedAsyncioTestCase):
+    async def test_task_stack(self):
+        event = asyncio.Event()
+        task = asyncio.create_task(middle(event), name="worker")
+        await asyncio.sleep(0)
+        stack = task_stack(task)
+        event.set()
+        await task
+        self.assertEqual(
+            [(record.function, record.task) for record in stack[:2]],
+            [("middle", "worker"), ("leaf", "worker")],
+        )
+
+    async def test_awaiting_tasks(self):
+        stacks = []
+
+        async def child():
+            stacks.append(with_tasks(capture_stack()))
+
+        async def parent():
+            await asyncio.create_task(child(), name="child")
+
+        async def gathering():
+            await asyncio.gather(parent())
+
+        await asyncio.create_task(gathering(), name="gathering")
+        records = [
+            record
+            for record in stacks[0]
+            if record.function in ("gathering", "parent", "child")
+        ]
+        self.assertEqual(
+            [record.function for record in records], ["gathering", "parent", "child"]
+        )
+        self.assertEqual(records[0].task, "gathering")
+        self.assertEqual(records[2].task, "child")
+
+    async def test_all_tasks(self):
+        event = asyncio.Event()
+        task = asyncio.create_task(middle(event), name="other")
+        await asyncio.sleep(0)
+        stack = with_tasks(capture_stack(), all_tasks=True)
+        event.set()
+        await task
+        self.assertIn(("leaf", "other"), [(r.function, r.task) for r in stack])
+
+    def test_outside_loop(self):
+        stack = capture_stack()
+        self.assertEqual(with_tasks(stack), stack)
+
+
+class AsyncDumpOnExceptionTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "dump.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(__name__, dump_asyncio=True, remove_handlers=False)
+
+    async def test_dump(self):
+        async def failing():
+            my_variable = {"a": 0}
+            raise ValueError("test")
+
+        async def run():
+            with mock.patch.object(base, "_logger") as logger:
+                with self.assertRaises(ValueError):
+                    async with base.async_dump_on_exception(self.path):
+                        await failing()
+            return logger
+
+        logger = await asyncio.create_task(run(), name="failing")
+        self.assertIn(self.path, logger.fatal.call_args[0][0])
+        with open(self.path, encoding="utf-8") as rf:
+            contents = rf.read()
+        self.assertIn("in failing (task 'failing'):", contents)
+        self.assertIn("my_variable['a'] = 0", contents)
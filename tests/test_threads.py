@@ -0,0 +1,69 @@
+import os
+import signal
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from yogger import base
+from yogger.capture import capture_threads
+
+
+def blocked(started, release):
+    thread_variable = {"a": 0}
+    started.set()
+    release.wait()
+
+
+class CaptureThreadsTest(unittest.TestCase):
+    def setUp(self):
+        started = threading.Event()
+        release = threading.Event()
+        thread = threading.Thread(
+            target=blocked, args=(started, release), name="blocked-thread"
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        self.assertTrue(started.wait(timeout=5))
+
+    def test_capture_threads(self):
+        stack, timings = capture_threads(package_name=__name__)
+        records = [record for record in stack if record.thread == "blocked-thread"]
+        self.assertEqual([record.function for record in records], ["blocked"])
+        self.assertEqual(records[0].frame.f_locals["thread_variable"], {"a": 0})
+        self.assertIn(threading.current_thread().name, [t.thread for t in timings])
+        self.assertEqual(
+            [t.num_frames for t in timings if t.thread == "blocked-thread"], [1]
+        )
+
+    def test_dump_threads(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, "threads.log")
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(__name__, remove_handlers=False)
+        with mock.patch.object(base, "_logger") as logger:
+            location = base.dump_threads(path)
+        self.assertEqual(location.path, path)
+        message = logger.log.call_args[0][1]
+        self.assertRegex(message, r"^Captured the stacks of \d+ threads in ")
+        self.assertIn("  blocked-thread: 1 frames in ", message)
+        with open(path, encoding="utf-8") as rf:
+            contents = rf.read()
+        self.assertIn("in blocked (thread 'blocked-thread'):", contents)
+        self.assertIn("thread_variable['a'] = 0", contents)
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "requires SIGUSR1")
+    def test_signal(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(base.configure, __name__, remove_handlers=False)
+        base.configure(
+            __name__, dump_threads_signal=signal.SIGUSR1, remove_handlers=False
+        )
+        dumped = threading.Event()
+        with mock.patch.object(base, "dump_threads", side_effect=dumped.set):
+            signal.raise_signal(signal.SIGUSR1)
+            self.assertTrue(dumped.wait(timeout=5))
+        base.configure(__name__, remove_handlers=False)
+        self.assertEqual(signal.getsignal(signal.SIGUSR1), previous)